@@ -1,8 +1,11 @@
 import unittest
+import io
+import contextlib
 import tkinter as tk
-from battleship_config import BOARD_SIZE, SHIP_TYPES
+import numpy as np
+from battleship_config import BOARD_SIZE, SHIP_TYPES, DEFAULT_CONFIG, ConfigError, GameConfig
 from board_display import BoardDisplay
-from ship_manager import ShipManager
+from ship_manager import ShipManager, SparseShipManager, create_board
 from board_validator import BoardValidator
 from human_player import HumanPlayer
 from computer_player import ComputerPlayer
@@ -10,6 +13,38 @@ from game_setup import GameSetup
 from window_manager import WindowManager
 from gui_display import GameDisplay
 from gui_gameplay import BattleshipGUI
+from canvas_display import CanvasBoard, CanvasGameDisplay
+from simulation import BatchSimulator
+from probability_engine import ProbabilityEngine, ProbabilityTracker
+from monte_carlo import MonteCarloTargeter
+from fleet_generator import FleetGenerator, FleetPlacementError
+from coordinates import CoordinateCodec
+import random
+import time
+from tournament import Tournament, play_chunk
+import asyncio
+import json
+import base64
+import copy
+import pickle
+from game_server import GameServer, GameSession, GameError
+from load_client import LoadClient
+from game_snapshot import GameSnapshot, SnapshotError
+import os
+import tempfile
+from replay_log import ReplayRecorder, ReplayLog
+from training_export import ShardWriter, simulated_states, load_shards
+from startup_benchmark import ENTRY_POINTS, StartupSample, measure
+from vector_env import VectorEnv
+from game_events import EventBus, GameEvent, GameOver, Hit, Miss, ShotFired, ShotResult, Sunk
+from cli_gameplay import ConsoleRenderer
+import metrics
+import urllib.request
+import main
+try:
+    import pty  # POSIX only; the curses tests need it
+except ImportError:
+    pty = None
 
 class TestBoardDisplay(unittest.TestCase):
     """Test cases for the BoardDisplay class"""
@@ -24,6 +59,122 @@ class TestBoardDisplay(unittest.TestCase):
         self.assertIn('-', self.display.COLORS)
         self.assertIn('RESET', self.display.COLORS)
 
+    def test_header_scales_with_width(self):
+        """Test that column labels and cells widen on large boards"""
+        self.assertEqual(self.display.header(8)[0], "  A B C D E F G H")
+        labels, border, cell_width = self.display.header(30)
+        self.assertEqual(cell_width, 2)
+        self.assertTrue(labels.endswith("Z  AA AB AC AD"))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.display.display_board([[" "] * 30 for _ in range(30)])
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 32)
+        self.assertEqual(len(lines[2]), len(lines[1]) + 2)
+        self.assertTrue(lines[-1].startswith("30|"))
+
+class TestCoordinateCodec(unittest.TestCase):
+    """Test cases for spreadsheet-style coordinates"""
+
+    def test_column_labels(self):
+        """Test formatting and parsing column labels"""
+        for column, label in ((0, "A"), (7, "H"), (25, "Z"), (26, "AA"), (51, "AZ"), (701, "ZZ"), (702, "AAA")):
+            self.assertEqual(CoordinateCodec.column_label(column), label)
+            self.assertEqual(CoordinateCodec.column_index(label), column)
+        for column in range(2000):
+            self.assertEqual(CoordinateCodec.column_index(CoordinateCodec.column_label(column)), column)
+
+    def test_parse_position(self):
+        """Test parsing positions entered by a player"""
+        self.assertEqual(CoordinateCodec.parse_position("b6", 8), (5, 1))
+        self.assertEqual(CoordinateCodec.parse_position("ZZ702", 702), (701, 701))
+        self.assertEqual(CoordinateCodec.format_position(9, 26), "AA10")
+        for position in ("", "A", "6B", "A-1", "A0", "I1", "A9"):
+            with self.assertRaises(ValueError):
+                CoordinateCodec.parse_position(position, 8)
+
+class TestGameConfig(unittest.TestCase):
+    """Test cases for immutable per-game configurations"""
+
+    def test_pickle_round_trip(self):
+        """Test that configs survive pickling and copying, as worker processes need"""
+        for config in (DEFAULT_CONFIG, self.large):
+            restored = pickle.loads(pickle.dumps(config))
+            self.assertEqual(restored, config)
+            self.assertEqual(restored.instructions, config.instructions)
+            self.assertEqual(restored.fleet_lengths, config.fleet_lengths)
+            self.assertEqual(copy.deepcopy(config), config)
+
+    def setUp(self):
+        """Set up test fixtures before each test method"""
+        self.large = GameConfig(20, {"Carrier": 5, "Battleship": 4, "Cruiser": 3, "Destroyer": 2, "Patrol": 2})
+
+    def test_default_matches_config_file(self):
+        """Test that the default config and the module constants agree"""
+        self.assertEqual(DEFAULT_CONFIG.board_size, BOARD_SIZE)
+        self.assertEqual(dict(DEFAULT_CONFIG.ship_types), SHIP_TYPES)
+        self.assertEqual(DEFAULT_CONFIG.fleet_cells, sum(SHIP_TYPES.values()))
+        self.assertEqual(DEFAULT_CONFIG.fleet_weights, ProbabilityEngine.fleet_weights(SHIP_TYPES.values()))
+
+    def test_validation(self):
+        """Test that unplayable settings are rejected"""
+        for board_size, ships in ((0, {"Carrier": 5}), (8.0, {"Carrier": 5}), (8, {}), (8, {"Carrier": 9}),
+                                  (8, {"": 2}), (8, {"Carrier": "5"}), (2, {"A": 2, "B": 2, "C": 1})):
+            with self.assertRaises(ConfigError):
+                GameConfig(board_size, ships)
+        with self.assertRaises(ConfigError):
+            GameConfig.from_dict({"ships": {"Carrier": 5}})
+
+    def test_immutable(self):
+        """Test that neither the settings nor the derived tables can be changed"""
+        with self.assertRaises(AttributeError):
+            self.large.board_size = 10
+        with self.assertRaises(TypeError):
+            self.large.ship_types["Carrier"] = 1
+        self.assertEqual(self.large.column_labels[-1], "T")
+        self.assertEqual(self.large.letters_to_nums["T"], 19)
+        self.assertEqual(self.large.fleet_weights, ((2, 2), (3, 1), (4, 1), (5, 1)))
+
+    def test_intern_shares_equal_configs(self):
+        """Test that equal variants parsed separately share one instance"""
+        copy = GameConfig.from_dict({"board_size": 20, "ships": dict(self.large.ship_types)})
+        self.assertEqual(copy, self.large)
+        self.assertIs(GameConfig.intern(copy), GameConfig.intern(self.large))
+        self.assertIs(GameConfig.intern(GameConfig(BOARD_SIZE, dict(SHIP_TYPES))), DEFAULT_CONFIG)
+
+    def test_intern_keeps_recent_variants(self):
+        """Test that a flood of one-off variants ages out instead of stopping sharing for good"""
+        kept = GameConfig._interned.copy()
+        try:
+            shared = GameConfig.intern(GameConfig(12, {"Cruiser": 3}))
+            for size in range(30, 30 + GameConfig.MAX_INTERNED - 1):
+                GameConfig.intern(GameConfig(size, {"Cruiser": 3}))
+                self.assertIs(GameConfig.intern(GameConfig(12, {"Cruiser": 3})), shared)
+            self.assertEqual(len(GameConfig._interned), GameConfig.MAX_INTERNED)
+            fresh = GameConfig(20, {"Cruiser": 3})
+            self.assertIs(GameConfig.intern(fresh), fresh)
+            self.assertIs(GameConfig.intern(GameConfig(20, {"Cruiser": 3})), fresh)
+            self.assertNotIn(GameConfig(30, {"Cruiser": 3}), GameConfig._interned)  # Least recently used
+        finally:
+            GameConfig._interned.clear()
+            GameConfig._interned.update(kept)
+
+    def test_variants_in_one_process(self):
+        """Test that games of different sizes run side by side without touching each other"""
+        setup = GameSetup(self.large)
+        for player in setup.players:
+            self.assertIs(player.config, self.large)
+            self.assertEqual(player.ship_manager.size, 20)
+            self.assertEqual(player.validator.size, 20)
+        setup.deploy_random_fleet(setup.players[1], random.Random(3))
+        self.assertEqual(bin(setup.players[1].ship_manager.ship_mask).count("1"), self.large.fleet_cells)
+        self.assertEqual(GameSetup().players[0].ship_manager.size, BOARD_SIZE)
+
+        large = BatchSimulator(seed=4, config=self.large).run(1)
+        small = BatchSimulator(seed=4).run(1)
+        self.assertGreaterEqual(min(large.shots_to_win), self.large.fleet_cells)
+        self.assertEqual(small.games, 1)
+
 class TestShipManager(unittest.TestCase):
     """Test cases for the ShipManager class"""
     
@@ -52,12 +203,18 @@ class TestShipManager(unittest.TestCase):
         self.ship_manager.deploy_ship("Destroyer", 2, 0, 0, "H")
         
         # Hit first position
-        self.ship_manager.check_sunk_ship(0, 0)
-        self.assertIn("Destroyer", self.ship_manager.ship_locations)
+        self.assertIsNone(self.ship_manager.check_sunk_ship(0, 0))
+        self.assertFalse(self.ship_manager.is_sunk("Destroyer"))
         
-        # Hit second position
-        self.ship_manager.check_sunk_ship(0, 1)
-        self.assertNotIn("Destroyer", self.ship_manager.ship_locations)
+        # Hit second position; the banner is printed by subscribers of the game's events, not here
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(self.ship_manager.check_sunk_ship(0, 1), "Destroyer")
+        self.assertTrue(self.ship_manager.is_sunk("Destroyer"))
+        self.assertEqual(output.getvalue(), "")
+
+        # The original layout is kept
+        self.assertEqual(self.ship_manager.ship_locations["Destroyer"], [(0, 0), (0, 1)])
 
     def test_all_ships_sunk(self):
         """Test detection of all ships being sunk"""
@@ -73,12 +230,101 @@ class TestShipManager(unittest.TestCase):
         # Hit first position
         result = self.ship_manager.check_sunk_ship_gui(0, 0)
         self.assertIsNone(result)
-        self.assertIn("Destroyer", self.ship_manager.ship_locations)
+        self.assertFalse(self.ship_manager.is_sunk("Destroyer"))
         
         # Hit second position
         result = self.ship_manager.check_sunk_ship_gui(0, 1)
         self.assertEqual(result, "Destroyer")
-        self.assertNotIn("Destroyer", self.ship_manager.ship_locations)
+        self.assertTrue(self.ship_manager.is_sunk("Destroyer"))
+
+        # Hitting a cell again does not sink the ship twice
+        self.assertIsNone(self.ship_manager.check_sunk_ship_gui(0, 1))
+
+    def test_reset_keeps_layout(self):
+        """Test that resetting clears shots but keeps the ships for a new game"""
+        self.ship_manager.deploy_ship("Destroyer", 2, 0, 0, "H")
+        self.ship_manager.deploy_ship("Cruiser", 3, 2, 2, "V")
+        for row, col in [(0, 0), (0, 1)]:
+            self.ship_manager.check_sunk_ship_gui(row, col)
+        self.ship_manager.record_shot(7, 7, False)
+
+        self.ship_manager.reset()
+        self.assertFalse(self.ship_manager.is_sunk("Destroyer"))
+        self.assertFalse(self.ship_manager.is_attacked(7, 7))
+        self.assertEqual(self.ship_manager.ships_afloat, 2)
+        self.assertEqual(self.ship_manager.check_sunk_ship_gui(0, 0), None)
+        self.assertEqual(self.ship_manager.check_sunk_ship_gui(0, 1), "Destroyer")
+
+    def test_bitboard_shots(self):
+        """Test hit/miss bookkeeping and its grid view"""
+        self.ship_manager.record_shot(1, 2, True)
+        self.ship_manager.record_shot(3, 4, False)
+        self.assertTrue(self.ship_manager.is_attacked(1, 2))
+        self.assertTrue(self.ship_manager.is_attacked(3, 4))
+        self.assertFalse(self.ship_manager.is_attacked(0, 0))
+        self.assertEqual(self.ship_manager.grid[1][2], "X")
+        self.assertEqual(self.ship_manager.grid[3][4], "-")
+        self.assertEqual(self.ship_manager.grid[0][0], " ")
+
+        # Writing through the grid view updates the bitboards
+        self.ship_manager.grid[5][5] = "-"
+        self.assertTrue(self.ship_manager.is_attacked(5, 5))
+        self.assertEqual(list(self.ship_manager.grid[5]).count("-"), 1)
+
+    def test_all_ships_sunk_after_hits(self):
+        """Test win detection once every ship cell has been hit"""
+        self.ship_manager.deploy_ship("Destroyer", 2, 4, 4, "V")
+        self.assertTrue(self.ship_manager.has_ship(5, 4))
+        self.ship_manager.check_sunk_ship_gui(4, 4)
+        self.assertFalse(self.ship_manager.all_ships_sunk())
+        self.ship_manager.check_sunk_ship_gui(5, 4)
+        self.assertTrue(self.ship_manager.all_ships_sunk())
+
+    def test_clear(self):
+        """Test that clearing removes every ship and shot"""
+        self.ship_manager.deploy_ship("Destroyer", 2, 4, 4, "V")
+        self.ship_manager.record_shot(0, 0, False)
+        self.ship_manager.clear()
+        self.assertFalse(self.ship_manager.has_ship(4, 4))
+        self.assertFalse(self.ship_manager.is_attacked(0, 0))
+        self.assertEqual(self.ship_manager.ship_locations, {})
+        self.ship_manager.deploy_ship("Destroyer", 2, 4, 4, "H")
+        self.assertEqual(self.ship_manager.ships_afloat, 1)
+
+class TestSparseShipManager(TestShipManager):
+    """Runs the ShipManager tests against the sparse backend, plus huge-board cases"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method"""
+        self.ship_manager = SparseShipManager("Player")
+
+    def test_huge_board(self):
+        """Test that a huge board only stores ship cells and shots"""
+        self.ship_manager.size = 100000
+        self.ship_manager.deploy_ship("Destroyer", 2, 99998, 99999, "V")
+        self.assertTrue(self.ship_manager.overlaps(99999, 99998, "H", 2))
+        self.assertTrue(self.ship_manager.overlaps(99999, 99999, "H", 2))
+        self.ship_manager.record_shot(50000, 50000, False)
+        self.assertTrue(self.ship_manager.placement_attacked(49999, 50000, "V", 3))
+        self.assertEqual(self.ship_manager.check_sunk_ship_gui(99998, 99999), None)
+        self.assertEqual(self.ship_manager.check_sunk_ship_gui(99999, 99999), "Destroyer")
+        self.assertEqual(len(self.ship_manager.ship_cells), 2)
+        self.assertEqual(len(self.ship_manager.hit_cells) + len(self.ship_manager.miss_cells), 3)
+
+    def test_backend_selection(self):
+        """Test that only huge boards with small fleets use the sparse backend"""
+        self.assertTrue(SparseShipManager.suits(10000, 17))
+        self.assertFalse(SparseShipManager.suits(BOARD_SIZE, 17))
+        self.assertFalse(SparseShipManager.suits(10000, 10 ** 7))
+        self.assertIs(type(create_board("Player")), ShipManager)
+
+    def test_sparse_fleet(self):
+        """Test fleet placement on a huge board"""
+        validator = BoardValidator()
+        validator.size = 10000
+        self.ship_manager.size = 10000
+        FleetGenerator(validator, SHIP_TYPES, random.Random(2)).deploy(self.ship_manager)
+        self.assertEqual(len(self.ship_manager.ship_cells), sum(SHIP_TYPES.values()))
 
 class TestBoardValidator(unittest.TestCase):
     """Test cases for the BoardValidator class"""
@@ -108,6 +354,56 @@ class TestBoardValidator(unittest.TestCase):
         self.assertTrue(self.validator.check_overlap(self.test_grid, 0, 0, "H", 2))
         self.assertFalse(self.validator.check_overlap(self.test_grid, 2, 2, "H", 2))
 
+    def test_check_overlap_bitboard(self):
+        """Test ship overlap detection on a ShipManager grid"""
+        ship_manager = ShipManager("Player")
+        ship_manager.deploy_ship("Destroyer", 2, 0, 0, "H")
+        self.assertTrue(self.validator.check_overlap(ship_manager.grid, 0, 1, "V", 3))
+        self.assertFalse(self.validator.check_overlap(ship_manager.grid, 1, 0, "H", 3))
+        self.assertTrue(self.validator.check_overlap(ship_manager.grid, 0, BOARD_SIZE - 1, "H", 3))
+
+    def test_placement_index(self):
+        """Test the memoized index of every placement"""
+        index = self.validator.placement_index(3)
+        self.assertIs(index, BoardValidator().placement_index(3))
+        self.assertEqual(len(index), 2 * BOARD_SIZE * (BOARD_SIZE - 2))
+        board = ShipManager("Player")
+        for i in (0, len(index) - 1):
+            row, col, orientation = index.placement(i)
+            self.assertEqual(index.masks[i], board.placement_mask(row, col, orientation, 3))
+
+    def test_legal_placements(self):
+        """Test the batch legal-placement query against one-at-a-time checks"""
+        board = ShipManager("Player")
+        board.deploy_ship("Battleship", 4, 2, 1, "H")
+        board.deploy_ship("Destroyer", 2, 5, 6, "V")
+        index = self.validator.placement_index(3)
+        legal = {index.placement(i) for i in self.validator.legal_placements(board.ship_mask, 3)}
+        expected = {(row, col, orientation)
+                    for row in range(BOARD_SIZE) for col in range(BOARD_SIZE) for orientation in "HV"
+                    if self.validator.validate_placement(3, row, col, orientation)
+                    and not self.validator.check_overlap(board.grid, row, col, orientation, 3)}
+        self.assertEqual(legal, expected)
+
+        # Large boards take the array path; it must agree with the bitboard masks
+        large = BoardValidator()
+        large.size = 20
+        occupied = (1 << 21) | (1 << 250) | (1 << 399)
+        index = large.placement_index(4)
+        expected = [i for i, mask in enumerate(index.masks) if not mask & occupied]
+        self.assertEqual(large.legal_placements(occupied, 4).tolist(), expected)
+
+    def test_covering_placements(self):
+        """Test finding the placements through given cells, and on-demand masks"""
+        for size in (8, 20):
+            validator = BoardValidator()
+            validator.size = size
+            cells = (1 << 3) | (1 << (size * size - 1))
+            index = validator.placement_index(3)
+            expected = [i for i, mask in enumerate(index.masks) if mask & cells]
+            self.assertEqual(validator.covering_placements(cells, 3).tolist(), expected)
+            self.assertEqual([index.mask(i) for i in range(len(index))], index.masks)
+
 class TestHumanPlayer(unittest.TestCase):
     """Test cases for the HumanPlayer class"""
 
@@ -152,6 +448,62 @@ class TestComputerPlayer(unittest.TestCase):
         self.computer.update_probability_map(HumanPlayer())
         self.assertEqual(self.computer.probability_map.shape, (BOARD_SIZE, BOARD_SIZE))
         
+    def test_probability_map_matches_placement_count(self):
+        """Test the vectorized map against a cell-by-cell count of legal placements"""
+        for row, col, mark in [(0, 0, "-"), (2, 3, "X"), (2, 4, "-"), (5, 5, "-"), (7, 1, "X")]:
+            self.computer.attack_board.grid[row][col] = mark
+        expected = np.zeros((BOARD_SIZE, BOARD_SIZE))
+        for length in SHIP_TYPES.values():
+            for row in range(BOARD_SIZE):
+                for col in range(BOARD_SIZE):
+                    for orientation, (dr, dc) in (("H", (0, 1)), ("V", (1, 0))):
+                        if self.computer.can_place_ship(None, row, col, length, orientation):
+                            for i in range(length):
+                                expected[row + dr * i][col + dc * i] += 1
+        self.computer.update_probability_map(HumanPlayer())
+        np.testing.assert_array_equal(self.computer.probability_map, expected)
+
+    def test_probability_map_fully_blocked(self):
+        """Test that a board with no room for any ship falls back to untouched cells"""
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                if (row + col) % 2:
+                    self.computer.attack_board.grid[row][col] = "-"
+        self.computer.update_probability_map(HumanPlayer())
+        self.assertEqual(self.computer.probability_map[0][0], 1)
+        self.assertEqual(self.computer.probability_map[0][1], 0)
+
+    def test_bitboard_density_matches_density_map(self):
+        """Test the map read straight off the bitboard against the boolean-board map on every table width"""
+        rng = random.Random(8)
+        lengths = [5, 3, 3, 2, 1]
+        for size in range(1, ProbabilityEngine.TABLE_MAX_SIZE + 3):
+            fleet = [length for length in lengths if length <= size]
+            for attacked in (0, size * size // 3, size * size * 2 // 3, size * size - 1):
+                mask = sum(1 << cell for cell in rng.sample(range(size * size), attacked))
+                np.testing.assert_array_equal(
+                    ProbabilityEngine.bitboard_density(mask, size, ProbabilityEngine.fleet_weights(fleet)),
+                    ProbabilityEngine.density_map(ProbabilityEngine.mask_to_array(mask, size), fleet))
+
+    def test_reset(self):
+        """Test that a reset computer can play a new game from scratch"""
+        rng = random.Random(6)
+        human = HumanPlayer()
+        for player in (human, self.computer):
+            player.set_gui_mode(True)
+            GameSetup().deploy_random_fleet(player, rng)
+        while not human.ship_manager.all_ships_sunk():
+            self.computer.take_turn(human)
+        self.computer.reset()
+        self.assertEqual(self.computer.attack_board.attacked_mask, 0)
+        self.assertEqual(self.computer.ship_manager.ship_locations, {})
+        self.assertEqual(self.computer.sunk_ships, [])
+        self.assertIsNone(self.computer.last_hit)
+        human.reset()
+        GameSetup().deploy_random_fleet(human, rng)
+        self.computer.take_turn(human)
+        self.assertEqual(bin(self.computer.attack_board.attacked_mask).count("1"), 1)
+
     def test_gui_mode(self):
         """Test GUI mode settings"""
         self.assertFalse(self.computer.gui_mode)
@@ -160,6 +512,121 @@ class TestComputerPlayer(unittest.TestCase):
         self.computer.set_gui_mode(False)
         self.assertFalse(self.computer.gui_mode)
 
+class TestProbabilityTracker(unittest.TestCase):
+    """Test cases for incremental probability-map updates"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method"""
+        self.tracker = ProbabilityTracker(BOARD_SIZE, SHIP_TYPES.values())
+        self.blocked = np.zeros((BOARD_SIZE, BOARD_SIZE), dtype=bool)
+
+    def shoot(self, row, col):
+        """Marks a cell as attacked in both the tracker and the reference mask"""
+        self.blocked[row, col] = True
+        self.tracker.mark_attacked(row, col)
+
+    def test_matches_full_rebuild(self):
+        """Test that shot-by-shot updates give the same map as a full rebuild"""
+        for row, col in [(0, 0), (3, 3), (3, 4), (7, 2), (5, 6), (1, 7)]:
+            self.shoot(row, col)
+            np.testing.assert_array_equal(
+                self.tracker.density_map(),
+                ProbabilityEngine.density_map(self.blocked, SHIP_TYPES.values()))
+
+    def test_sunk_ship_is_dropped(self):
+        """Test that sinking a ship removes its length from the map"""
+        self.shoot(2, 2)
+        self.tracker.ship_sunk(5)
+        lengths = [length for length in SHIP_TYPES.values() if length != 5]
+        np.testing.assert_array_equal(
+            self.tracker.density_map(), ProbabilityEngine.density_map(self.blocked, lengths))
+        self.assertNotIn(5, self.tracker.counts)
+
+    def test_sync_from_bitboard(self):
+        """Test folding in attacked cells from a bitboard"""
+        self.tracker.sync((1 << 0) | (1 << (BOARD_SIZE + 1)))
+        self.assertTrue(self.tracker.attacked[0, 0])
+        self.assertTrue(self.tracker.attacked[1, 1])
+        self.assertEqual(self.tracker.density[0, 0], 0)
+
+class TestMonteCarloTargeter(unittest.TestCase):
+    """Test cases for sampling-based targeting"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method"""
+        self.targeter = MonteCarloTargeter(BoardValidator(), random.Random(1))
+        self.board = ShipManager("Player")
+
+    def test_targets_next_to_lone_hit(self):
+        """Test that a lone hit pulls the next shot onto a neighbouring cell"""
+        self.board.record_shot(4, 4, True)
+        row, col = self.targeter.choose(self.board, list(SHIP_TYPES.values()), 0, 0.02)
+        self.assertEqual(abs(row - 4) + abs(col - 4), 1)
+
+    def test_respects_time_budget(self):
+        """Test that a move returns once the budget is spent"""
+        start = time.perf_counter()
+        target = self.targeter.choose(self.board, list(SHIP_TYPES.values()), 0, 0.01)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertFalse(self.board.is_attacked(*target))
+
+    def test_sunk_ship_cells_are_resolved(self):
+        """Test attributing a sunk ship to the only line of hits that fits"""
+        self.board.record_shot(2, 3, True)
+        self.board.record_shot(2, 4, True)
+        self.targeter.ship_sunk(self.board, 2, 4, 2)
+        self.assertEqual(self.targeter.resolved_mask, self.board.placement_mask(2, 3, "H", 2))
+
+    def test_game_with_time_budget(self):
+        """Test complete games with Monte-Carlo targeting"""
+        report = BatchSimulator(seed=2, time_budget=0.0005).run(1)
+        self.assertEqual(report.games, 1)
+
+class TestFleetGenerator(unittest.TestCase):
+    """Test cases for random fleet placement"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method"""
+        self.validator = BoardValidator()
+        self.rng = random.Random(4)
+
+    def test_generate_valid_fleet(self):
+        """Test that a generated fleet fits the board without overlaps"""
+        board = ShipManager("Player")
+        FleetGenerator(self.validator, SHIP_TYPES, self.rng).deploy(board)
+        self.assertEqual(list(board.ship_locations), list(SHIP_TYPES))
+        self.assertEqual(bin(board.ship_mask).count("1"), sum(SHIP_TYPES.values()))
+
+    def test_crowded_board(self):
+        """Test packing a fleet that fills almost the whole board"""
+        self.validator.size = 8
+        fleet = {f"Ship {i}": 5 for i in range(12)}
+        layout = FleetGenerator(self.validator, fleet, self.rng).generate()
+        cells = set()
+        for ship, length, row, col, orientation in layout:
+            dr, dc = (0, 1) if orientation == "H" else (1, 0)
+            cells.update((row + dr * i, col + dc * i) for i in range(length))
+        self.assertEqual(len(cells), 60)
+
+    def test_impossible_fleet(self):
+        """Test that fleets that cannot fit raise an error instead of looping"""
+        self.validator.size = 6
+        with self.assertRaises(FleetPlacementError):
+            FleetGenerator(self.validator, {f"Ship {i}": 4 for i in range(9)}, self.rng).generate()
+        with self.assertRaises(FleetPlacementError):
+            FleetGenerator(self.validator, {"Giant": 7}, self.rng).generate()
+
+    def test_bulk_layouts(self):
+        """Test bulk generation of layouts as bitboards"""
+        layouts = list(FleetGenerator(self.validator, SHIP_TYPES, self.rng).generate_masks(50))
+        self.assertEqual(len(layouts), 50)
+        for layout in layouts:
+            occupied = 0
+            for mask in layout:
+                self.assertFalse(mask & occupied)
+                occupied |= mask
+            self.assertEqual(bin(occupied).count("1"), sum(SHIP_TYPES.values()))
+
 class TestGameSetup(unittest.TestCase):
     """Test cases for the GameSetup class"""
 
@@ -173,6 +640,714 @@ class TestGameSetup(unittest.TestCase):
         self.assertIsInstance(self.setup.players[0], HumanPlayer)
         self.assertIsInstance(self.setup.players[1], ComputerPlayer)
 
+    def test_deploy_random_fleet(self):
+        """Test silent random deployment of a whole fleet"""
+        computer = self.setup.players[1]
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.setup.deploy_random_fleet(computer)
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(set(computer.ship_manager.ship_locations), set(SHIP_TYPES))
+        self.assertEqual(bin(computer.ship_manager.ship_mask).count("1"), sum(SHIP_TYPES.values()))
+
+class TestBatchSimulator(unittest.TestCase):
+    """Test cases for the headless BatchSimulator"""
+
+    def test_run_is_silent_and_complete(self):
+        """Test that a batch plays every game to the end without printing"""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            report = BatchSimulator(seed=7).run(3)
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(report.games, 3)
+        self.assertEqual(sum(report.shots_to_win.values()), 3)
+        self.assertEqual(sum(report.wins), 3)
+        self.assertGreaterEqual(min(report.shots_to_win), sum(SHIP_TYPES.values()))
+        self.assertGreater(report.moves_per_second, 0)
+
+    def test_incremental_players(self):
+        """Test complete games with incremental probability maps"""
+        report = BatchSimulator(seed=5, incremental=True).run(2)
+        self.assertEqual(report.games, 2)
+
+    def test_seed_is_reproducible(self):
+        """Test that the same seed replays the same games"""
+        first = BatchSimulator(seed=11).run(2)
+        second = BatchSimulator(seed=11).run(2)
+        self.assertEqual(first.shots_to_win, second.shots_to_win)
+        self.assertEqual(first.moves, second.moves)
+
+class TestTournament(unittest.TestCase):
+    """Test cases for the multi-process Tournament"""
+
+    def test_results_independent_of_workers(self):
+        """Test that a master seed gives identical results for any worker count and chunking"""
+        single = Tournament(6, seed=3, workers=1, chunk_size=6).run()
+        pooled = Tournament(6, seed=3, workers=2, chunk_size=2).run()
+        self.assertEqual(single.games, 6)
+        self.assertEqual(single.shots_to_win, pooled.shots_to_win)
+        self.assertEqual(single.wins, pooled.wins)
+        self.assertEqual(single.moves, pooled.moves)
+
+    def test_variant_in_workers(self):
+        """Test that worker processes play the tournament's variant"""
+        config = GameConfig(6, {"Cruiser": 3, "Destroyer": 2})
+        report = Tournament(4, seed=2, workers=2, chunk_size=2, config=config).run()
+        local = play_chunk(2, 0, 4, config)
+        self.assertEqual(report.games, 4)
+        self.assertEqual(report.shots_to_win, local.shots_to_win)
+        self.assertEqual(report.moves, local.moves)
+        self.assertTrue(all(5 <= shots <= 36 for shots in report.shots_to_win))  # The variant's fleet and board
+
+class TestGameServer(unittest.TestCase):
+    """Test cases for the TCP game server and its sessions"""
+
+    def test_session_placement(self):
+        """Test placing ships by hand and the errors for illegal placements"""
+        session = GameSession(random.Random(1))
+        self.assertEqual(session.phase, "placement")
+        session.place_ship("Carrier", "A1", "H")
+        with self.assertRaises(GameError):
+            session.place_ship("Carrier", "A3", "H")
+        with self.assertRaises(GameError):
+            session.place_ship("Battleship", "A1", "V")
+        with self.assertRaises(GameError):
+            session.fire("A1")
+        with self.assertRaises(ValueError):
+            session.place_ship("Battleship", "Z99", "V")
+
+    def test_session_plays_to_the_end(self):
+        """Test firing at every cell until someone wins"""
+        session = GameSession(random.Random(2))
+        session.place_random_fleet()
+        self.assertEqual(session.phase, "playing")
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                result = session.fire(f"{chr(65 + col)}{row + 1}")
+                if result["winner"]:
+                    break
+            if session.winner:
+                break
+        self.assertEqual(session.phase, "over")
+        self.assertIn(session.winner, ("Player", "Computer"))
+        with self.assertRaises(GameError):
+            session.fire("A1")
+
+    def test_protocol(self):
+        """Test a short exchange of line-delimited JSON requests over TCP"""
+        async def exchange():
+            server = GameServer(port=0, ai_workers=2)
+            port = await server.start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            replies = []
+            for request in ({"cmd": "new_game", "random_fleet": True, "seed": 5, "id": 1},
+                            {"cmd": "fire", "game": 1, "position": "C3"},
+                            {"cmd": "fire", "game": 1, "position": "C3"},
+                            {"cmd": "state", "game": 1},
+                            {"cmd": "snapshot", "game": 1},
+                            {"cmd": "teleport", "game": 1}):
+                writer.write(json.dumps(request).encode() + b"\n")
+                replies.append(json.loads(await reader.readline()))
+            writer.write(b"not json\n")
+            replies.append(json.loads(await reader.readline()))
+            writer.write(json.dumps({"cmd": "new_game", "snapshot": replies[4]["snapshot"]}).encode() + b"\n")
+            resumed = json.loads(await reader.readline())
+            writer.write(json.dumps({"cmd": "state", "game": resumed["game"]}).encode() + b"\n")
+            replies.append(json.loads(await reader.readline()))
+            writer.close()
+            await server.close()
+            return replies
+
+        new_game, fire, repeat, state, snapshot, unknown, garbage, resumed = asyncio.run(exchange())
+        self.assertEqual(new_game, {"game": 1, "phase": "playing", "ok": True, "id": 1})
+        self.assertIn(fire["result"], ("hit", "miss"))
+        self.assertIn(fire["reply"]["result"], ("hit", "miss"))
+        self.assertFalse(repeat["ok"])
+        self.assertEqual(state["moves"], 2)
+        self.assertEqual(len(state["attacks"]), BOARD_SIZE)
+        self.assertFalse(unknown["ok"])
+        self.assertFalse(garbage["ok"])
+        self.assertEqual(resumed["attacks"], state["attacks"])
+
+    def test_games_belong_to_their_connection(self):
+        """Test that a connection cannot see, play or close another connection's game"""
+        async def exchange():
+            server = GameServer()
+            first, second = set(), set()
+            game = (await server.execute({"cmd": "new_game", "random_fleet": True, "seed": 3}, first))["game"]
+            replies = [await server.dispatch(json.dumps({"cmd": cmd, "game": game, "position": "A1"}).encode(), second)
+                       for cmd in ("state", "fire", "snapshot", "close")]
+            state = await server.execute({"cmd": "state", "game": game}, first)
+            server.executor.shutdown()
+            return replies, state
+
+        replies, state = asyncio.run(exchange())
+        for reply in replies:
+            self.assertEqual(reply, {"ok": False, "error": "Unknown game 1."})
+        self.assertEqual(state["moves"], 0)
+
+    def test_snapshots_stay_on_the_server(self):
+        """Test that clients get a token for a saved game, never the computer's fleet, and cannot hand in their own"""
+        async def exchange():
+            server = GameServer()
+            first, second = set(), set()
+            game = (await server.execute({"cmd": "new_game", "random_fleet": True, "seed": 3}, first))["game"]
+            token = (await server.execute({"cmd": "snapshot", "game": game}, first))["snapshot"]
+            resumed = (await server.execute({"cmd": "new_game", "snapshot": token}, second))["game"]
+            state = await server.execute({"cmd": "state", "game": resumed}, second)
+            forged = base64.b64encode(server.snapshots[token][1]).decode()
+            forged = await server.dispatch(json.dumps({"cmd": "new_game", "snapshot": forged}), second)
+            server.executor.shutdown()
+            return server.sessions[game], token, state, forged
+
+        session, token, state, forged = asyncio.run(exchange())
+        self.assertLess(len(token), 30)
+        self.assertEqual(state, session.state())
+        self.assertEqual(forged, {"ok": False, "error": "Unknown snapshot."})
+
+    def test_fields_of_the_wrong_type(self):
+        """Test that non-string fields and unexpected failures are answered, not fatal"""
+        async def exchange():
+            server = GameServer()
+            owned = set()
+            game = (await server.execute({"cmd": "new_game", "seed": 4}, owned))["game"]
+            requests = ({"cmd": "place_ship", "game": game, "ship": ["Carrier"], "position": "A1"},
+                        {"cmd": "place_ship", "game": game, "ship": "Carrier", "position": "A1", "orientation": 1},
+                        {"cmd": "random_fleet", "game": game},
+                        {"cmd": "fire", "game": game, "position": 5})
+            replies = [await server.dispatch(json.dumps(request).encode(), owned) for request in requests]
+            def broken_move(position):
+                raise RuntimeError("Stands in for a bug in a move")
+            server.sessions[game].fire = broken_move
+            replies.append(await server.dispatch(json.dumps({"cmd": "fire", "game": game, "position": "A1"}), owned))
+            server.executor.shutdown()
+            return replies
+
+        ship, orientation, fleet, position, broken = asyncio.run(exchange())
+        self.assertEqual(ship, {"ok": False, "error": "Field 'ship' must be a string."})
+        self.assertEqual(orientation, {"ok": False, "error": "Field 'orientation' must be a string."})
+        self.assertTrue(fleet["ok"])
+        self.assertEqual(position, {"ok": False, "error": "Field 'position' must be a string."})
+        self.assertEqual(broken, {"ok": False, "error": "Internal error (RuntimeError)."})
+
+    def test_variant_config(self):
+        """Test that clients can ask for another board and fleet, within the server's limits"""
+        async def exchange():
+            server = GameServer()
+            owned = set()
+            variant = {"board_size": 12, "ships": {"Cruiser": 3, "Destroyer": 2}}
+            first = await server.execute({"cmd": "new_game", "config": variant}, owned)
+            second = await server.execute({"cmd": "new_game", "config": dict(variant)}, owned)
+            huge = {"board_size": 1000, "ships": {"Cruiser": 3}}
+            too_large = await server.dispatch(json.dumps({"cmd": "new_game", "config": huge}), owned)
+            invalid = await server.dispatch(json.dumps({"cmd": "new_game", "config": {"board_size": 12}}), owned)
+            crowded = {"board_size": 20, "ships": {f"Ship {i}": 12 for i in range(32)}}
+            crowded = await server.dispatch(json.dumps({"cmd": "new_game", "config": crowded}), owned)
+            rejected = GameConfig(1000, {"Cruiser": 3}) in GameConfig._interned
+            server.executor.shutdown()
+            return (server.sessions[first["game"]], server.sessions[second["game"]], too_large, invalid, crowded,
+                    rejected)
+
+        first, second, too_large, invalid, crowded, rejected = asyncio.run(exchange())
+        self.assertEqual(first.unplaced, ["Cruiser", "Destroyer"])
+        self.assertEqual(len(first.state()["ships"]), 12)
+        self.assertIs(first.config, second.config)
+        self.assertFalse(too_large["ok"])
+        self.assertFalse(invalid["ok"])
+        self.assertEqual(crowded, {"ok": False, "error": "A fleet may cover at most half of the board."})
+        self.assertFalse(rejected)  # Rejected variants never take a slot in the shared table
+
+    def test_slow_moves_time_out(self):
+        """Test that slow game work runs off the event loop and is answered with an error once it takes too long"""
+        async def exchange():
+            server = GameServer()
+            server.MOVE_TIMEOUT = 0.2
+            owned = set()
+            slow, other = [(await server.execute({"cmd": "new_game", "seed": seed}, owned))["game"] for seed in (1, 2)]
+            server.sessions[slow].place_random_fleet = lambda: time.sleep(1)
+            pending = asyncio.ensure_future(server.dispatch(json.dumps({"cmd": "random_fleet", "game": slow}), owned))
+            await asyncio.sleep(0.05)
+            state = await server.dispatch(json.dumps({"cmd": "state", "game": other}), owned)
+            done = pending.done()  # Still waiting for the slow placement while the other game was answered
+            reply = await pending
+            server.executor.shutdown()
+            return state, done, reply
+
+        state, done, reply = asyncio.run(exchange())
+        self.assertTrue(state["ok"])
+        self.assertFalse(done)
+        self.assertEqual(reply, {"ok": False, "error": "The server took too long to carry out this request."})
+
+    def test_load_client(self):
+        """Test that the load generator plays full games and reports latencies"""
+        async def load():
+            server = GameServer(port=0)
+            port = await server.start()
+            report = await LoadClient("127.0.0.1", port, connections=3, games=2, seed=1).run()
+            await server.close()
+            return report
+
+        report = asyncio.run(load())
+        self.assertEqual(report.games, 6)
+        self.assertEqual(report.errors, 0)
+        self.assertGreater(report.moves_per_second, 0)
+        self.assertLessEqual(report.percentile(50), report.percentile(99))
+
+class TestGameSnapshot(unittest.TestCase):
+    """Test cases for binary game snapshots"""
+
+    def play_some_moves(self, players, rng, moves=12):
+        """Plays a few AI-vs-AI moves so the snapshot has shots and targeting state"""
+        for player in players:
+            player.set_gui_mode(True)
+            GameSetup().deploy_random_fleet(player, rng)
+        for i in range(moves):
+            players[i % 2].take_turn(players[1 - i % 2])
+
+    def test_round_trip(self):
+        """Test that a restored game has the same boards and AI targeting state"""
+        rng = random.Random(7)
+        players = [ComputerPlayer(rng, incremental=True), ComputerPlayer(rng, time_budget=0.001)]
+        self.play_some_moves(players, rng)
+        data = GameSnapshot.dumps(players, b"extra")
+        self.assertLess(len(data), 400)
+        restored, extra = GameSnapshot.loads(data)
+        self.assertEqual(extra, b"extra")
+        self.assertEqual(GameSnapshot.dumps(restored, b"extra"), data)
+        for before, after in zip(players, restored):
+            for attribute in ("last_hit", "direction", "hit_stack", "sunk_ships", "last_move", "time_budget"):
+                self.assertEqual(getattr(after, attribute), getattr(before, attribute))
+            self.assertEqual(after.ship_manager.ship_health, before.ship_manager.ship_health)
+            self.assertEqual(list(after.attack_board.grid[3]), list(before.attack_board.grid[3]))
+        for player in (players[0], restored[0]):
+            player.update_probability_map(None)
+        self.assertTrue(np.array_equal(restored[0].probability_map, players[0].probability_map))
+        self.assertEqual(restored[1].targeter.resolved_mask, players[1].targeter.resolved_mask)
+
+    def test_session_snapshot(self):
+        """Test saving and resuming a server session"""
+        session = GameSession(random.Random(4))
+        session.place_ship("Carrier", "A1", "H")
+        resumed = GameSession(snapshot=session.snapshot())
+        self.assertEqual(resumed.state(), session.state())
+        self.assertEqual(resumed.unplaced, session.unplaced)
+
+    def test_corrupt_snapshot(self):
+        """Test that damaged or foreign data is rejected"""
+        rng = random.Random(1)
+        players = [HumanPlayer(), ComputerPlayer(rng)]
+        self.play_some_moves(players, rng, moves=0)
+        data = GameSnapshot.dumps(players)
+        for bad in (b"", data[:20], b"XXXX" + data[4:], data[:5] + b"\x03\x00" + data[7:]):
+            with self.assertRaises(SnapshotError):
+                GameSnapshot.loads(bad)
+
+    def test_variant_snapshot(self):
+        """Test that a snapshot of another board size restores with its own config only"""
+        config = GameConfig(14, {"Carrier": 5, "Submarine": 3, "Destroyer": 2})
+        rng = random.Random(6)
+        players = [ComputerPlayer(rng, config=config), ComputerPlayer(rng, incremental=True, config=config)]
+        self.play_some_moves(players, rng)
+        data = GameSnapshot.dumps(players)
+        restored, _ = GameSnapshot.loads(data, config)
+        self.assertEqual(restored[1].attack_board.size, 14)
+        self.assertEqual(GameSnapshot.dumps(restored), data)
+        with self.assertRaises(SnapshotError):
+            GameSnapshot.loads(data)
+
+    def test_seats_are_checked(self):
+        """Test that a snapshot putting a human in the computer's seat is refused"""
+        data = GameSnapshot.dumps([HumanPlayer(), HumanPlayer()], GameSession.STATE.pack(0, 0, 0))
+        restored, _ = GameSnapshot.loads(data)
+        self.assertEqual([type(player) for player in restored], [HumanPlayer, HumanPlayer])
+        with self.assertRaises(SnapshotError):
+            GameSnapshot.loads(data, seats=[HumanPlayer, ComputerPlayer])
+        with self.assertRaises(SnapshotError):
+            GameSession(snapshot=data)
+
+    def test_tampered_snapshot(self):
+        """Test that edited ships, targeting state and session state are refused instead of breaking the game"""
+        session = GameSession(random.Random(2))
+        session.place_random_fleet()
+        session.fire("A1")
+        data = session.snapshot()
+        self.assertEqual(GameSession(snapshot=data).state(), session.state())
+
+        def edited(offset, value):
+            return data[:offset] + value + data[offset + len(value):]
+
+        # The computer's record follows the human's; its ships follow its player record and five boards
+        offset = len(GameSnapshot.dumps([session.human])) + GameSnapshot.PLAYER.size
+        for _ in range(5):
+            offset += GameSnapshot.MASK_LENGTH.size + GameSnapshot.MASK_LENGTH.unpack_from(data, offset)[1]
+        ship_type, row, column, vertical = GameSnapshot.SHIP.unpack_from(data, offset)
+        far_away = edited(offset, GameSnapshot.SHIP.pack(ship_type, 5000, 5000, vertical))
+        turned = edited(offset, GameSnapshot.SHIP.pack(ship_type, row, column, 1 - vertical))
+        stack_length = offset + len(SHIP_TYPES) * GameSnapshot.SHIP.size + GameSnapshot.AI.size - 2
+        long_stack = edited(stack_length, b"\xff\x7f")
+        winner = edited(len(data) - 1, b"\x07")
+        for bad in (far_away, turned, long_stack, winner, data[:-1]):
+            with self.assertRaises(SnapshotError):
+                GameSession(snapshot=bad)
+
+class TestReplayLog(unittest.TestCase):
+    """Test cases for the memory-mapped replay log"""
+
+    def setUp(self):
+        """Set up a temporary log file"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "replay.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_records_every_simulated_shot(self):
+        """Test that a recorded batch logs each game's shots with its result"""
+        with ReplayRecorder(self.path, buffer_records=16) as recorder:
+            report = BatchSimulator(seed=3, recorder=recorder).run(3)
+        log = ReplayLog(self.path)
+        self.assertEqual(os.path.getsize(self.path), 16 * report.moves)
+        game_ids, counts = log.shots_per_game()
+        self.assertEqual(game_ids.tolist(), [1, 2, 3])
+        self.assertEqual(counts.sum(), report.moves)
+        for game, records in log.games():
+            self.assertEqual(records["turn"].tolist(), list(range(len(records))))
+            winner = records["shooter"][-1]
+            shots = records[records["shooter"] == winner]
+            hits = shots[shots["result"] != ReplayRecorder.MISS]
+            self.assertEqual(len(set(zip(hits["row"].tolist(), hits["column"].tolist()))), sum(SHIP_TYPES.values()))
+            self.assertEqual(np.count_nonzero(shots["result"] == ReplayRecorder.SUNK), len(SHIP_TYPES))
+        self.assertEqual(len(log.game(2)), counts[1])
+
+    def test_appends_after_existing_games(self):
+        """Test that reopening a log continues its game ids and ignores a torn record"""
+        with ReplayRecorder(self.path) as recorder:
+            players = [HumanPlayer(), ComputerPlayer()]
+            recorder.attach(players)
+            players[0].set_gui_mode(True)
+            GameSetup().deploy_random_fleet(players[1], random.Random(2))
+            row, column = players[1].ship_manager.ship_locations["Destroyer"][0]
+            players[0].fire(players[1], row, column)
+            players[0].fire(players[1], 7 - row, 7 - column)
+        with open(self.path, "ab") as f:
+            f.write(b"\x00" * 5)
+        with ReplayRecorder(self.path) as recorder:
+            players = [HumanPlayer(), ComputerPlayer()]
+            self.assertEqual(recorder.attach(players), 2)
+            players[0].fire(players[1], 3, 4)
+        log = ReplayLog(self.path)
+        self.assertEqual(os.path.getsize(self.path), 3 * ReplayRecorder.RECORD.size)
+        self.assertEqual(len(log), 3)
+        self.assertEqual((log[0]["row"], log[0]["column"], log[0]["result"]), (row, column, ReplayRecorder.HIT))
+        self.assertEqual(log[1]["turn"], 1)
+        self.assertEqual((log[2]["game"], log[2]["turn"], log[2]["row"], log[2]["column"], log[2]["shooter"],
+                          log[2]["result"], log[2]["ship"]), (2, 0, 3, 4, 0, ReplayRecorder.MISS, ReplayRecorder.NO_SHIP))
+
+    def test_empty_log(self):
+        """Test reading a log with no games"""
+        ReplayRecorder(self.path).close()
+        log = ReplayLog(self.path)
+        self.assertEqual(len(log), 0)
+        self.assertEqual(list(log.games()), [])
+
+class TestTrainingExport(unittest.TestCase):
+    """Test cases for the sharded training-data exporter"""
+
+    def test_shards_replay_the_game(self):
+        """Test that each state's planes are the shooter's earlier moves and shards are mmap-loadable"""
+        with tempfile.TemporaryDirectory() as directory:
+            with ShardWriter(directory, shard_size=16) as writer:
+                writer.extend(simulated_states(1, seed=9))
+            shards = list(load_shards(directory))
+            self.assertIsInstance(shards[0], np.memmap)
+            self.assertEqual([len(shard) for shard in shards[:-1]], [16] * (len(shards) - 1))
+            states = np.concatenate(shards)
+            del shards
+        self.assertEqual(len(states), writer.states)
+        self.assertEqual(states["board"].dtype, np.int8)
+        boards = [np.zeros((2, BOARD_SIZE, BOARD_SIZE), dtype=np.int8) for _ in range(2)]
+        for turn, state in enumerate(states):
+            board = boards[turn % 2]
+            self.assertTrue(np.array_equal(state["board"], board))
+            row, column = divmod(int(state["move"]), BOARD_SIZE)
+            board[0 if state["outcome"] != ReplayRecorder.MISS else 1, row, column] = 1
+        final = states[-1]
+        self.assertEqual(final["outcome"], ReplayRecorder.SUNK)
+        self.assertEqual(int(final["fleet"].sum()), 1)
+
+    def test_refuses_existing_shards(self):
+        """Test that a second export into the same directory cannot overwrite or mix with the first"""
+        with tempfile.TemporaryDirectory() as directory:
+            with ShardWriter(directory, shard_size=16) as writer:
+                writer.extend(simulated_states(1, seed=9))
+            with self.assertRaises(FileExistsError):
+                ShardWriter(directory, shard_size=16)
+            self.assertEqual(sorted(os.listdir(directory)), sorted(map(os.path.basename, writer.paths)))
+            with ShardWriter(directory, shard_size=16, prefix="other") as other:
+                other.extend(simulated_states(1, seed=3))
+            self.assertEqual(sum(len(shard) for shard in load_shards(directory)), writer.states)
+
+class TestVectorEnv(unittest.TestCase):
+    """Test cases for the batched NumPy environment"""
+
+    def assert_fleets_valid(self, env):
+        """Checks that every game holds each ship once, as one straight line of its length"""
+        for ships in env.ships:
+            for ship, length in enumerate(SHIP_TYPES.values()):
+                rows, columns = np.nonzero(ships == ship)
+                self.assertEqual(len(rows), length)
+                self.assertTrue(len(set(rows)) == 1 or len(set(columns)) == 1)
+                self.assertEqual(rows.max() - rows.min() + columns.max() - columns.min(), length - 1)
+
+    def test_fleets(self):
+        """Test that fresh fleets are legal, on the default and on crowded boards"""
+        self.assert_fleets_valid(VectorEnv(64, seed=1))
+        crowded = GameConfig(4, {"A": 4, "B": 4, "C": 4, "D": 3})
+        env = VectorEnv(8, crowded, seed=2)
+        self.assertTrue(((env.ships >= 0).sum(axis=(1, 2)) == crowded.fleet_cells).all())
+
+    def test_games_play_to_the_end_and_reset(self):
+        """Test hit, sunk and done vectors against the hidden fleets while games restart on their own"""
+        env = VectorEnv(32, seed=3)
+        ships = env.ships.reshape(32, -1).copy()
+        order = np.random.default_rng(4).permutation(BOARD_SIZE * BOARD_SIZE)
+        finished = np.zeros(32, dtype=bool)
+        sunk_seen = [[] for _ in range(32)]
+        for turn, cell in enumerate(order):
+            hit, sunk, done = env.step(np.full(32, cell))
+            playing = ~finished
+            self.assertTrue(np.array_equal(hit[playing], ships[playing, cell] >= 0))
+            for game in np.flatnonzero(playing & (sunk >= 0)):
+                sunk_seen[game].append(int(sunk[game]))
+            for game in np.flatnonzero(playing & done):
+                self.assertEqual(env.final_moves[game], turn + 1)
+                # The game was dealt a new fleet and an empty board
+                self.assertFalse(env.shots[game].any())
+                self.assertEqual(env.moves[game], 0)
+            finished |= done
+        self.assertTrue(finished.all())
+        self.assertGreaterEqual(env.total_games, 32)
+        for seen in sunk_seen:
+            self.assertEqual(sorted(seen), list(range(len(SHIP_TYPES))))
+        self.assert_fleets_valid(env)
+
+    def test_repeated_shot_is_a_miss(self):
+        """Test that firing at the same cell twice only counts the first hit"""
+        env = VectorEnv(4, seed=5)
+        cells = np.argmax(env.ship_cells >= 0, axis=1)
+        self.assertTrue(env.step(cells)[0].all())
+        self.assertFalse(env.step(cells)[0].any())
+        self.assertTrue((env.health.sum(axis=1) == sum(SHIP_TYPES.values()) - 1).all())
+
+    def test_policies_pick_free_cells(self):
+        """Test that the random and density policies never fire twice at a cell"""
+        env = VectorEnv(16, seed=6)
+        for policy in (env.random_actions, env.density_actions):
+            for _ in range(BOARD_SIZE * BOARD_SIZE // 2):
+                actions = policy()
+                self.assertFalse(env.shot_cells[env.games, actions].any())
+                env.step(actions)
+
+class TestStartup(unittest.TestCase):
+    """Test cases for the fast start-up path"""
+
+    def test_cli_start_skips_heavy_imports(self):
+        """Test that starting a command-line game loads neither NumPy nor Tk"""
+        sample = measure(ENTRY_POINTS["cli"])
+        self.assertIn("cli_gameplay", sample.imports)
+        self.assertEqual(sample.heavy_modules(), [])
+
+    def test_parse_importtime(self):
+        """Test reading the -X importtime report"""
+        report = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       120 |        120 |   numpy._core\n"
+                  "import time:        80 |        200 | numpy\n")
+        sample = StartupSample(0.1, StartupSample.parse_importtime(report))
+        self.assertEqual(sample.imports["numpy"], (80, 200))
+        self.assertEqual(sample.heavy_modules(), ["numpy"])
+        self.assertEqual(sample.slowest(1), [("numpy._core", 120)])
+
+    def test_mode_flags(self):
+        """Test that unknown command-line flags are rejected"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(SystemExit) as exit_info:
+                main.main(["--bogus"])
+        self.assertEqual(exit_info.exception.code, 2)
+
+class TestGameEvents(unittest.TestCase):
+    """Test cases for the event stream published by the players"""
+
+    def setUp(self):
+        """Set up a game whose computer fleet is a single Destroyer at A1-B1"""
+        self.players = [HumanPlayer(), ComputerPlayer(random.Random(1))]
+        self.players[1].ship_manager.deploy_ship("Destroyer", 2, 0, 0, "H")
+        self.events = EventBus.of(self.players)
+
+    def test_event_order(self):
+        """Test that a winning shot publishes ShotFired, Hit, Sunk and GameOver in that order"""
+        seen = []
+        self.events.subscribe(GameEvent, seen.append)
+        human, computer = self.players
+        human.fire(computer, 5, 5)
+        human.fire(computer, 0, 0)
+        human.fire(computer, 0, 1)
+        self.assertEqual([type(event) for event in seen],
+                         [ShotFired, Miss, ShotFired, Hit, ShotFired, Hit, Sunk, GameOver])
+        self.assertIsNone(seen[3].sunk_ship)
+        self.assertEqual(seen[5].sunk_ship, "Destroyer")
+        self.assertEqual((seen[6].ship, seen[6].row, seen[6].column), ("Destroyer", 0, 1))
+        self.assertIs(seen[7].winner, human)
+        self.assertIs(seen[7].loser, computer)
+
+    def test_base_class_subscription(self):
+        """Test that subscribing to ShotResult receives hits and misses, and unsubscribing stops them"""
+        results = []
+        self.events.subscribe(ShotResult, results.append)
+        self.players[0].fire(self.players[1], 0, 0)
+        self.players[0].fire(self.players[1], 3, 3)
+        self.assertEqual([event.hit for event in results], [True, False])
+        self.events.unsubscribe(ShotResult, results.append)
+        self.players[0].fire(self.players[1], 4, 4)
+        self.assertEqual(len(results), 2)
+        self.assertIs(EventBus.of(self.players), self.events)
+
+    def test_unobserved_events_are_not_built(self):
+        """Test that events nobody subscribed to are never constructed"""
+        class Counted(Miss):
+            built = 0
+            def __init__(self, *args):
+                Counted.built += 1
+                super().__init__(*args)
+
+        self.events.emit(Counted, self.players[0], 0, 0)
+        self.assertEqual(Counted.built, 0)
+        self.events.subscribe(Miss, lambda event: None)
+        self.events.emit(Counted, self.players[0], 0, 0)
+        self.assertEqual(Counted.built, 1)
+
+    def test_simulation_is_silent(self):
+        """Test that games without subscribers publish nothing and print nothing"""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            BatchSimulator(seed=4).run(1)
+        self.assertEqual(output.getvalue(), "")
+
+    def test_console_renderer(self):
+        """Test that the CLI renderer prints hits, sunk ships and the winner"""
+        ConsoleRenderer().subscribe(self.events)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.players[0].fire(self.players[1], 0, 0)
+            self.players[0].fire(self.players[1], 0, 1)
+        text = output.getvalue()
+        self.assertIn("Hit!", text)
+        self.assertIn("Player`s Guess Board", text)
+        self.assertIn("Player has sunk the Destroyer!", text)
+        self.assertIn("Player has won the game!", text)
+        self.assertLess(text.index("has sunk"), text.index("has won"))
+
+@unittest.skipIf(pty is None, "needs POSIX pseudo-terminals")
+class TestCursesDisplay(unittest.TestCase):
+    """Test cases for the full-screen terminal renderer"""
+
+    def per_turn(self, size):
+        """Measures the bytes the curses renderer writes per turn on a pseudo-terminal"""
+        from curses_display import terminal_bytes
+        short_bytes, short_turns = terminal_bytes(size, 2, 5)
+        long_bytes, long_turns = terminal_bytes(size, 8, 5)
+        return (long_bytes - short_bytes) / (long_turns - short_turns), short_bytes
+
+    def test_bytes_per_turn_do_not_grow_with_the_board(self):
+        """Test that a turn rewrites a few cells, not the boards, whatever their size"""
+        small, small_total = self.per_turn(8)
+        large, large_total = self.per_turn(40)
+        self.assertGreater(large_total, small_total)  # The first draw does grow
+        self.assertLess(large, 2 * small)
+        from curses_display import print_bytes
+        printed, turns = print_bytes(40, 8, 5)
+        self.assertLess(large * 10, printed / turns)
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for the opt-in hot-path timers"""
+
+    def setUp(self):
+        """Start every test with metrics off and empty"""
+        self.was_enabled = metrics.enabled()
+        metrics.disable()
+        metrics.REGISTRY.reset()
+
+    def tearDown(self):
+        metrics.enable() if self.was_enabled else metrics.disable()
+        metrics.REGISTRY.reset()
+
+    def original(self, owner, name):
+        return next(function for cls, attribute, function, _ in metrics.TIMED_METHODS
+                    if cls is owner and attribute == name)
+
+    def test_disabled_methods_are_untouched(self):
+        """Test that disabled hot paths are the original functions and enabled ones are timed"""
+        original = self.original(BoardValidator, "check_overlap")
+        self.assertIs(BoardValidator.check_overlap, original)
+        metrics.enable()
+        self.assertIsNot(BoardValidator.check_overlap, original)
+        validator = BoardValidator()
+        grid = ShipManager("Computer").grid
+        for _ in range(3):
+            self.assertFalse(validator.check_overlap(grid, 0, 0, "H", 2))
+        histogram = metrics.REGISTRY.timers["BoardValidator.check_overlap"]
+        self.assertEqual(histogram.count, 3)
+        self.assertGreater(histogram.sum, 0)
+        metrics.disable()
+        self.assertIs(BoardValidator.check_overlap, original)
+
+    def test_game_is_measured(self):
+        """Test that an enabled simulation times the AI and counts the game's events"""
+        metrics.enable()
+        report = BatchSimulator(seed=5).run(2)
+        timers = metrics.REGISTRY.timers
+        self.assertEqual(timers["ComputerPlayer.take_turn"].count, report.moves)
+        events = metrics.REGISTRY.events
+        self.assertEqual(events["games"], 2)
+        self.assertEqual(events["hits"] + events["misses"], report.moves)
+        # Each loser's whole fleet, and part of each winner's
+        self.assertGreaterEqual(events["ships_sunk"], 2 * len(SHIP_TYPES))
+        self.assertLess(events["ships_sunk"], 4 * len(SHIP_TYPES))
+        self.assertEqual(metrics.REGISTRY.to_dict()["events"], events)
+
+    def test_exports(self):
+        """Test the JSON and Prometheus exports of a histogram"""
+        histogram = metrics.REGISTRY.timer("Test.path")
+        for seconds in (2e-6, 3e-6, 0.02, 30.0):
+            histogram.observe(seconds)
+        metrics.REGISTRY.count("hits", 2)
+        exported = json.loads(metrics.REGISTRY.to_json())
+        timer = exported["timers"]["Test.path"]
+        self.assertEqual(timer["count"], 4)
+        self.assertEqual(timer["buckets"]["2.5e-06"], 1)
+        self.assertEqual(timer["buckets"]["+Inf"], 4)
+        self.assertEqual(timer["p50"], 5e-06)
+        self.assertEqual(exported["events"], {"hits": 2})
+        text = metrics.REGISTRY.to_prometheus()
+        self.assertIn('battleship_duration_seconds_bucket{path="Test.path",le="+Inf"} 4', text)
+        self.assertIn('battleship_duration_seconds_count{path="Test.path"} 4', text)
+        self.assertIn('battleship_events_total{event="hits"} 2', text)
+        counts = [int(line.rsplit(" ", 1)[1]) for line in text.splitlines() if "_bucket" in line]
+        self.assertEqual(counts, sorted(counts))
+
+    def test_serve(self):
+        """Test that a scraper can fetch both exports over HTTP"""
+        metrics.REGISTRY.count("games")
+        server = metrics.serve(0)
+        try:
+            base = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(base + "/metrics") as response:
+                self.assertIn('battleship_events_total{event="games"} 1', response.read().decode())
+            with urllib.request.urlopen(base + "/metrics.json") as response:
+                self.assertEqual(json.loads(response.read())["events"], {"games": 1})
+        finally:
+            server.shutdown()
+            server.server_close()
+
 class TestWindowManager(unittest.TestCase):
     """Test cases for the WindowManager class"""
     
@@ -242,6 +1417,51 @@ class TestGameDisplay(unittest.TestCase):
         self.assertEqual(len(self.display.computer_buttons), BOARD_SIZE)
         self.assertEqual(len(self.display.computer_buttons[0]), BOARD_SIZE)
 
+class TestCanvasBoard(unittest.TestCase):
+    """Test cases for the canvas board renderer"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method"""
+        self.root = tk.Tk()
+        self.root.withdraw()  # Hide the window
+
+    def tearDown(self):
+        """Clean up after each test method"""
+        self.root.destroy()
+
+    def test_cells_are_drawn_on_demand(self):
+        """Test that only coloured cells get canvas items and that colours update in place"""
+        board = CanvasBoard(self.root, 64)
+        empty_items = len(board.canvas.find_all())
+        self.assertLess(empty_items, 64 * 4)
+        board.set_cell(3, 4, "hit")
+        item = board.items[3 * 64 + 4]
+        board.set_cell(3, 4, "miss")
+        self.assertEqual(board.items[3 * 64 + 4], item)
+        self.assertEqual(board.canvas.itemcget(item, "fill"), "blue")
+        board.set_cell(3, 4, "empty")
+        self.assertEqual(len(board.canvas.find_all()), empty_items)
+
+    def test_click_hit_test(self):
+        """Test that clicks are mapped to cells"""
+        board = CanvasBoard(self.root, 8)
+        clicks = []
+        board.command = lambda row, column: clicks.append((row, column))
+        self.assertEqual(board.cell_at(board.left + 2.5 * board.cell_size, board.top + 7.5 * board.cell_size), (7, 2))
+        self.assertIsNone(board.cell_at(1, 1))
+        board.on_click(type("Event", (), {"x": board.left + 1, "y": board.top + 1}))
+        self.assertEqual(clicks, [(0, 0)])
+
+    def test_game_display(self):
+        """Test the canvas display through the shared board interface"""
+        display = CanvasGameDisplay(self.root)
+        moves = []
+        display.bind_board("player", lambda row, column: moves.append((row, column)))
+        display.player_board.on_click(type("Event", (), {"x": display.player_board.left, "y": display.player_board.top}))
+        display.set_cell("computer", 1, 1, "hit")
+        self.assertEqual(moves, [(0, 0)])
+        self.assertEqual(len(display.computer_board.items), 1)
+
 class TestBattleshipGUI(unittest.TestCase):
     """Test cases for the BattleshipGUI class"""
     
@@ -279,6 +1499,37 @@ class TestBattleshipGUI(unittest.TestCase):
         self.assertTrue(self.gui.players[0].gui_mode)
         self.assertTrue(self.gui.players[1].gui_mode)
 
+    def test_only_changed_cells_are_redrawn(self):
+        """Test that placing a ship and playing a turn update only the affected cells"""
+        self.gui.try_place_ship(0, 0)
+        self.assertEqual(self.gui.turn_updates, SHIP_TYPES[self.gui.ships_to_place[0][0]])
+        self.gui.players[0].ship_manager = create_board("Computer")
+        GameSetup().deploy_random_fleet(self.gui.players[0])
+        self.gui.start_game()
+        self.assertEqual(self.gui.turn_updates, 0)
+        human, computer = self.gui.players
+        self.gui.make_move(1, 1)
+        self.gui.process_computer_turn(human, computer)
+        deadline = time.time() + 10
+        while self.gui.input_locked and time.time() < deadline:
+            self.root.update()  # Runs the polls that pick up the computer's move
+            time.sleep(0.005)
+        self.assertFalse(self.gui.input_locked)
+        self.assertEqual(self.gui.last_turn_updates, 2)
+        self.assertEqual(self.gui.turn_updates, 0)
+
+    def test_play_again_reuses_widgets(self):
+        """Test that a new game keeps the display and players and clears their state"""
+        display, players = self.gui.display, list(self.gui.players)
+        self.gui.try_place_ship(0, 0)
+        self.gui.reset_game()
+        self.assertIs(self.gui.display, display)
+        self.assertEqual(self.gui.players, players)
+        self.assertEqual(self.gui.current_ship_index, 0)
+        self.assertFalse(self.gui.players[0].ship_manager.has_ship(0, 0))
+        self.assertEqual(self.gui.display.marked["placement"], set())
+        self.assertEqual(str(self.gui.display.start_button.cget("state")), "disabled")
+
 def run_tests():
     """Run all test cases"""
     unittest.main()
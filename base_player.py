@@ -1,24 +1,34 @@
-from battleship_config import BOARD_SIZE
 from board_display import BoardDisplay
-from ship_manager import ShipManager
+from ship_manager import create_board
 from board_validator import BoardValidator
+from battleship_config import DEFAULT_CONFIG
+from game_events import GameOver, Hit, Miss, ShotFired, Sunk
 
 class BasePlayer:
     """Base class for player functionality"""
-    def __init__(self, name):
+    def __init__(self, name, config=None):
         """
         Initializes the BasePlayer with player components and attributes.
         
         Args:
             name (str): The name of the player.
+            config (GameConfig, optional): The game variant; defaults to config.json.
         """
         self.name = name
+        self.config = config if config is not None else DEFAULT_CONFIG  # Board size and fleet of this game
         self.opponent_name = "Computer" if name == "Player" else "Player"
-        self.ship_manager = ShipManager(self.opponent_name)  # Manages player's ships
-        self.attack_board = ShipManager(self.opponent_name)  # Tracks attacks made
+        self.ship_manager = create_board(self.opponent_name, self.config)  # Manages player's ships
+        self.attack_board = create_board(self.opponent_name, self.config)  # Tracks attacks made
         self.display = BoardDisplay()  # Handles board display
-        self.validator = BoardValidator()  # Validates moves
+        self.validator = BoardValidator(self.config)  # Validates moves
         self.hit_directions = [(0,1), (0,-1), (1,0), (-1,0)]  # Possible attack directions
+        self.events = None  # EventBus this player's moves are published to, if anyone listens
+        self.seat = 0 if name == "Player" else 1  # Shooter number stored in replay records
+
+    def reset(self):
+        """Empties both boards so the player can start a new game."""
+        self.ship_manager.clear()
+        self.attack_board.clear()
 
     def can_place_ship(self, opponent, row, col, length, orientation):
         """
@@ -34,16 +44,48 @@ class BasePlayer:
         Returns:
             bool: True if the ship can be placed, False otherwise.
         """
-        if orientation == "H":
-            if col + length > BOARD_SIZE:
-                return False
-            for i in range(length):
-                if self.attack_board.grid[row][col + i] in ["-", "X"]:
-                    return False
-        else:
-            if row + length > BOARD_SIZE:
-                return False
-            for i in range(length):
-                if self.attack_board.grid[row + i][col] in ["-", "X"]:
-                    return False
-        return True 
\ No newline at end of file
+        return not self.attack_board.placement_attacked(row, col, orientation, length)
+
+    def fire(self, opponent, row, column):
+        """
+        Fires one shot at the opponent, recording it on the attack board and
+        on the opponent's ships.
+
+        Args:
+            opponent (BasePlayer): The opponent player.
+            row (int): The row of the shot.
+            column (int): The column of the shot.
+
+        Returns:
+            tuple: (hit, name of the ship sunk by the shot or None).
+        """
+        hit = opponent.ship_manager.has_ship(row, column)
+        self.attack_board.record_shot(row, column, hit)
+        sunk_ship = opponent.ship_manager.check_sunk_ship(row, column) if hit else None
+        self.report_shot(opponent, row, column, hit, sunk_ship)
+        return hit, sunk_ship
+
+    def report_shot(self, opponent, row, column, hit, sunk_ship=None):
+        """
+        Publishes a resolved shot: ShotFired, then Hit or Miss, then Sunk and
+        GameOver when they apply. Does nothing when no bus is connected.
+
+        Args:
+            opponent (BasePlayer): The player who was fired at.
+            row (int): The row of the shot.
+            column (int): The column of the shot.
+            hit (bool): Whether the shot hit a ship.
+            sunk_ship (str, optional): The name of the ship the shot sank.
+        """
+        events = self.events
+        if events is None:
+            return
+        events.emit(ShotFired, self, row, column)
+        if not hit:
+            events.emit(Miss, self, row, column)
+            return
+        events.emit(Hit, self, row, column, sunk_ship)
+        if sunk_ship:
+            events.emit(Sunk, self, sunk_ship, row, column)
+            if opponent.ship_manager.all_ships_sunk():
+                events.emit(GameOver, self, opponent)
@@ -1,5 +1,149 @@
 import json
 import os
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from coordinates import CoordinateCodec
+from probability_engine import ProbabilityEngine
+
+class ConfigError(ValueError):
+    """Raised when a game configuration is malformed or describes an unplayable game"""
+
+class GameConfig:
+    """Immutable, validated settings of one game variant: board size, fleet and instructions.
+
+    A config is checked once when it is created, and the tables derived from it
+    (fleet lengths and their counts, ship ids, column labels) are built at the
+    same time, so every game, player and board handed the same config shares
+    them. Configs compare and hash by board size and fleet; `intern` returns one
+    shared instance per recently used variant."""
+    MAX_SIZE = 32767  # Snapshots store rows and columns as signed 16-bit numbers
+    MAX_SHIPS = 32  # Snapshots and the server keep one bit per ship type in 32 bits
+    MAX_INTERNED = 64  # Distinct variants kept by `intern`, least recently used dropped first
+    _interned = OrderedDict()
+    _intern_lock = threading.Lock()
+
+    def __init__(self, board_size, ships, instructions=None):
+        """
+        Validates the settings and builds the derived tables.
+
+        Args:
+            board_size (int): Rows and columns of the board.
+            ships (dict): Ship name -> length, in placement order.
+            instructions (dict, optional): The rules shown by the CLI, as in config.json.
+
+        Raises:
+            ConfigError: If the board size, a ship or the fleet as a whole is invalid.
+        """
+        if type(board_size) is not int or not 1 <= board_size <= self.MAX_SIZE:
+            raise ConfigError(f"Board size must be a whole number from 1 to {self.MAX_SIZE}, not {board_size!r}.")
+        if not isinstance(ships, dict) or not 1 <= len(ships) <= self.MAX_SHIPS:
+            raise ConfigError(f"The fleet must map 1 to {self.MAX_SHIPS} ship names to lengths.")
+        for name, length in ships.items():
+            if not isinstance(name, str) or not name:
+                raise ConfigError(f"Invalid ship name {name!r}.")
+            if type(length) is not int or not 1 <= length <= board_size:
+                raise ConfigError(f"The {name} must have a length from 1 to {board_size}, not {length!r}.")
+        fleet_lengths = tuple(ships.values())
+        if sum(fleet_lengths) > board_size * board_size:
+            raise ConfigError("The fleet covers more cells than the board has.")
+
+        set_field = super().__setattr__
+        set_field("board_size", board_size)
+        set_field("ship_types", MappingProxyType(dict(ships)))
+        set_field("instructions", MappingProxyType(dict(instructions or {})))
+        # Derived tables, built once and shared by everything using this config
+        set_field("ship_names", tuple(ships))
+        set_field("fleet_lengths", fleet_lengths)
+        set_field("fleet_cells", sum(fleet_lengths))
+        set_field("fleet_weights", ProbabilityEngine.fleet_weights(fleet_lengths))
+        set_field("ship_ids", MappingProxyType({name: i for i, name in enumerate(ships)}))
+        set_field("column_labels", tuple(CoordinateCodec.column_label(column) for column in range(board_size)))
+        set_field("letters_to_nums", MappingProxyType({label: i for i, label in enumerate(self.column_labels)}))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("GameConfig is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("GameConfig is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, GameConfig):
+            return NotImplemented
+        return (self.board_size, tuple(self.ship_types.items())) == (other.board_size, tuple(other.ship_types.items()))
+
+    def __hash__(self):
+        return hash((self.board_size, tuple(self.ship_types.items())))
+
+    def __reduce__(self):
+        # The mapping proxies cannot be pickled: rebuild from plain dicts, e.g. in worker processes
+        return GameConfig, (self.board_size, dict(self.ship_types), dict(self.instructions))
+
+    def __repr__(self):
+        return f"GameConfig(board_size={self.board_size}, ships={dict(self.ship_types)})"
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a config from parsed JSON in the layout of config.json.
+
+        Args:
+            data (dict): At least "board_size" and "ships"; "instructions" is optional.
+
+        Returns:
+            GameConfig: The validated config.
+
+        Raises:
+            ConfigError: If a field is missing or invalid.
+        """
+        if not isinstance(data, dict) or "board_size" not in data or "ships" not in data:
+            raise ConfigError("A game configuration needs a board_size and ships.")
+        return cls(data["board_size"], data["ships"], data.get("instructions"))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a config from a JSON file.
+
+        Args:
+            path (str): The file, laid out like config.json.
+
+        Returns:
+            GameConfig: The validated config.
+
+        Raises:
+            ConfigError: If the file does not hold a valid configuration.
+        """
+        with open(path, 'r') as f:
+            try:
+                data = json.load(f)
+            except ValueError as e:
+                raise ConfigError(f"{path} is not valid JSON: {e}")
+        return cls.from_dict(data)
+
+    @classmethod
+    def intern(cls, config):
+        """
+        Returns the shared instance of a variant, so games created from separately
+        parsed but equal configs still share one set of derived tables. Variants
+        may come from clients, so only the MAX_INTERNED most recently used are
+        kept: one-off variants age out instead of filling the table for good.
+
+        Args:
+            config (GameConfig): The config.
+
+        Returns:
+            GameConfig: The kept equal config, or `config` itself, which is kept from now on.
+        """
+        with cls._intern_lock:
+            shared = cls._interned.get(config)
+            if shared is not None:
+                cls._interned.move_to_end(config)
+                return shared
+            cls._interned[config] = config
+            if len(cls._interned) > cls.MAX_INTERNED:
+                cls._interned.popitem(last=False)
+            return config
 
 # Load configuration from JSON file
 def load_config():
@@ -12,8 +156,9 @@ def load_config():
 
 # Initialize configuration
 config = load_config()
+DEFAULT_CONFIG = GameConfig.intern(GameConfig.from_dict(config))  # Used wherever no config is passed
 
 # Export configuration values
 SHIP_TYPES = config['ships']
 LETTERS_TO_NUMS = config['grid_letters']
-BOARD_SIZE = config['board_size'] 
\ No newline at end of file
+BOARD_SIZE = config['board_size'] 
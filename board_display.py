@@ -1,3 +1,6 @@
+from coordinates import CoordinateCodec
+from metrics import timed
+
 class BoardDisplay:
     """Handles the visual representation of the game board with colored output"""
     def __init__(self):
@@ -7,7 +10,27 @@ class BoardDisplay:
             '-': '\033[94m',  # Blue for misses
             'RESET': '\033[0m'  # Reset color formatting
         }
+        self._headers = {}  # Board width -> column header lines
+
+    def header(self, size):
+        """
+        Builds the column header lines for a board width, once per width.
+
+        Args:
+            size (int): The width of the board.
+
+        Returns:
+            tuple: The label line, the border line and the width of one cell.
+        """
+        if size not in self._headers:
+            cell_width = len(CoordinateCodec.column_label(size - 1))
+            margin = " " * (len(str(size)) + 1)
+            labels = " ".join(CoordinateCodec.column_label(j).ljust(cell_width) for j in range(size))
+            border = "+" + ("-" * cell_width + "+") * (size - 1)
+            self._headers[size] = (margin + labels.rstrip(), margin + border, cell_width)
+        return self._headers[size]
 
+    @timed
     def display_board(self, grid):
         """
         Displays the game board with colored output.
@@ -15,15 +38,20 @@ class BoardDisplay:
         Args:
             grid (list): The game board grid to display.
         """
-        print("  A B C D E F G H")
-        print("  +-+-+-+-+-+-+-+")
+        size = len(grid[0]) if len(grid) else 0
+        labels, border, cell_width = self.header(size)
+        number_width = len(str(size))
+        padding = " " * (cell_width - 1)
+        lines = [labels, border]
         row_num = 1
         for row in grid:
             formatted_row = []
             for cell in row:
                 if cell in self.COLORS:
-                    formatted_row.append(f"{self.COLORS[cell]}{cell}{self.COLORS['RESET']}")
+                    formatted_row.append(f"{self.COLORS[cell]}{cell}{self.COLORS['RESET']}{padding}")
                 else:
-                    formatted_row.append(cell)
-            print("%d|%s|" % (row_num, "|".join(formatted_row)))
-            row_num += 1 
\ No newline at end of file
+                    formatted_row.append(cell + padding)
+            lines.append("%*d|%s|" % (number_width, row_num, "|".join(formatted_row)))
+            row_num += 1
+        # One write for the whole board keeps large boards quick to print
+        print("\n".join(lines))
@@ -1,10 +1,211 @@
-from battleship_config import BOARD_SIZE
+from battleship_config import DEFAULT_CONFIG
+from probability_engine import ProbabilityEngine
+from lazy_imports import lazy_import
+from metrics import timed
+
+np = lazy_import("numpy")  # Loaded on first use, keeping start-up fast
+
+class PlacementIndex:
+    """Every placement of one ship length on one board size, in a fixed order:
+    horizontal placements row by row, then vertical placements column by column"""
+    def __init__(self, size, length):
+        """
+        Builds the index.
+
+        Args:
+            size (int): The width of the board.
+            length (int): The length of the ship.
+        """
+        self.size = size
+        self.length = length
+        self.span = max(size - length + 1, 0)  # Start positions along one line
+        self.horizontal_count = size * self.span
+        self._rows = None
+        self._masks = None
+        self._cell_table = None
+
+    def __len__(self):
+        return 2 * self.horizontal_count
+
+    def _build_arrays(self):
+        """Builds the start row and column of every placement, on first use."""
+        lines = np.repeat(np.arange(self.size), self.span)
+        starts = np.tile(np.arange(self.span), self.size)
+        self._rows = np.concatenate([lines, starts])
+        self._columns = np.concatenate([starts, lines])
+
+    @property
+    def rows(self):
+        """numpy.ndarray: The starting row of every placement."""
+        if self._rows is None:
+            self._build_arrays()
+        return self._rows
+
+    @property
+    def columns(self):
+        """numpy.ndarray: The starting column of every placement."""
+        if self._rows is None:
+            self._build_arrays()
+        return self._columns
+
+    @property
+    def cell_table(self):
+        """numpy.ndarray: Cell numbers (row * size + column) covered by every placement,
+        shape (placements, length), built on first use."""
+        if self._cell_table is None:
+            starts = self.rows * self.size + self.columns
+            steps = np.where(np.arange(len(self)) < self.horizontal_count, 1, self.size)
+            self._cell_table = starts[:, None] + steps[:, None] * np.arange(self.length)
+        return self._cell_table
+
+    def placement(self, index):
+        """
+        Looks up one placement.
+
+        Args:
+            index (int): Position of the placement in the index.
+
+        Returns:
+            tuple: (row, column, orientation) of the placement.
+        """
+        index = int(index)
+        if index < self.horizontal_count:
+            row, column = divmod(index, self.span)
+            return row, column, "H"
+        column, row = divmod(index - self.horizontal_count, self.span)
+        return row, column, "V"
+
+    def cells(self, index):
+        """
+        Lists the cells covered by one placement.
+
+        Args:
+            index (int): Position of the placement in the index.
+
+        Returns:
+            range: The cell numbers (row * size + column) of the placement.
+        """
+        row, column, orientation = self.placement(index)
+        start = row * self.size + column
+        step = 1 if orientation == "H" else self.size
+        return range(start, start + step * self.length, step)
+
+    def position(self, row, column, orientation):
+        """
+        Finds where a placement sits in the index.
+
+        Args:
+            row (int): The starting row for the ship.
+            column (int): The starting column for the ship.
+            orientation (str): The orientation of the ship ('H' for horizontal, 'V' for vertical).
+
+        Returns:
+            int: The position of the placement.
+        """
+        if orientation == "H":
+            return row * self.span + column
+        return self.horizontal_count + column * self.span + row
+
+    def mask(self, index):
+        """
+        Bitboard of one placement. Small boards use the cached list of every
+        mask; on large boards that list would hold millions of huge integers,
+        so the mask is built on demand.
+
+        Args:
+            index (int): Position of the placement in the index.
+
+        Returns:
+            int: The bitboard of the placement.
+        """
+        if self.size <= ProbabilityEngine.TABLE_MAX_SIZE:
+            return self.masks[index]
+        row, column, orientation = self.placement(index)
+        shift = row * self.size + column
+        if orientation == "H":
+            return ((1 << self.length) - 1) << shift
+        return sum(1 << (i * self.size) for i in range(self.length)) << shift
+
+    @property
+    def masks(self):
+        """list: Bitboard of every placement, built on first use."""
+        if self._masks is None:
+            horizontal = (1 << self.length) - 1
+            vertical = sum(1 << (i * self.size) for i in range(self.length))
+            shifts = (self.rows * self.size + self.columns).tolist()
+            count = self.horizontal_count
+            self._masks = [horizontal << shift for shift in shifts[:count]]
+            self._masks += [vertical << shift for shift in shifts[count:]]
+        return self._masks
 
 class BoardValidator:
     """Validates ship placements and board positions"""
-    def __init__(self):
-        """Initializes the BoardValidator with the board size"""
-        self.size = BOARD_SIZE
+    _indexes = {}  # (board size, ship length) -> PlacementIndex, shared by all validators
+
+    def __init__(self, config=None):
+        """
+        Initializes the BoardValidator with the board size.
+
+        Args:
+            config (GameConfig, optional): The game variant; defaults to config.json.
+        """
+        self.size = (config if config is not None else DEFAULT_CONFIG).board_size
+
+    def placement_index(self, length):
+        """
+        Returns the memoized index of every placement of a ship on this board.
+
+        Args:
+            length (int): The length of the ship.
+
+        Returns:
+            PlacementIndex: The placements, shared by every validator of this board size.
+        """
+        key = (self.size, length)
+        index = BoardValidator._indexes.get(key)
+        if index is None:
+            index = BoardValidator._indexes[key] = PlacementIndex(self.size, length)
+        return index
+
+    def legal_placements(self, occupied, length):
+        """
+        Finds every placement of a ship that stays clear of the occupied cells.
+
+        Args:
+            occupied (int): Bitboard of cells the ship may not touch.
+            length (int): The length of the ship.
+
+        Returns:
+            numpy.ndarray: Positions in `placement_index(length)` of the legal placements.
+        """
+        if self.size <= ProbabilityEngine.TABLE_MAX_SIZE:
+            # Small boards: one AND per placement beats building arrays
+            masks = self.placement_index(length).masks
+            return np.array([i for i, mask in enumerate(masks) if not mask & occupied], dtype=np.intp)
+        free = ~ProbabilityEngine.mask_to_array(occupied, self.size)
+        horizontal = ProbabilityEngine.legal_starts(free, length)
+        vertical = ProbabilityEngine.legal_starts(free.T, length)
+        return np.flatnonzero(np.concatenate([horizontal.ravel(), vertical.ravel()]))
+
+    def covering_placements(self, cells, length):
+        """
+        Finds every placement of a ship that covers at least one of the given cells.
+
+        Args:
+            cells (int): Bitboard of the cells.
+            length (int): The length of the ship.
+
+        Returns:
+            numpy.ndarray: Positions in `placement_index(length)` of the covering placements.
+        """
+        if self.size <= ProbabilityEngine.TABLE_MAX_SIZE:
+            masks = self.placement_index(length).masks
+            return np.array([i for i, mask in enumerate(masks) if mask & cells], dtype=np.intp)
+        # A placement covers a cell unless it would fit among the other cells alone
+        clear = ~ProbabilityEngine.mask_to_array(cells, self.size)
+        horizontal = ProbabilityEngine.legal_starts(clear, length)
+        vertical = ProbabilityEngine.legal_starts(clear.T, length)
+        return np.flatnonzero(~np.concatenate([horizontal.ravel(), vertical.ravel()]))
 
     def validate_placement(self, length, row, column, orientation):
         """
@@ -24,12 +225,13 @@ class BoardValidator:
         else:
             return row + length <= self.size
 
+    @timed
     def check_overlap(self, grid, row, column, orientation, length):
         """
         Checks if a ship placement overlaps with existing ships.
         
         Args:
-            grid (list): The game board grid.
+            grid (BoardGrid or list): The game board grid.
             row (int): The starting row for the ship.
             column (int): The starting column for the ship.
             orientation (str): The orientation of the ship ('H' for horizontal, 'V' for vertical).
@@ -38,6 +240,10 @@ class BoardValidator:
         Returns:
             bool: True if there is an overlap, False otherwise.
         """
+        board = getattr(grid, "board", None)
+        if board is not None:
+            # Bitboard-backed grid: a single mask test
+            return board.overlaps(row, column, orientation, length)
         try:
             if orientation == "H":
                 return any(grid[row][i] == "X" for i in range(column, column + length))
@@ -0,0 +1,193 @@
+import argparse
+import time
+import tkinter as tk
+from tkinter import ttk
+from battleship_config import DEFAULT_CONFIG
+from coordinates import CoordinateCodec
+from gui_display import GameDisplay
+
+class CanvasBoard:
+    """One board drawn on a single tk.Canvas instead of a grid of buttons.
+
+    The empty board is a background rectangle, grid lines and header labels;
+    a cell gets its own rectangle item only once it is coloured, so creating
+    the board costs O(size) canvas items rather than O(size^2) widgets. Clicks
+    are mapped to cells arithmetically by one handler."""
+    COLORS = {"ship": "green", "hit": "red", "miss": "blue"}
+    BACKGROUND = "#e8e8e8"
+    GRID_COLOR = "#a0a0a0"
+    MAX_CELL = 28  # Pixel size of a cell on small boards
+    MIN_CELL = 6
+    MAX_EXTENT = 640  # Largest board width in pixels before cells shrink
+
+    def __init__(self, parent, size=None, cell_size=None):
+        """
+        Initializes and draws an empty board.
+
+        Args:
+            parent (tk.Widget): The widget holding the canvas.
+            size (int, optional): Rows and columns of the board; defaults to config.json.
+            cell_size (int, optional): Pixel size of a cell; by default as large as fits.
+        """
+        size = size if size is not None else DEFAULT_CONFIG.board_size
+        self.size = size
+        self.cell_size = cell_size or max(self.MIN_CELL, min(self.MAX_CELL, self.MAX_EXTENT // size))
+        self.font = ("Arial", max(6, min(10, self.cell_size // 2)))
+        self.left = max(self.cell_size, 24)  # Room for the row numbers
+        self.top = max(self.cell_size, 16)  # Room for the column letters
+        extent = size * self.cell_size
+        self.canvas = tk.Canvas(parent, width=self.left + extent + 1, height=self.top + extent + 1,
+                                background=self.BACKGROUND, highlightthickness=0)
+        self.command = None  # Called as command(row, column) on a click
+        self.items = {}  # Cell index (row * size + column) -> rectangle item id
+        self.draw_grid()
+        self.canvas.bind("<Button-1>", self.on_click)
+
+    def draw_grid(self):
+        """Draws the grid lines and the row and column labels."""
+        size, cell, left, top = self.size, self.cell_size, self.left, self.top
+        right, bottom = left + size * cell, top + size * cell
+        for i in range(size + 1):
+            self.canvas.create_line(left + i * cell, top, left + i * cell, bottom, fill=self.GRID_COLOR)
+            self.canvas.create_line(left, top + i * cell, right, top + i * cell, fill=self.GRID_COLOR)
+        # Label every cell when the labels fit, otherwise every fifth one
+        step = 1 if cell >= 16 else 5
+        for i in range(0, size, step):
+            center = i * cell + cell // 2
+            self.canvas.create_text(left + center, top // 2, text=CoordinateCodec.column_label(i), font=self.font)
+            self.canvas.create_text(left // 2, top + center, text=str(i + 1), font=self.font)
+
+    def set_cell(self, row, column, state):
+        """
+        Colours one cell, creating its rectangle the first time.
+
+        Args:
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+            state (str): 'empty', 'ship', 'hit' or 'miss'.
+        """
+        index = row * self.size + column
+        item = self.items.get(index)
+        if state == "empty":
+            if item is not None:
+                self.canvas.delete(item)
+                del self.items[index]
+            return
+        if item is None:
+            x = self.left + column * self.cell_size
+            y = self.top + row * self.cell_size
+            self.items[index] = self.canvas.create_rectangle(x + 1, y + 1, x + self.cell_size, y + self.cell_size,
+                                                             fill=self.COLORS[state], outline="")
+        else:
+            self.canvas.itemconfigure(item, fill=self.COLORS[state])
+
+    def clear(self):
+        """Deletes every cell rectangle, leaving the empty board."""
+        if self.items:
+            self.canvas.delete(*self.items.values())
+            self.items.clear()
+
+    def cell_at(self, x, y):
+        """
+        Finds the cell under a point of the canvas.
+
+        Args:
+            x (float): Canvas x coordinate.
+            y (float): Canvas y coordinate.
+
+        Returns:
+            tuple: (row, column), or None outside the board.
+        """
+        column = int((x - self.left) // self.cell_size)
+        row = int((y - self.top) // self.cell_size)
+        if 0 <= row < self.size and 0 <= column < self.size:
+            return row, column
+        return None
+
+    def on_click(self, event):
+        """
+        Passes a click on a cell to the board's command.
+
+        Args:
+            event (tk.Event): The mouse event.
+        """
+        cell = self.cell_at(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if cell is not None and self.command is not None:
+            self.command(*cell)
+
+class CanvasGameDisplay(GameDisplay):
+    """GameDisplay that draws each board on one canvas, for boards too large for button grids"""
+    def create_placement_board(self):
+        """Creates the ship placement board"""
+        placement_frame = ttk.LabelFrame(self.setup_frame, text="Place Your Ships")
+        placement_frame.grid(row=0, column=0, padx=5, pady=5)
+        self.placement_board = CanvasBoard(placement_frame, self.size)
+        self.placement_board.canvas.grid(row=0, column=0, padx=2, pady=2)
+        self.boards["placement"] = self.placement_board
+
+    def create_game_boards(self):
+        """Creates the game boards for both the player and the computer."""
+        player_frame = ttk.LabelFrame(self.game_frame, text="Your Guesses")
+        player_frame.grid(row=0, column=0, padx=5)
+        self.player_board = CanvasBoard(player_frame, self.size)
+        self.player_board.canvas.grid(row=0, column=0, padx=2, pady=2)
+
+        computer_frame = ttk.LabelFrame(self.game_frame, text="Computer's Guesses")
+        computer_frame.grid(row=0, column=1, padx=5)
+        self.computer_board = CanvasBoard(computer_frame, self.size)
+        self.computer_board.canvas.grid(row=0, column=0, padx=2, pady=2)
+
+        self.boards["player"] = self.player_board
+        self.boards["computer"] = self.computer_board
+        self.create_message_area()
+
+    def bind_board(self, board, command):
+        """
+        Calls a function with the row and column of every click on a board.
+
+        Args:
+            board (str): 'placement', 'player' or 'computer'.
+            command (callable): Called as command(row, column).
+        """
+        self.boards[board].command = command
+
+    def set_cell(self, board, row, column, state):
+        """
+        Shows the state of one cell.
+
+        Args:
+            board (str): 'placement', 'player' or 'computer'.
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+            state (str): 'empty', 'ship', 'hit' or 'miss'.
+        """
+        self.boards[board].set_cell(row, column, state)
+
+    def clear_boards(self):
+        """Shows every cell of every board as empty again."""
+        for board in self.boards.values():
+            board.clear()
+
+def main():
+    parser = argparse.ArgumentParser(description="Time creating the canvas and button board displays.")
+    parser.add_argument("--size", type=int, default=64, help="rows and columns of each board")
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    root.withdraw()
+    start = time.perf_counter()
+    for _ in range(3):
+        CanvasBoard(root, args.size).canvas.grid()
+    root.update_idletasks()
+    print(f"3 canvas boards of {args.size}x{args.size}: {(time.perf_counter() - start) * 1000:.1f} ms")
+    frame = ttk.Frame(root)
+    start = time.perf_counter()
+    for i in range(args.size):
+        for j in range(args.size):
+            ttk.Button(frame, width=3).grid(row=i, column=j)
+    root.update_idletasks()
+    print(f"1 button board of {args.size}x{args.size}: {(time.perf_counter() - start) * 1000:.1f} ms")
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,125 @@
 from game_setup import GameSetup
 from game_loop import GameLoop
-from battleship_config import config
+from battleship_config import DEFAULT_CONFIG
+from game_events import EventBus, GameOver, Hit, Miss, Sunk
 import sys
 
+class ConsoleRenderer:
+    """Prints a game's events to the console, as the CLI shows them"""
+    BANNER = "*******************************************"
+
+    def subscribe(self, events):
+        """
+        Starts printing the events of a game.
+
+        Args:
+            events (EventBus): The game's bus.
+        """
+        events.subscribe(Hit, self.on_hit)
+        events.subscribe(Miss, self.on_miss)
+        events.subscribe(Sunk, self.on_sunk)
+        events.subscribe(GameOver, self.on_game_over)
+
+    def on_hit(self, event):
+        """
+        Prints a hit and the shooter's guess board.
+
+        Args:
+            event (Hit): The event.
+        """
+        shooter = event.shooter
+        print("\nHit!\n" if shooter.name == "Player" else f"\n{shooter.name} hit!\n")
+        self.show_guess_board(shooter)
+
+    def on_miss(self, event):
+        """
+        Prints a miss and the shooter's guess board.
+
+        Args:
+            event (Miss): The event.
+        """
+        shooter = event.shooter
+        print("\nMiss!\n" if shooter.name == "Player" else f"\n{shooter.name} miss!\n")
+        self.show_guess_board(shooter)
+
+    def on_sunk(self, event):
+        """
+        Prints the banner of a sunk ship.
+
+        Args:
+            event (Sunk): The event.
+        """
+        print("\n" + self.BANNER)
+        print(f"\033[1m        {event.shooter.name} has sunk the {event.ship}!\033[0m")
+        print(self.BANNER + "\n")
+
+    def on_game_over(self, event):
+        """
+        Prints the banner of the winner.
+
+        Args:
+            event (GameOver): The event.
+        """
+        print("\n" + self.BANNER)
+        print(f"\033[1m       {event.winner.name} has won the game!\033[0m")
+        print(self.BANNER + "\n")
+
+    @staticmethod
+    def show_guess_board(player):
+        """
+        Prints a player's attack board under its title.
+
+        Args:
+            player (BasePlayer): The player.
+        """
+        print(f'\033[1m       {player.name}`s Guess Board\033[0m')
+        player.display.display_board(player.attack_board.grid)
+
 class CLIGamePlay:
     """Main game coordinator for CLI version"""
-    def __init__(self):
-        """Initializes the GamePlay with game setup and players."""
+    def __init__(self, recorder=None, config=None):
+        """
+        Initializes the GamePlay with game setup and players.
+
+        Args:
+            recorder (ReplayRecorder, optional): Replay log receiving every shot of every game.
+            config (GameConfig, optional): The game variant to play; defaults to config.json.
+        """
+        self.recorder = recorder
+        self.config = config if config is not None else DEFAULT_CONFIG
+        self.renderer = ConsoleRenderer()
         self.setup_new_game()
 
     def setup_new_game(self):
         """Sets up a new game instance"""
-        self.setup = GameSetup()
+        self.setup = GameSetup(self.config)
         self.players = self.setup.players
         self.game_loop = GameLoop(self.players)
+        self.renderer.subscribe(EventBus.of(self.players))
+        if self.recorder is not None:
+            self.recorder.attach(self.players)
 
     def display_welcome_message(self):
         """Displays game introduction and instructions"""
+        instructions = self.config.instructions or DEFAULT_CONFIG.instructions
         print('----------------------------------------- Welcome to the game \033[1m"BATTLESHIP"\033[0m -----------------------------------------')
         print('\n\033[1m                                        OBJECTIVE\033[0m')
-        print(config['instructions']['objective'])
+        print(instructions['objective'])
         
         print('\n\033[1m                                         SETUP\033[0m')
-        for setup_instruction in config['instructions']['setup']:
+        for setup_instruction in instructions['setup']:
             print(setup_instruction)
         
         print("\n2. The fleet includes:\n")
-        for ship, length in config['ships'].items():
+        for ship, length in self.config.ship_types.items():
             print(f" • 1 {ship} ({length} squares)")
         
         print('\n\033[1m                                        GAMEPLAY\033[0m')
-        for gameplay_instruction in config['instructions']['gameplay']:
+        for gameplay_instruction in instructions['gameplay']:
             print(gameplay_instruction)
         
         print('\n\033[1m                                        WINNING\033[0m')
-        print(config['instructions']['winning'])
+        print(instructions['winning'])
         print('\n')
         print('---------------------------------------------------------------------------------------------------------------')
 
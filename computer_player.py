@@ -1,30 +1,90 @@
-import numpy as np
 import random
 from base_player import BasePlayer
-from battleship_config import BOARD_SIZE, SHIP_TYPES
+from probability_engine import ProbabilityEngine, ProbabilityTracker
+from monte_carlo import MonteCarloTargeter
+from ship_manager import SparseShipManager
+from lazy_imports import lazy_import
+from metrics import timed
+
+np = lazy_import("numpy")  # Loaded on first use, keeping start-up fast
 
 class ComputerPlayer(BasePlayer):
     """AI player with intelligent targeting system"""
-    def __init__(self):
-        super().__init__("Computer")
+    def __init__(self, rng=None, incremental=None, time_budget=None, config=None):
+        """
+        Initializes the ComputerPlayer.
+
+        Args:
+            rng (random.Random, optional): Source of randomness, for reproducible games.
+            incremental (bool, optional): If True, update the probability map shot by shot
+                instead of rebuilding it each turn, and drop sunk ships from it. Defaults to
+                True only on boards too large to rebuild the map every turn.
+            time_budget (float, optional): If set, choose each move by sampling fleet
+                layouts for this many seconds, e.g. 0.005 or 0.05.
+            config (GameConfig, optional): The game variant; defaults to config.json.
+        """
+        super().__init__("Computer", config)
+        self.rng = rng if rng is not None else random  # Random source for tie-breaking moves
         # Initialize AI targeting attributes
         self.last_hit = None  # Stores last successful hit
         self.hit_stack = []  # Queue of potential target positions
         self.direction = None  # Current targeting direction (H or V)
-        self.probability_map = np.zeros((BOARD_SIZE, BOARD_SIZE))  # Heat map for targeting
+        # Huge sparse boards have no room for a dense heat map: they hunt at random instead
+        sparse = isinstance(self.attack_board, SparseShipManager)
+        self.sparse = sparse
+        self._probability_map = None  # Heat map for targeting, allocated on first use
+        if incremental is None:
+            incremental = self.config.board_size > ProbabilityEngine.TABLE_MAX_SIZE
+        self.tracker = None
+        if incremental and not sparse:
+            self.tracker = ProbabilityTracker(self.config.board_size, self.config.fleet_lengths)
+        self.time_budget = time_budget  # Seconds per move for Monte-Carlo targeting
+        self.targeter = MonteCarloTargeter(self.validator, self.rng) if time_budget is not None and not sparse else None
+        self.sunk_ships = []  # Opponent ships sunk so far
         self.last_move_sunk = None  # Stores the name of the ship sunk in the last move (for GUI)
         self.last_move_hit = False  # Tracks if the last move was a hit (for GUI)
-        self.gui_mode = False  # Flag to determine whether to print to console
+        self.last_move = None  # (row, column) of the last move
+        self.gui_mode = False  # Set when a GUI drives the player; saved in snapshots
 
     def set_gui_mode(self, is_gui=True):
         """
-        Sets the GUI mode flag to determine whether to print to console.
+        Sets the GUI mode flag. Console output does not depend on it: it comes
+        from a ConsoleRenderer subscribed to the game's events.
         
         Args:
-            is_gui (bool): If True, computer will not print to console.
+            is_gui (bool): If True, the computer is driven by a GUI.
         """
         self.gui_mode = is_gui
 
+    def reset(self):
+        """Empties both boards and forgets all targeting state so the computer can start a new game."""
+        super().reset()
+        self.last_hit = None
+        self.hit_stack = []
+        self.direction = None
+        self._probability_map = None
+        if self.tracker is not None:
+            self.tracker = ProbabilityTracker(self.config.board_size, self.config.fleet_lengths)
+        if self.targeter is not None:
+            self.targeter.resolved_mask = 0
+        self.sunk_ships = []
+        self.last_move_sunk = None
+        self.last_move_hit = False
+        self.last_move = None
+
+    @property
+    def probability_map(self):
+        """numpy.ndarray: Heat map for targeting, or None on sparse boards. It is
+        allocated on first use, so creating a player does not load NumPy."""
+        if self._probability_map is None and not self.sparse:
+            self._probability_map = np.zeros((self.config.board_size, self.config.board_size))
+        return self._probability_map
+
+    @probability_map.setter
+    def probability_map(self, probability_map):
+        self._probability_map = probability_map
+
+    @timed
     def take_turn(self, opponent):
         """
         Handles the computer player's turn.
@@ -32,18 +92,25 @@ class ComputerPlayer(BasePlayer):
         Args:
             opponent (BasePlayer): The opponent player.
         """
-        if not hasattr(self, 'probability_map'):
-            self.probability_map = np.zeros((BOARD_SIZE, BOARD_SIZE))
-
         # Reset tracking variables for this turn
         self.last_move_sunk = None
         self.last_move_hit = False
 
         row = None
         column = None
+        size = self.config.board_size
 
+        target = None
+        if self.targeter is not None:
+            remaining = [length for ship, length in self.config.ship_types.items() if ship not in self.sunk_ships]
+            sunk_cells = sum(self.config.ship_types[ship] for ship in self.sunk_ships)
+            target = self.targeter.choose(self.attack_board, remaining, sunk_cells, self.time_budget)
+
+        # Sampled layouts take precedence when a time budget is set
+        if target is not None:
+            row, column = target
         # First Priority - Check hit stack for potential targets
-        if self.hit_stack:
+        elif self.hit_stack:
             row, column = self.hit_stack.pop(0)
         # Second Priority - Use last hit information
         elif self.last_hit:
@@ -57,50 +124,43 @@ class ComputerPlayer(BasePlayer):
                 
                 # Filter out invalid or already tried moves
                 possible_moves = [(r, c) for r, c in possible_moves 
-                                if 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE 
-                                and self.attack_board.grid[r][c] not in ["-", "X"]]
+                                if 0 <= r < size and 0 <= c < size 
+                                and not self.attack_board.is_attacked(r, c)]
                 
                 if possible_moves:
-                    row, column = random.choice(possible_moves)
+                    row, column = self.rng.choice(possible_moves)
                 else:
                     # Reset targeting if no valid moves in current direction
                     self.last_hit = None
                     self.direction = None
                     self.hit_stack = []
-                    self.update_probability_map(opponent)
-                    row, column = np.unravel_index(np.argmax(self.probability_map), self.probability_map.shape)
+                    row, column = self.hunt_target(opponent)
             else:
                 # Try all adjacent positions if direction unknown
                 possible_moves = [(row-1, column), (row+1, column), (row, column-1), (row, column+1)]
                 possible_moves = [(r, c) for r, c in possible_moves 
-                                if 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE 
-                                and self.attack_board.grid[r][c] not in ["-", "X"]]
+                                if 0 <= r < size and 0 <= c < size 
+                                and not self.attack_board.is_attacked(r, c)]
                 if possible_moves:
-                    row, column = random.choice(possible_moves)
+                    row, column = self.rng.choice(possible_moves)
                 else:
                     # Reset targeting if no valid adjacent moves
                     self.last_hit = None
                     self.direction = None
                     self.hit_stack = []
-                    self.update_probability_map(opponent)
-                    row, column = np.unravel_index(np.argmax(self.probability_map), self.probability_map.shape)
+                    row, column = self.hunt_target(opponent)
         # Third Priority - Use probability map for targeting
         else:
-            self.update_probability_map(opponent)
-            row, column = np.unravel_index(np.argmax(self.probability_map), self.probability_map.shape)
+            row, column = self.hunt_target(opponent)
+
+        self.last_move = (row, column)
 
         # Process the attack result
-        if opponent.ship_manager.grid[row][column] == "X":
+        if opponent.ship_manager.has_ship(row, column):
             # Handle successful hit
-            self.attack_board.grid[row][column] = "X"
+            self.attack_board.record_shot(row, column, True)
             self.last_move_hit = True
             
-            # Only print to console if not in GUI mode
-            if not self.gui_mode:
-                print("\nComputer hit!\n")
-                print('\033[1m       Computer`s Guess Board\033[0m')
-                self.display.display_board(self.attack_board.grid)
-            
             if self.last_hit:
                 # Determine ship orientation based on multiple hits
                 if row == self.last_hit[0]:
@@ -118,30 +178,50 @@ class ComputerPlayer(BasePlayer):
                 
                 # Filter valid moves and add to hit stack
                 valid_moves = [(r, c) for r, c in next_moves 
-                              if 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE 
-                              and self.attack_board.grid[r][c] not in ["-", "X"]]
+                              if 0 <= r < size and 0 <= c < size 
+                              and not self.attack_board.is_attacked(r, c)]
                 self.hit_stack.extend(valid_moves)
             
             self.last_hit = (row, column)
             
             # Check if a ship was sunk and store the name for GUI display
-            sunk_ship = opponent.ship_manager.check_sunk_ship_gui(row, column)
+            sunk_ship = opponent.ship_manager.check_sunk_ship(row, column)
             if sunk_ship:
                 self.last_move_sunk = sunk_ship
-                # Only print to console if not in GUI mode
-                if not self.gui_mode:
-                    print("\n*******************************************")
-                    print(f"\033[1m        Computer has sunk the {sunk_ship}!\033[0m")
-                    print("*******************************************\n")
+                self.sunk_ships.append(sunk_ship)
+                if self.targeter is not None:
+                    self.targeter.ship_sunk(self.attack_board, row, column, self.config.ship_types[sunk_ship])
+                if self.tracker is not None:
+                    self.tracker.ship_sunk(self.config.ship_types[sunk_ship])
+            self.report_shot(opponent, row, column, True, sunk_ship)
         else:
             # Handle miss
-            self.attack_board.grid[row][column] = "-"
-            # Only print to console if not in GUI mode
-            if not self.gui_mode:
-                print("\nComputer miss!\n")
-                print('\033[1m       Computer`s Guess Board\033[0m')
-                self.display.display_board(self.attack_board.grid)
+            self.attack_board.record_shot(row, column, False)
+            self.report_shot(opponent, row, column, False)
 
+    def hunt_target(self, opponent):
+        """
+        Picks the next cell to search when no hit is being followed up.
+
+        Args:
+            opponent (BasePlayer): The opponent player.
+
+        Returns:
+            tuple: The row and column to attack.
+        """
+        if self.probability_map is None:
+            # Sparse board: random cells, of one checkerboard colour when every
+            # ship is long enough to touch both colours
+            parity = 2 if min(self.config.fleet_lengths) > 1 else 1
+            while True:
+                row = self.rng.randrange(self.config.board_size)
+                column = self.rng.randrange(self.config.board_size)
+                if (row + column) % parity == 0 and not self.attack_board.is_attacked(row, column):
+                    return row, column
+        self.update_probability_map(opponent)
+        return divmod(int(np.argmax(self.probability_map)), self.config.board_size)
+
+    @timed
     def update_probability_map(self, opponent):
         """
         Updates probability map for intelligent targeting.
@@ -149,44 +229,15 @@ class ComputerPlayer(BasePlayer):
         Args:
             opponent (BasePlayer): The opponent player.
         """
-        # Reset the probability map
-        self.probability_map = np.zeros((BOARD_SIZE, BOARD_SIZE))
-        
-        # First mark all attacked positions with zero probability
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                # Explicitly set already attacked positions to 0
-                if self.attack_board.grid[row][col] in ["-", "X"]:
-                    self.probability_map[row][col] = 0
-                    continue
-        
-        # Calculate additional probabilities for possible ship placements
-        for ship, length in SHIP_TYPES.items():
-            for row in range(BOARD_SIZE):
-                for col in range(BOARD_SIZE):
-                    # Check horizontal placement possibility
-                    if self.can_place_ship(opponent, row, col, length, "H"):
-                        for i in range(length):
-                            # Only increment if position hasn't been attacked
-                            if self.attack_board.grid[row][col + i] not in ["-", "X"]:
-                                self.probability_map[row][col + i] += 1
-                    # Check vertical placement possibility
-                    if self.can_place_ship(opponent, row, col, length, "V"):
-                        for i in range(length):
-                            # Only increment if position hasn't been attacked
-                            if self.attack_board.grid[row + i][col] not in ["-", "X"]:
-                                self.probability_map[row + i][col] += 1
-        
-        # Ensure no negative probabilities and zero out already hit positions
-        self.probability_map = np.maximum(self.probability_map, 0)
-        
-        # If all positions are zero, reset to uniform distribution
-        if np.all(self.probability_map == 0):
-            self.probability_map = np.ones((BOARD_SIZE, BOARD_SIZE))
-            for row in range(BOARD_SIZE):
-                for col in range(BOARD_SIZE):
-                    if self.attack_board.grid[row][col] in ["-", "X"]:
-                        self.probability_map[row][col] = 0
+        if self.tracker is not None:
+            # Incremental mode: only placements through newly attacked cells are removed
+            self.tracker.sync(self.attack_board.attacked_mask)
+            self.probability_map = self.tracker.density_map()
+            return
+
+        # Count every legal placement in bulk, reading the lines straight off the attacked-cell bitboard
+        self.probability_map = ProbabilityEngine.bitboard_density(self.attack_board.attacked_mask,
+                                                                  self.config.board_size, self.config.fleet_weights)
 
     def get_move(self, opponent):
         """
@@ -198,24 +249,25 @@ class ComputerPlayer(BasePlayer):
         Returns:
             tuple: The row and column of the next move.
         """
+        size = self.config.board_size
         if self.last_hit:
             row, col = self.last_hit
-            random.shuffle(self.hit_directions)
+            self.rng.shuffle(self.hit_directions)
             
             for dr, dc in self.hit_directions:
                 new_row = row + dr
                 new_col = col + dc
                 
-                if (0 <= new_row < BOARD_SIZE and 
-                    0 <= new_col < BOARD_SIZE and 
+                if (0 <= new_row < size and 
+                    0 <= new_col < size and 
                     opponent.ship_manager.grid[new_row][new_col] not in ["-", "H"]):
                     return new_row, new_col
             
             self.last_hit = None
 
         while True:
-            row = random.randint(0, BOARD_SIZE - 1)
-            col = random.randint(0, BOARD_SIZE - 1)
+            row = self.rng.randint(0, size - 1)
+            col = self.rng.randint(0, size - 1)
             
             if opponent.ship_manager.grid[row][col] not in ["-", "H"]:
                 if opponent.ship_manager.grid[row][col] == "X":
@@ -0,0 +1,77 @@
+import re
+
+class CoordinateCodec:
+    """Spreadsheet-style board coordinates: columns A-Z, then AA-ZZ, AAA and so on, rows from 1"""
+    POSITION_PATTERN = re.compile(r"([A-Z]+)(\d+)")
+
+    @staticmethod
+    def column_label(column):
+        """
+        Formats a column index as letters.
+
+        Args:
+            column (int): The zero-based column index.
+
+        Returns:
+            str: The column label, e.g. 'A' for 0, 'Z' for 25, 'AA' for 26.
+        """
+        label = ""
+        column += 1
+        while column:
+            column, remainder = divmod(column - 1, 26)
+            label = chr(65 + remainder) + label
+        return label
+
+    @staticmethod
+    def column_index(label):
+        """
+        Parses column letters.
+
+        Args:
+            label (str): The column label, in upper case.
+
+        Returns:
+            int: The zero-based column index.
+        """
+        column = 0
+        for letter in label:
+            column = column * 26 + ord(letter) - 64
+        return column - 1
+
+    @staticmethod
+    def format_position(row, column):
+        """
+        Formats a board position.
+
+        Args:
+            row (int): The zero-based row.
+            column (int): The zero-based column.
+
+        Returns:
+            str: The position, e.g. 'B6' or 'AA10'.
+        """
+        return f"{CoordinateCodec.column_label(column)}{row + 1}"
+
+    @staticmethod
+    def parse_position(position, size):
+        """
+        Parses a position entered by a player.
+
+        Args:
+            position (str): The position, e.g. 'b6' or 'AA10'.
+            size (int): The width of the board.
+
+        Returns:
+            tuple: The zero-based row and column.
+
+        Raises:
+            ValueError: If the position is malformed or outside the board.
+        """
+        match = CoordinateCodec.POSITION_PATTERN.fullmatch(position.strip().upper())
+        if not match:
+            raise ValueError("Invalid position. Please enter a valid position (e.g., A2).\n")
+        column = CoordinateCodec.column_index(match.group(1))
+        row = int(match.group(2)) - 1
+        if row < 0 or row >= size or column < 0 or column >= size:
+            raise ValueError("Position out of bounds. Please enter a valid position within the grid.\n")
+        return row, column
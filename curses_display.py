@@ -0,0 +1,488 @@
+import argparse
+import contextlib
+import curses
+import io
+import os
+import random
+import struct
+import subprocess
+import sys
+from battleship_config import DEFAULT_CONFIG, GameConfig
+from cli_gameplay import ConsoleRenderer
+from coordinates import CoordinateCodec
+from game_events import EventBus, GameOver, ShotResult, Sunk
+from game_setup import GameSetup
+
+class CursesBoard:
+    """One board drawn at a fixed place of a curses screen.
+
+    `draw` writes the title, column labels, border and row numbers once, laid
+    out like BoardDisplay's; afterwards `set_cell` rewrites a single character,
+    so a refresh sends the terminal a cursor move and one cell per change,
+    whatever the size of the board."""
+    def __init__(self, screen, top, left, size, title, attributes):
+        """
+        Initializes the board without drawing it.
+
+        Args:
+            screen (curses.window): The screen to draw on.
+            top (int): Screen row of the title.
+            left (int): Screen column of the left edge.
+            size (int): Rows and columns of the board.
+            title (str): The caption above the board.
+            attributes (dict): Cell character -> curses attribute it is drawn with.
+        """
+        self.screen = screen
+        self.top = top
+        self.left = left
+        self.size = size
+        self.title = title
+        self.attributes = attributes
+        self.number_width = len(str(size))
+        self.cell_width = len(CoordinateCodec.column_label(size - 1))
+        self.width = self.number_width + 1 + size * (self.cell_width + 1)
+        self.height = size + 3  # Title, labels and border above the rows
+
+    def draw(self):
+        """Draws the empty board."""
+        margin = " " * (self.number_width + 1)
+        labels = " ".join(CoordinateCodec.column_label(j).ljust(self.cell_width) for j in range(self.size))
+        self.screen.addstr(self.top, self.left, self.title, curses.A_BOLD)
+        self.screen.addstr(self.top + 1, self.left, margin + labels)
+        self.screen.addstr(self.top + 2, self.left, margin + "+" + ("-" * self.cell_width + "+") * self.size)
+        empty = "|".join([" " * self.cell_width] * self.size)
+        for row in range(self.size):
+            self.screen.addstr(self.top + 3 + row, self.left, "%*d|%s|" % (self.number_width, row + 1, empty))
+
+    def set_cell(self, row, column, mark):
+        """
+        Shows a mark in one cell.
+
+        Args:
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+            mark (str): One character, e.g. 'X' for a hit or '-' for a miss.
+        """
+        x = self.left + self.number_width + 1 + column * (self.cell_width + 1)
+        self.screen.addstr(self.top + 3 + row, x, mark, self.attributes.get(mark, curses.A_NORMAL))
+
+class CursesRenderer:
+    """Shows a game's events on a full-screen curses display.
+
+    The player's guesses are on the left and the player's fleet, with the
+    opponent's shots, on the right; a status line under each board tells the
+    last result. Handlers only change the screen's contents: the game calls
+    refresh once per turn, and curses then sends just the cells that changed."""
+    GAP = 4  # Columns between the boards
+    FLEET = "O"  # Mark of an unhit ship cell
+
+    def __init__(self, screen, player, opponent):
+        """
+        Initializes the layout for a game's board size.
+
+        Args:
+            screen (curses.window): The screen to draw on.
+            player (BasePlayer): The player at the keyboard.
+            opponent (BasePlayer): The opponent.
+        """
+        self.screen = screen
+        self.player = player
+        self.opponent = opponent
+        size = player.config.board_size
+        attributes = self.cell_attributes()
+        self.guess_board = CursesBoard(screen, 2, 0, size, "Your Guesses", attributes)
+        self.fleet_board = CursesBoard(screen, 2, self.guess_board.width + self.GAP, size,
+                                       "Your Fleet", attributes)
+        self.status_row = 2 + self.guess_board.height + 1
+        self.prompt_row = self.status_row + 2
+        self.height = self.prompt_row + 2  # Prompt and message lines
+        self.width = self.fleet_board.left + self.fleet_board.width
+        self.winner = None
+
+    @staticmethod
+    def cell_attributes():
+        """
+        Chooses how marks are drawn: in the GUI's colours when the terminal has them.
+
+        Returns:
+            dict: Cell character -> curses attribute.
+        """
+        if not curses.has_colors():
+            return {"X": curses.A_BOLD, "-": curses.A_DIM, "O": curses.A_NORMAL}
+        curses.start_color()
+        curses.use_default_colors()
+        for pair, color in enumerate((curses.COLOR_RED, curses.COLOR_BLUE, curses.COLOR_GREEN), 1):
+            curses.init_pair(pair, color, -1)
+        return {"X": curses.color_pair(1) | curses.A_BOLD, "-": curses.color_pair(2), "O": curses.color_pair(3)}
+
+    def subscribe(self, events):
+        """
+        Starts showing the events of a game.
+
+        Args:
+            events (EventBus): The game's bus.
+        """
+        events.subscribe(ShotResult, self.on_shot)
+        events.subscribe(Sunk, self.on_sunk)
+        events.subscribe(GameOver, self.on_game_over)
+
+    def check_fits(self):
+        """
+        Raises:
+            ValueError: If the terminal is too small for both boards.
+        """
+        rows, columns = self.screen.getmaxyx()
+        if rows < self.height or columns < self.width:
+            raise ValueError(f"A {self.player.config.board_size}x{self.player.config.board_size} game needs a "
+                             f"{self.width}x{self.height} terminal, this one is {columns}x{rows}; "
+                             f"enlarge it or play with --cli")
+
+    def draw(self):
+        """Clears the screen and draws both boards as they are now, once per game."""
+        self.check_fits()
+        self.winner = None
+        self.screen.erase()
+        self.screen.addstr(0, 0, "BATTLESHIP", curses.A_BOLD)
+        self.guess_board.draw()
+        self.fleet_board.draw()
+        for ship_cells in self.player.ship_manager.ship_locations.values():
+            for row, column in ship_cells:
+                self.fleet_board.set_cell(row, column, self.FLEET)
+        for board, shooter in ((self.guess_board, self.player), (self.fleet_board, self.opponent)):
+            for row in range(board.size):
+                for column in range(board.size):
+                    mark = shooter.attack_board.cell(row, column)
+                    if mark != " ":
+                        board.set_cell(row, column, mark)
+
+    def set_status(self, board, text, attribute=curses.A_NORMAL):
+        """
+        Replaces the status line under a board.
+
+        Args:
+            board (CursesBoard): The board.
+            text (str): The new status.
+            attribute (int): The curses attribute of the text.
+        """
+        self.screen.addstr(self.status_row, board.left, text[:board.width].ljust(board.width), attribute)
+
+    def board_of(self, shooter):
+        """
+        Finds the board showing a player's shots.
+
+        Args:
+            shooter (BasePlayer): The player who fired.
+
+        Returns:
+            CursesBoard: The guess board for the player, the fleet board for the opponent.
+        """
+        return self.guess_board if shooter is self.player else self.fleet_board
+
+    def on_shot(self, event):
+        """
+        Shows a hit or a miss on the shooter's board.
+
+        Args:
+            event (ShotResult): The event.
+        """
+        board = self.board_of(event.shooter)
+        board.set_cell(event.row, event.column, "X" if event.hit else "-")
+        position = CoordinateCodec.format_position(event.row, event.column)
+        self.set_status(board, f"{event.shooter.name}: {position} {'hit' if event.hit else 'miss'}")
+
+    def on_sunk(self, event):
+        """
+        Announces a sunk ship under the shooter's board.
+
+        Args:
+            event (Sunk): The event.
+        """
+        self.set_status(self.board_of(event.shooter), f"{event.shooter.name} has sunk the {event.ship}!",
+                        curses.A_BOLD)
+
+    def on_game_over(self, event):
+        """
+        Remembers the winner and announces it.
+
+        Args:
+            event (GameOver): The event.
+        """
+        self.winner = event.winner
+        self.set_message(f"{event.winner.name} has won the game!", curses.A_BOLD)
+
+    def set_message(self, text, attribute=curses.A_NORMAL):
+        """
+        Replaces the message line under the prompt.
+
+        Args:
+            text (str): The message.
+            attribute (int): The curses attribute of the text.
+        """
+        self.screen.move(self.prompt_row + 1, 0)
+        self.screen.clrtoeol()
+        self.screen.addstr(self.prompt_row + 1, 0, text[:self.screen.getmaxyx()[1] - 1], attribute)
+
+class CursesGamePlay:
+    """Main game coordinator for the full-screen terminal version.
+
+    Both fleets are placed at random; the player then types targets on the
+    prompt line while the boards stay in place."""
+    PROMPT = "Enter the position (e.g., A2): "
+
+    def __init__(self, screen, recorder=None, config=None, rng=None):
+        """
+        Initializes the players and the display.
+
+        Args:
+            screen (curses.window): The screen, as passed by curses.wrapper.
+            recorder (ReplayRecorder, optional): Replay log receiving every shot of every game.
+            config (GameConfig, optional): The game variant to play; defaults to config.json.
+            rng (random.Random, optional): Source of randomness for the fleets.
+        """
+        self.screen = screen
+        self.recorder = recorder
+        self.config = config if config is not None else DEFAULT_CONFIG
+        self.rng = rng if rng is not None else random.Random()
+        self.setup = GameSetup(self.config)
+        self.players = self.setup.players
+        self.renderer = CursesRenderer(screen, *self.players)
+        self.renderer.subscribe(EventBus.of(self.players))
+
+    def new_game(self):
+        """Deals both fleets and draws the boards."""
+        for player in self.players:
+            player.reset()
+            self.setup.deploy_random_fleet(player, self.rng)
+        if self.recorder is not None:
+            self.recorder.attach(self.players)
+        self.renderer.draw()
+        self.screen.refresh()
+
+    def play_turn(self, row, column):
+        """
+        Fires the player's shot and, unless it won, answers with the computer's.
+
+        Args:
+            row (int): The row of the player's shot.
+            column (int): The column of the player's shot.
+
+        Returns:
+            BasePlayer: The winner, or None while the game goes on.
+        """
+        human, computer = self.players
+        human.fire(computer, row, column)
+        if self.renderer.winner is None and not computer.ship_manager.all_ships_sunk():
+            computer.take_turn(human)
+        self.screen.refresh()
+        return self.renderer.winner
+
+    def read_line(self, prompt):
+        """
+        Reads one line typed on the prompt line.
+
+        Args:
+            prompt (str): The text in front of the input.
+
+        Returns:
+            str: The typed text, stripped and upper-cased.
+        """
+        row = self.renderer.prompt_row
+        self.screen.move(row, 0)
+        self.screen.clrtoeol()
+        self.screen.addstr(row, 0, prompt)
+        curses.echo()
+        try:
+            text = self.screen.getstr(row, len(prompt), 16)
+        finally:
+            curses.noecho()
+        return text.decode(errors="replace").strip().upper()
+
+    def read_target(self):
+        """
+        Asks for a cell the player has not attacked yet.
+
+        Returns:
+            tuple: (row, column) of the target.
+        """
+        human = self.players[0]
+        while True:
+            try:
+                row, column = CoordinateCodec.parse_position(self.read_line(self.PROMPT), self.config.board_size)
+            except ValueError as e:
+                self.renderer.set_message(str(e))
+                continue
+            if human.attack_board.is_attacked(row, column):
+                self.renderer.set_message("You already attacked this position. Try again.")
+                continue
+            self.renderer.set_message("")
+            return row, column
+
+    def run(self):
+        """Plays games until the player declines another one."""
+        while True:
+            self.new_game()
+            while self.play_turn(*self.read_target()) is None:
+                pass
+            while True:
+                choice = self.read_line("Do you want to play again? (y/n): ")
+                if choice in ("Y", "YES", "N", "NO"):
+                    break
+            if choice in ("N", "NO"):
+                return
+
+def run(recorder=None, config=None):
+    """
+    Plays the full-screen version in the current terminal.
+
+    Args:
+        recorder (ReplayRecorder, optional): Replay log receiving every shot of every game.
+        config (GameConfig, optional): The game variant to play; defaults to config.json.
+    """
+    curses.wrapper(lambda screen: CursesGamePlay(screen, recorder, config).run())
+
+def autoplay(screen, config, turns, seed):
+    """
+    Plays random targets for the player for a number of turns, for the benchmark.
+
+    Args:
+        screen (curses.window): The screen.
+        config (GameConfig): The game variant.
+        turns (int): The most turns to play; the game may end sooner.
+        seed (int): Seed for the fleets and the targets.
+
+    Returns:
+        int: The turns played.
+    """
+    rng = random.Random(seed)
+    game = CursesGamePlay(screen, config=config, rng=rng)
+    game.new_game()
+    human = game.players[0]
+    played = 0
+    while played < turns:
+        row, column = rng.randrange(config.board_size), rng.randrange(config.board_size)
+        if human.attack_board.is_attacked(row, column):
+            continue
+        played += 1
+        if game.play_turn(row, column) is not None:
+            break
+    return played
+
+def terminal_bytes(size, turns, seed):
+    """
+    Runs `autoplay` in a child process on a pseudo-terminal and counts what it writes.
+
+    Args:
+        size (int): Rows and columns of the board.
+        turns (int): The most turns to play.
+        seed (int): Seed of the game.
+
+    Returns:
+        tuple: (bytes written to the terminal, turns played).
+    """
+    # Pseudo-terminals are POSIX-only: keep the module importable elsewhere
+    import fcntl
+    import pty
+    import termios
+
+    master, slave = pty.openpty()
+    # Exactly as large as the layout needs; the 80x24 floor keeps small boards in a common terminal
+    layout_columns = 2 * (len(str(size)) + 1 + size * (len(CoordinateCodec.column_label(size - 1)) + 1)) \
+                     + CursesRenderer.GAP
+    fcntl.ioctl(slave, termios.TIOCSWINSZ, struct.pack("HHHH", max(24, size + 10), max(80, layout_columns), 0, 0))
+    env = dict(os.environ, TERM="xterm")
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--autoplay", "--size", str(size),
+                                "--turns", str(turns), "--seed", str(seed)],
+                               stdin=slave, stdout=slave, stderr=subprocess.PIPE, env=env,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    os.close(slave)
+    written = 0
+    while True:
+        try:
+            data = os.read(master, 65536)
+        except OSError:  # EIO once the child has closed the terminal
+            break
+        if not data:
+            break
+        written += len(data)
+    errors = process.stderr.read().decode()
+    process.wait()
+    os.close(master)
+    if process.returncode:
+        raise RuntimeError(errors)
+    return written, int(errors.split()[-1])
+
+def print_bytes(size, turns, seed):
+    """
+    Counts what the line-printing CLI renderer writes for the same kind of game.
+
+    Args:
+        size (int): Rows and columns of the board.
+        turns (int): The most turns to play.
+        seed (int): Seed of the game.
+
+    Returns:
+        tuple: (bytes printed, turns played).
+    """
+    rng = random.Random(seed)
+    setup = GameSetup(benchmark_config(size))
+    human, computer = setup.players
+    for player in setup.players:
+        setup.deploy_random_fleet(player, rng)
+    ConsoleRenderer().subscribe(EventBus.of(setup.players))
+    output = io.StringIO()
+    played = 0
+    with contextlib.redirect_stdout(output):
+        while played < turns and not human.ship_manager.all_ships_sunk() \
+                and not computer.ship_manager.all_ships_sunk():
+            row, column = rng.randrange(size), rng.randrange(size)
+            if human.attack_board.is_attacked(row, column):
+                continue
+            played += 1
+            human.fire(computer, row, column)
+            if not computer.ship_manager.all_ships_sunk():
+                computer.take_turn(human)
+    return len(output.getvalue().encode()), played
+
+def benchmark_config(size):
+    """
+    Builds the game variant the benchmark plays: config.json's fleet on another board size.
+
+    Args:
+        size (int): Rows and columns of the board.
+
+    Returns:
+        GameConfig: The variant.
+    """
+    return GameConfig(size, dict(DEFAULT_CONFIG.ship_types), dict(DEFAULT_CONFIG.instructions))
+
+def main():
+    parser = argparse.ArgumentParser(description="Play full-screen in the terminal, or measure its output.")
+    parser.add_argument("--size", type=int, default=None, help="rows and columns of the board")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="compare bytes written per turn with the line-printing CLI")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 16, 32, 48], help="board sizes to benchmark")
+    parser.add_argument("--turns", type=int, default=20, help="turns per benchmark game")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the benchmark games")
+    parser.add_argument("--autoplay", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    config = benchmark_config(args.size) if args.size else None
+    if args.autoplay:
+        played = curses.wrapper(lambda screen: autoplay(screen, config or DEFAULT_CONFIG, args.turns, args.seed))
+        print(played, file=sys.stderr)
+    elif args.benchmark:
+        print(f"{'size':>6}{'first draw':>12}{'curses/turn':>13}{'print/turn':>12}")
+        short = max(1, args.turns // 4)
+        for size in args.sizes:
+            # The slope between a short and a long game separates the first draw from the turns
+            short_bytes, short_turns = terminal_bytes(size, short, args.seed)
+            long_bytes, long_turns = terminal_bytes(size, args.turns, args.seed)
+            per_turn = (long_bytes - short_bytes) / max(1, long_turns - short_turns)
+            printed, printed_turns = print_bytes(size, args.turns, args.seed)
+            print(f"{size:>6}{short_bytes - per_turn * short_turns:>12.0f}{per_turn:>13.0f}"
+                  f"{printed / max(1, printed_turns):>12.0f}")
+    else:
+        run(config=config)
+
+if __name__ == "__main__":
+    main()
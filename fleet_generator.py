@@ -0,0 +1,310 @@
+import random
+import sys
+from probability_engine import ProbabilityEngine
+from ship_manager import SparseShipManager
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")  # Loaded on first use, keeping start-up fast
+
+class FleetPlacementError(ValueError):
+    """Raised when a fleet cannot be placed on the board"""
+
+class FleetGenerator:
+    """Random fleet layouts drawn from the placements that are still legal"""
+    TILING_MAX_CELLS = 800  # Largest crowded board filled cell by cell (bounds the recursion depth)
+    QUICK_DRAWS = 8  # Random draws per ship before building its legal placements
+
+    def __init__(self, validator, ship_types, rng=random):
+        """
+        Initializes the generator.
+
+        Args:
+            validator (BoardValidator): Provides the board size and placement index.
+            ship_types (dict): Ship name -> length, in deployment order.
+            rng (random.Random, optional): Source of randomness, for reproducible layouts.
+        """
+        self.validator = validator
+        self.ship_types = ship_types
+        self.rng = rng
+
+    def check_fleet(self):
+        """
+        Rejects fleets that obviously cannot fit.
+
+        Raises:
+            FleetPlacementError: If a ship is longer than the board or the fleet has more cells than the board.
+        """
+        size = self.validator.size
+        for ship, length in self.ship_types.items():
+            if not 0 < length <= size:
+                raise FleetPlacementError(f"The {ship} (length {length}) does not fit on a {size}x{size} board.")
+        if sum(self.ship_types.values()) > size * size:
+            raise FleetPlacementError(f"The fleet has more cells than a {size}x{size} board.")
+
+    def generate(self):
+        """
+        Places the whole fleet. Placements are drawn from the legal ones and the
+        search backtracks on dead ends, so it always ends and only fails when no
+        layout exists. Most boards place ship by ship; crowded boards fill the
+        board cell by cell, which finds tight packings far faster, and huge
+        sparse boards simply redraw colliding ships.
+
+        Returns:
+            list: (ship, length, row, column, orientation) for each ship, in fleet order.
+
+        Raises:
+            FleetPlacementError: If the fleet cannot be placed.
+        """
+        self.check_fleet()
+        size = self.validator.size
+        cells = sum(self.ship_types.values())
+        chosen = self.scatter_ships() if SparseShipManager.suits(size, cells) else None
+        if chosen is None:
+            tiling = cells * 2 > size * size and size * size <= self.TILING_MAX_CELLS
+            # Both searches recurse once per ship (or per cell), so big fleets need a deeper stack
+            limit = sys.getrecursionlimit()
+            sys.setrecursionlimit(max(limit, (size * size if tiling else len(self.ship_types)) + 100))
+            try:
+                chosen = self.fill_cells() if tiling else self.place_ships()
+            finally:
+                sys.setrecursionlimit(limit)
+        if chosen is None:
+            raise FleetPlacementError(f"The fleet cannot be placed on a {size}x{size} board.")
+
+        # Hand the placements of equal-length ships out in random order
+        placements = {}
+        for length, placement in chosen:
+            placements.setdefault(length, []).append(placement)
+        for group in placements.values():
+            self.rng.shuffle(group)
+        layout = []
+        for ship, length in self.ship_types.items():
+            row, column, orientation = self.validator.placement_index(length).placement(placements[length].pop())
+            layout.append((ship, length, row, column, orientation))
+        return layout
+
+    def scatter_ships(self):
+        """
+        Sparse boards: every ship is drawn from all its placements until it
+        misses the ships already placed, tracking cells in a set so nothing
+        the size of the board is ever built.
+
+        Returns:
+            list: (length, position in the placement index) per ship, or None if the draws kept colliding.
+        """
+        occupied = set()
+        chosen = []
+        for length in self.ship_types.values():
+            index = self.validator.placement_index(length)
+            for _ in range(self.QUICK_DRAWS):
+                placement = self.rng.randrange(len(index))
+                cells = index.cells(placement)
+                if occupied.isdisjoint(cells):
+                    occupied.update(cells)
+                    chosen.append((length, placement))
+                    break
+            else:
+                return None
+        return chosen
+
+    def place_ships(self):
+        """
+        Ship-by-ship search: each ship is drawn at random from its legal placements.
+
+        Returns:
+            list: (length, position in the placement index) per ship, or None if the fleet cannot fit.
+        """
+        size = self.validator.size
+        # Longest ships first: they have the fewest options, so dead ends show up early
+        lengths = sorted(self.ship_types.values(), reverse=True)
+        remaining_cells = [sum(lengths[depth:]) for depth in range(len(lengths) + 1)]
+        chosen = []
+        failed = set()  # (ships placed, occupied cells) states known to lead nowhere
+
+        def place(depth, occupied):
+            if depth == len(lengths):
+                return True
+            if (depth, occupied) in failed:
+                return False
+            length = lengths[depth]
+            free_cells = size * size - bin(occupied).count("1")
+            if remaining_cells[depth] * 2 > free_cells and not self.room_for(occupied, lengths[depth:]):
+                failed.add((depth, occupied))
+                return False
+            index = self.validator.placement_index(length)
+            # On open boards a few draws from all placements usually hit a legal one
+            # long before the legal set could be built; the pick is just as uniform
+            for _ in range(self.QUICK_DRAWS):
+                placement = self.rng.randrange(len(index))
+                mask = index.mask(placement)
+                if not mask & occupied:
+                    chosen.append((length, placement))
+                    if place(depth + 1, occupied | mask):
+                        return True
+                    chosen.pop()
+                    break
+            candidates = self.validator.legal_placements(occupied, length)
+            # Lazy Fisher-Yates shuffle: only the candidates actually tried are drawn
+            for tried in range(len(candidates)):
+                pick = self.rng.randrange(tried, len(candidates))
+                candidates[tried], candidates[pick] = candidates[pick], candidates[tried]
+                placement = int(candidates[tried])
+                chosen.append((length, placement))
+                if place(depth + 1, occupied | index.mask(placement)):
+                    return True
+                chosen.pop()
+            failed.add((depth, occupied))
+            return False
+
+        return chosen if place(0, 0) else None
+
+    def fill_cells(self):
+        """
+        Cell-by-cell search for crowded boards: the first undecided cell is
+        either left empty (while spare cells remain) or becomes the start of a
+        ship running right or down. Random searches like this one are either
+        quick or very slow, so an unlucky search is restarted with a fresh
+        random order and a doubled step budget; dead ends it has proven are kept.
+
+        Returns:
+            list: (length, position in the placement index) per ship, or None if the fleet cannot fit.
+        """
+        size = self.validator.size
+        cells = size * size
+        lengths = sorted(set(self.ship_types.values()))
+        indexes = [self.validator.placement_index(length) for length in lengths]
+        counts = [list(self.ship_types.values()).count(length) for length in lengths]
+        chosen = []
+        failed = set()  # (cell, occupied cells, ships left) states known to lead nowhere
+        steps = [0, 0]  # Steps taken and steps allowed in the current search
+
+        def fill(cell, occupied, remaining, spare):
+            """Returns True when the fleet is placed, False at a dead end, None when out of steps."""
+            while cell < cells and occupied >> cell & 1:
+                cell += 1
+            if not any(remaining):
+                return True
+            if cell == cells or (cell, occupied, remaining) in failed:
+                return False
+            steps[0] += 1
+            if steps[0] > steps[1]:
+                return None
+            row, column = divmod(cell, size)
+            options = []
+            for i, index in enumerate(indexes):
+                if not remaining[i]:
+                    continue
+                for orientation, end in (("H", column), ("V", row)):
+                    if end + index.length <= size:
+                        placement = index.position(row, column, orientation)
+                        if not index.masks[placement] & occupied:
+                            options.append((i, placement))
+            self.rng.shuffle(options)
+            if spare:
+                # Leave the cell empty first about as often as cells are spare overall
+                undecided = cells - cell - bin(occupied >> cell).count("1")
+                options.insert(0 if self.rng.random() * undecided < spare else len(options), None)
+            exhausted = True
+            for option in options:
+                if option is None:
+                    result = fill(cell + 1, occupied, remaining, spare - 1)
+                else:
+                    i, placement = option
+                    chosen.append((lengths[i], placement))
+                    left = remaining[:i] + (remaining[i] - 1,) + remaining[i + 1:]
+                    result = fill(cell + 1, occupied | indexes[i].masks[placement], left, spare)
+                    if not result:
+                        chosen.pop()
+                if result:
+                    return True
+                if result is None:
+                    exhausted = False
+                    if steps[0] > steps[1]:
+                        return None
+            if exhausted:
+                failed.add((cell, occupied, remaining))
+                return False
+            return None
+
+        spare = cells - sum(self.ship_types.values())
+        budget = 4 * cells
+        while True:
+            steps[:] = [0, budget]
+            result = fill(0, 0, tuple(counts), spare)
+            if result is not None:
+                return chosen if result else None
+            budget *= 2
+
+    def room_for(self, occupied, lengths):
+        """
+        Checks that enough free cells can still be covered by some placement of
+        the remaining ships; used to cut hopeless branches on crowded boards.
+
+        Args:
+            occupied (int): Bitboard of cells already taken.
+            lengths (list): Lengths of the ships still to place.
+
+        Returns:
+            bool: False if the remaining ships certainly cannot fit.
+        """
+        free = ~ProbabilityEngine.mask_to_array(occupied, self.validator.size)
+        weights = ProbabilityEngine.fleet_weights(lengths)
+        coverage = ProbabilityEngine.line_counts(free, weights) + ProbabilityEngine.line_counts(free.T, weights).T
+        return np.count_nonzero(coverage) >= sum(lengths)
+
+    def deploy(self, ship_manager):
+        """
+        Places a freshly generated fleet on a board.
+
+        Args:
+            ship_manager (ShipManager): The board to place the ships on.
+
+        Raises:
+            FleetPlacementError: If the fleet cannot be placed.
+        """
+        for ship, length, row, column, orientation in self.generate():
+            ship_manager.deploy_ship(ship, length, row, column, orientation)
+
+    def generate_masks(self, count, max_attempts=1000):
+        """
+        Bulk mode: yields uniformly random layouts as bitboards, for simulation
+        and testing. Every ship is drawn from all its placements and the draw is
+        restarted at the first overlap, which keeps layouts exactly uniform at
+        the cost of a few cheap integer ANDs. If a crowded fleet needs more than
+        `max_attempts` draws, the backtracking `generate` is used instead for
+        that layout (legal, but no longer exactly uniform).
+
+        Args:
+            count (int): The number of layouts to generate.
+            max_attempts (int): Draws to try before falling back to backtracking.
+
+        Yields:
+            tuple: The bitboard of each ship, in fleet order.
+        """
+        self.check_fleet()
+        lengths = list(self.ship_types.values())
+        indexes = [self.validator.placement_index(length) for length in lengths]
+        # Small boards index the cached masks directly; large ones build each mask on demand
+        small = self.validator.size <= ProbabilityEngine.TABLE_MAX_SIZE
+        draws = [(len(index), index.masks.__getitem__ if small else index.mask) for index in indexes]
+        randrange = self.rng.randrange
+        for _ in range(count):
+            for _ in range(max_attempts):
+                occupied = 0
+                layout = []
+                for placements, mask_of in draws:
+                    mask = mask_of(randrange(placements))
+                    if mask & occupied:
+                        break
+                    occupied |= mask
+                    layout.append(mask)
+                else:
+                    yield tuple(layout)
+                    break
+            else:
+                layout = []
+                for ship, length, row, column, orientation in self.generate():
+                    index = self.validator.placement_index(length)
+                    layout.append(index.mask(index.position(row, column, orientation)))
+                yield tuple(layout)
+
@@ -0,0 +1,171 @@
+class GameEvent:
+    """Base class of everything a game publishes; subscribe to it to receive every event"""
+
+class ShotFired(GameEvent):
+    """A player fired at a cell; its Hit or Miss follows"""
+    def __init__(self, shooter, row, column):
+        """
+        Initializes the event.
+
+        Args:
+            shooter (BasePlayer): The player who fired.
+            row (int): The row of the shot.
+            column (int): The column of the shot.
+        """
+        self.shooter = shooter
+        self.row = row
+        self.column = column
+
+class ShotResult(GameEvent):
+    """Base class of Hit and Miss; subscribe to it to receive the outcome of every shot"""
+    hit = False
+    sunk_ship = None
+
+    def __init__(self, shooter, row, column):
+        """
+        Initializes the event.
+
+        Args:
+            shooter (BasePlayer): The player who fired.
+            row (int): The row of the shot.
+            column (int): The column of the shot.
+        """
+        self.shooter = shooter
+        self.row = row
+        self.column = column
+
+class Hit(ShotResult):
+    """A shot struck a ship; a Sunk follows if it was the ship's last cell"""
+    hit = True
+
+    def __init__(self, shooter, row, column, sunk_ship=None):
+        """
+        Initializes the event.
+
+        Args:
+            shooter (BasePlayer): The player who fired.
+            row (int): The row of the shot.
+            column (int): The column of the shot.
+            sunk_ship (str, optional): The name of the ship the shot sank.
+        """
+        super().__init__(shooter, row, column)
+        self.sunk_ship = sunk_ship
+
+class Miss(ShotResult):
+    """A shot landed in open water"""
+
+class Sunk(GameEvent):
+    """A shot sank a ship; a GameOver follows if it was the last one afloat"""
+    def __init__(self, shooter, ship, row, column):
+        """
+        Initializes the event.
+
+        Args:
+            shooter (BasePlayer): The player who sank the ship.
+            ship (str): The name of the ship.
+            row (int): The row of the final shot.
+            column (int): The column of the final shot.
+        """
+        self.shooter = shooter
+        self.ship = ship
+        self.row = row
+        self.column = column
+
+class GameOver(GameEvent):
+    """A player sank the whole opposing fleet"""
+    def __init__(self, winner, loser):
+        """
+        Initializes the event.
+
+        Args:
+            winner (BasePlayer): The player who won.
+            loser (BasePlayer): The player who lost.
+        """
+        self.winner = winner
+        self.loser = loser
+
+class EventBus:
+    """Delivers a game's events to the subscribers of their type or of a base type.
+
+    Events are only constructed when someone subscribed to them, and players
+    with no bus at all skip publishing entirely, so unobserved games such as
+    simulations pay nothing for them. Handlers run synchronously on the thread
+    that made the move."""
+    def __init__(self):
+        """Initializes a bus with no subscribers."""
+        self.handlers = {}  # Subscribed event class -> list of handlers
+        self.routes = {}  # Published event class -> handlers of it and its bases, rebuilt on demand
+
+    @staticmethod
+    def of(players):
+        """
+        Returns the bus a game's players publish to, connecting a new one if they have none.
+
+        Args:
+            players (list): The players of one game.
+
+        Returns:
+            EventBus: The shared bus.
+        """
+        bus = next((player.events for player in players if player.events is not None), None)
+        if bus is None:
+            bus = EventBus()
+        for player in players:
+            player.events = bus
+        return bus
+
+    def subscribe(self, event_type, handler):
+        """
+        Calls a handler with every event of a type, including its subclasses.
+
+        Args:
+            event_type (type): A GameEvent class, e.g. Hit, ShotResult or GameEvent.
+            handler (callable): Called as handler(event).
+        """
+        self.handlers.setdefault(event_type, []).append(handler)
+        self.routes.clear()
+
+    def unsubscribe(self, event_type, handler):
+        """
+        Stops calling a handler subscribed with `subscribe`.
+
+        Args:
+            event_type (type): The class the handler was subscribed to.
+            handler (callable): The handler.
+        """
+        handlers = self.handlers.get(event_type, [])
+        if handler in handlers:
+            handlers.remove(handler)
+            if not handlers:
+                del self.handlers[event_type]
+            self.routes.clear()
+
+    def route(self, event_type):
+        """
+        Lists the handlers an event type is delivered to.
+
+        Args:
+            event_type (type): A GameEvent class.
+
+        Returns:
+            tuple: The handlers subscribed to the class or any of its bases.
+        """
+        handlers = self.routes.get(event_type)
+        if handlers is None:
+            handlers = tuple(handler for base in event_type.__mro__ for handler in self.handlers.get(base, ()))
+            self.routes[event_type] = handlers
+        return handlers
+
+    def emit(self, event_type, *args):
+        """
+        Publishes an event, building it only if someone listens.
+
+        Args:
+            event_type (type): A GameEvent class.
+            *args: The arguments of the event's constructor.
+        """
+        handlers = self.route(event_type)
+        if handlers:
+            event = event_type(*args)
+            for handler in handlers:
+                handler(event)
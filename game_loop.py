@@ -26,10 +26,7 @@ class GameLoop:
                 current_player.take_turn(opponent)
 
             if opponent.ship_manager.all_ships_sunk():
-                print("\n*******************************************")
-                print(f"\033[1m       {current_player.name} has won the game!\033[0m")
-                print("*******************************************\n")
-                break
+                break  # The winning shot published GameOver
 
             self.current_player = 1 - self.current_player
             print('----------------------------------------------') 
\ No newline at end of file
@@ -0,0 +1,428 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import secrets
+import struct
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from battleship_config import GameConfig
+from coordinates import CoordinateCodec
+from game_setup import GameSetup
+from game_snapshot import GameSnapshot, SnapshotError
+import metrics
+
+class GameError(ValueError):
+    """Raised when a client request cannot be carried out"""
+
+class GameSession:
+    """One human-vs-AI match held by the server, from ship placement to game over"""
+    STATE = struct.Struct("<IIB")  # moves, ships still to place (bit per ship type), winner (0 none, 1 human, 2 computer)
+
+    def __init__(self, rng=None, snapshot=None, config=None):
+        """
+        Initializes the session with a fresh GameSetup and places the computer's fleet,
+        or resumes a saved session.
+
+        Args:
+            rng (random.Random, optional): Source of randomness for the computer's fleet and moves.
+            snapshot (bytes, optional): A snapshot made by `snapshot()` to resume instead.
+            config (GameConfig, optional): The game variant, which a snapshot must have been
+                saved with; defaults to config.json.
+
+        Raises:
+            SnapshotError: If the snapshot cannot be read.
+        """
+        self.rng = rng if rng is not None else random.Random()
+        self.setup = GameSetup(config)
+        self.config = self.setup.config
+        self.unplaced = list(self.config.ship_names)  # Human ships still to place
+        self.winner = None
+        self.moves = 0
+        if snapshot is not None:
+            # Client snapshots are untrusted: the seats must stay human, then computer
+            seats = [type(player) for player in self.setup.players]
+            self.setup.players, extra = GameSnapshot.loads(snapshot, self.config, seats)
+            if len(extra) != self.STATE.size:
+                raise SnapshotError("The snapshot holds no session state.")
+            self.moves, unplaced, winner = self.STATE.unpack(extra)
+            if unplaced >> len(self.config.ship_names) or winner > 2:
+                raise SnapshotError("Corrupt session state in the snapshot.")
+            self.unplaced = [ship for i, ship in enumerate(self.config.ship_names) if unplaced >> i & 1]
+            self.winner = (None, "Player", "Computer")[winner]
+        self.human, self.computer = self.setup.players
+        for player in self.setup.players:
+            player.set_gui_mode(True)  # Sessions never print to the server console
+        self.computer.rng = self.rng
+        if snapshot is None:
+            self.setup.deploy_random_fleet(self.computer, self.rng)
+
+    def snapshot(self):
+        """
+        Saves the session, including the computer's targeting state, in the binary snapshot format.
+
+        Returns:
+            bytes: The snapshot.
+        """
+        unplaced = sum(1 << i for i, ship in enumerate(self.config.ship_names) if ship in self.unplaced)
+        winner = (None, "Player", "Computer").index(self.winner)
+        return GameSnapshot.dumps(self.setup.players, self.STATE.pack(self.moves, unplaced, winner))
+
+    @property
+    def phase(self):
+        """str: 'placement', 'playing' or 'over'."""
+        if self.winner:
+            return "over"
+        return "placement" if self.unplaced else "playing"
+
+    def place_ship(self, ship, position, orientation):
+        """
+        Places one of the human player's ships.
+
+        Args:
+            ship (str): The name of the ship.
+            position (str): The starting position, e.g. 'A2'.
+            orientation (str): 'H' for horizontal or 'V' for vertical.
+
+        Raises:
+            GameError: If the ship cannot be placed there.
+        """
+        if ship not in self.unplaced:
+            raise GameError(f"No {ship} left to place.")
+        orientation = str(orientation).upper()
+        if orientation not in ("H", "V"):
+            raise GameError("Invalid orientation. Please enter 'H' for Horizontal or 'V' for Vertical.")
+        row, column = CoordinateCodec.parse_position(position, self.config.board_size)
+        length = self.config.ship_types[ship]
+        if not self.human.validator.validate_placement(length, row, column, orientation):
+            raise GameError("The ship cannot be placed at this position due to size constraints.")
+        if self.human.validator.check_overlap(self.human.ship_manager.grid, row, column, orientation, length):
+            raise GameError("A ship is already placed at this position. Please enter another location.")
+        self.human.ship_manager.deploy_ship(ship, length, row, column, orientation)
+        self.unplaced.remove(ship)
+
+    def place_random_fleet(self):
+        """
+        Places all of the human player's remaining ships at random.
+
+        Raises:
+            GameError: If some ships were already placed by hand.
+        """
+        if len(self.unplaced) != len(self.config.ship_names):
+            raise GameError("Some ships were already placed by hand.")
+        self.setup.deploy_random_fleet(self.human, self.rng)
+        self.unplaced = []
+
+    def fire(self, position):
+        """
+        Fires the human player's shot and, unless that wins the game, plays the computer's reply.
+
+        Args:
+            position (str): The position to attack, e.g. 'B6'.
+
+        Returns:
+            dict: The outcome of the shot and of the computer's reply.
+
+        Raises:
+            GameError: If the game is not in progress or the cell was already attacked.
+        """
+        if self.phase != "playing":
+            raise GameError(f"Cannot fire during {self.phase}.")
+        row, column = CoordinateCodec.parse_position(position, self.config.board_size)
+        if self.human.attack_board.is_attacked(row, column):
+            raise GameError("You already attacked this position.")
+        hit, sunk_ship = self.human.fire(self.computer, row, column)
+        self.moves += 1
+        result = {"result": "hit" if hit else "miss", "sunk": sunk_ship, "reply": None}
+        if self.computer.ship_manager.all_ships_sunk():
+            self.winner = self.human.name
+        else:
+            self.computer.take_turn(self.human)
+            self.moves += 1
+            result["reply"] = {
+                "position": CoordinateCodec.format_position(*self.computer.last_move),
+                "result": "hit" if self.computer.last_move_hit else "miss",
+                "sunk": self.computer.last_move_sunk,
+            }
+            if self.human.ship_manager.all_ships_sunk():
+                self.winner = self.computer.name
+        result["winner"] = self.winner
+        return result
+
+    def state(self):
+        """
+        Describes the session for a client.
+
+        Returns:
+            dict: The phase, ships left to place, winner and both of the human player's boards.
+        """
+        return {
+            "phase": self.phase,
+            "unplaced": self.unplaced,
+            "winner": self.winner,
+            "moves": self.moves,
+            "ships": ["".join(row) for row in self.human.ship_manager.grid],
+            "attacks": ["".join(row) for row in self.human.attack_board.grid],
+        }
+
+class GameServer:
+    """Hosts many concurrent matches over TCP, one JSON request and one JSON reply per line.
+
+    Requests look like {"cmd": "fire", "game": 3, "position": "B6"}; an optional
+    "id" is echoed back. Commands: new_game, place_ship, random_fleet, fire,
+    state, snapshot and close; new_game with a "snapshot" token from the
+    snapshot command resumes that saved game, and with a "config" such as
+    {"board_size": 20, "ships": {"Carrier": 5}} plays that variant instead of
+    config.json. Saved games stay on the server, as they hold the computer's
+    fleet. Replies carry "ok" and either the result or an "error"."""
+    MAX_BOARD_SIZE = 256  # Largest board a client may ask for
+    MAX_SNAPSHOTS = 4096  # Saved games kept for resuming, oldest dropped first
+    MOVE_TIMEOUT = 30  # Seconds a request may wait for its move thread before it is answered with an error
+
+    def __init__(self, host="127.0.0.1", port=8765, ai_workers=4):
+        """
+        Initializes the server.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on, 0 for any free port.
+            ai_workers (int): Threads that run game moves off the event loop.
+        """
+        self.host = host
+        self.port = port
+        self.sessions = {}  # Game id -> GameSession
+        self.locks = {}  # Game id -> asyncio.Lock, so one game's moves never overlap
+        self.game_ids = itertools.count(1)
+        self.snapshots = OrderedDict()  # Token -> (GameConfig, snapshot bytes) of saved games
+        self.executor = ThreadPoolExecutor(max_workers=ai_workers, thread_name_prefix="battleship-ai")
+        self.server = None
+
+    async def start(self):
+        """
+        Starts listening.
+
+        Returns:
+            int: The port the server listens on.
+        """
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port,
+                                                 limit=1 << 16, backlog=4096)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        """Starts the server and handles clients until cancelled."""
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        """Stops accepting clients and shuts the move threads down."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+    async def handle_client(self, reader, writer):
+        """
+        Answers one connection's requests in order; its games end when it disconnects.
+
+        Args:
+            reader (asyncio.StreamReader): The connection's input.
+            writer (asyncio.StreamWriter): The connection's output.
+        """
+        owned = set()  # Games created over this connection
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = await self.dispatch(line, owned)
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass  # Dropped connection or an oversized line: just end the session
+        finally:
+            for game in owned:
+                self.sessions.pop(game, None)
+                self.locks.pop(game, None)
+            writer.close()
+
+    async def dispatch(self, line, owned):
+        """
+        Carries out one request.
+
+        Args:
+            line (bytes): The JSON request.
+            owned (set): Games created over the requesting connection.
+
+        Returns:
+            dict: The reply.
+        """
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise GameError("A request must be a JSON object.")
+            request_id = request.get("id")
+            reply = await self.execute(request, owned)
+            reply["ok"] = True
+        except (GameError, ValueError, KeyError, TypeError) as e:
+            # ValueError covers malformed JSON and positions; KeyError missing fields
+            message = str(e).strip() if not isinstance(e, KeyError) else f"Missing field {e}."
+            reply = {"ok": False, "error": message}
+        except Exception as e:
+            # A bug in one request must not drop the connection and its games
+            reply = {"ok": False, "error": f"Internal error ({type(e).__name__})."}
+        if request_id is not None:
+            reply["id"] = request_id
+        return reply
+
+    async def run_move(self, function, *args):
+        """
+        Runs game work, such as placing a fleet or the computer's reply, on a move thread,
+        keeping the event loop free for every other game.
+
+        Args:
+            function (callable): The work to run.
+            *args: Arguments for `function`.
+
+        Returns:
+            object: What `function` returns.
+
+        Raises:
+            GameError: If the work takes longer than MOVE_TIMEOUT seconds.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(self.executor, function, *args), self.MOVE_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise GameError("The server took too long to carry out this request.")
+
+    @staticmethod
+    def text_field(request, name, default=None):
+        """
+        Reads a field that must be a string, such as a position.
+
+        Args:
+            request (dict): The request.
+            name (str): The field.
+            default (str, optional): The value when the field is missing; by default it is required.
+
+        Returns:
+            str: The field's value.
+
+        Raises:
+            KeyError: If a required field is missing.
+            GameError: If the field is not a string.
+        """
+        value = request[name] if default is None else request.get(name, default)
+        if not isinstance(value, str):
+            raise GameError(f"Field '{name}' must be a string.")
+        return value
+
+    async def execute(self, request, owned):
+        """
+        Runs a parsed request against its game.
+
+        Args:
+            request (dict): The request.
+            owned (set): Games created over the requesting connection.
+
+        Returns:
+            dict: The result of the command.
+
+        Raises:
+            GameError: If the command or game is unknown or the move is not allowed.
+        """
+        command = request.get("cmd")
+        if command == "new_game":
+            seed = request.get("seed")
+            snapshot = self.text_field(request, "snapshot", "") or None
+            config = request.get("config")
+            if snapshot is not None:
+                # A saved game resumes with the variant it was saved with
+                config, snapshot = self.snapshots.get(snapshot, (None, None))
+                if snapshot is None:
+                    raise GameError("Unknown snapshot.")
+            elif config is not None:
+                config = GameConfig.from_dict(config)
+                if config.board_size > self.MAX_BOARD_SIZE:
+                    raise GameError(f"Boards are limited to {self.MAX_BOARD_SIZE} rows and columns.")
+                # Fleets up to half the board place in milliseconds; crowded ones can take minutes
+                if config.fleet_cells * 2 > config.board_size * config.board_size:
+                    raise GameError("A fleet may cover at most half of the board.")
+                # Games of the same variant share one config and its derived tables; rejected ones never take a slot
+                config = GameConfig.intern(config)
+            # Placing the computer's fleet is a search: keep the loop free
+            session = await self.run_move(GameSession, random.Random(seed) if seed is not None else None,
+                                          snapshot, config)
+            if request.get("random_fleet") and snapshot is None:
+                await self.run_move(session.place_random_fleet)
+            game = next(self.game_ids)
+            self.sessions[game] = session
+            self.locks[game] = asyncio.Lock()
+            owned.add(game)
+            return {"game": game, "phase": session.phase}
+
+        game = request["game"]
+        # Only the connection that created a game may use it: ids are sequential and easy to guess
+        session = self.sessions.get(game) if game in owned else None
+        if session is None:
+            raise GameError(f"Unknown game {game}.")
+        async with self.locks[game]:
+            if command == "fire":
+                # The computer's reply can take a while on big boards: keep the loop free
+                return await self.run_move(session.fire, self.text_field(request, "position"))
+            if command == "place_ship":
+                await self.run_move(session.place_ship, self.text_field(request, "ship"),
+                                    self.text_field(request, "position"), self.text_field(request, "orientation", "H"))
+                return {"phase": session.phase}
+            if command == "random_fleet":
+                await self.run_move(session.place_random_fleet)
+                return {"phase": session.phase}
+            if command == "state":
+                return session.state()
+            if command == "snapshot":
+                # The snapshot holds the computer's fleet: clients only get a token to resume it with
+                token = secrets.token_urlsafe(16)
+                self.snapshots[token] = (session.config, session.snapshot())
+                if len(self.snapshots) > self.MAX_SNAPSHOTS:
+                    self.snapshots.popitem(last=False)
+                return {"snapshot": token}
+            if command == "close":
+                self.sessions.pop(game, None)
+                self.locks.pop(game, None)
+                owned.discard(game)
+                return {}
+        raise GameError(f"Unknown command {command!r}.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Host human-vs-AI Battleship matches over TCP.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on (0 for any free port)")
+    parser.add_argument("--ai-workers", type=int, default=4, help="threads running game moves")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="time hot paths and serve them at http://HOST:PORT/metrics (Prometheus) "
+                             "and /metrics.json")
+    args = parser.parse_args()
+
+    if args.metrics_port is not None:
+        metrics.enable()
+        metrics_server = metrics.serve(args.metrics_port, args.host)
+        print(f"Metrics on http://{args.host}:{metrics_server.server_address[1]}/metrics", flush=True)
+
+    async def run():
+        server = GameServer(args.host, args.port, args.ai_workers)
+        port = await server.start()
+        print(f"Listening on {args.host}:{port}", flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
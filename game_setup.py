@@ -1,14 +1,25 @@
 import random
 from human_player import HumanPlayer
 from computer_player import ComputerPlayer
-from battleship_config import BOARD_SIZE, SHIP_TYPES, LETTERS_TO_NUMS
+from fleet_generator import FleetGenerator
+from coordinates import CoordinateCodec
+from battleship_config import DEFAULT_CONFIG
+import metrics
 
 class GameSetup:
     """Handles game initialization and ship placement"""
-    def __init__(self):
-        """Initializes the GameSetup with human and computer players"""
-        self.players = [HumanPlayer(), ComputerPlayer()]
+    def __init__(self, config=None):
+        """
+        Initializes the GameSetup with human and computer players.
+
+        Args:
+            config (GameConfig, optional): The game variant, shared by both players; defaults to config.json.
+        """
+        self.config = config if config is not None else DEFAULT_CONFIG
+        self.players = [HumanPlayer(self.config), ComputerPlayer(config=self.config)]
+        metrics.watch(self.players)
 
+    @metrics.timed
     def deploy_all_ships(self, player):
         """
         Manages the ship deployment phase for each player.
@@ -16,31 +27,39 @@ class GameSetup:
         Args:
             player (BasePlayer): The player for whom to deploy ships.
         """
-        if player.name == "Player":
-            print("\n\033[1m       Place Your Ships\033[0m")
-            print("----------------------------------------\n")
+        if player.name == "Computer":
+            self.deploy_random_fleet(player)
+            print('===============================================')
+            return
 
-        for ship, length in SHIP_TYPES.items():
-            if player.name == "Player":
-                print(f"Place the {ship} (length: {length})")
-                print("----------------------------------------")
+        print("\n\033[1m       Place Your Ships\033[0m")
+        print("----------------------------------------\n")
+
+        for ship, length in self.config.ship_types.items():
+            print(f"Place the {ship} (length: {length})")
+            print("----------------------------------------")
             
             while True:
-                if player.name == "Computer":
-                    orientation = random.choice(["H", "V"])
-                    row = random.randint(0, BOARD_SIZE - 1)
-                    column = random.randint(0, BOARD_SIZE - 1)
-                else:
-                    row, column, orientation = self.get_user_input(True, length, player)
+                row, column, orientation = self.get_user_input(True, length, player)
                 if player.validator.validate_placement(length, row, column, orientation):
                     if not player.validator.check_overlap(player.ship_manager.grid, row, column, orientation, length):
                         player.ship_manager.deploy_ship(ship, length, row, column, orientation)
-                        if player.name != "Computer":
-                            player.display.display_board(player.ship_manager.grid)
-                            print("----------------------------------------\n")
+                        player.display.display_board(player.ship_manager.grid)
+                        print("----------------------------------------\n")
                         break
-        if player.name == "Computer":
-            print('===============================================')
+
+    def deploy_random_fleet(self, player, rng=random):
+        """
+        Places the whole fleet at random positions without any console output.
+
+        Args:
+            player (BasePlayer): The player whose ships are placed.
+            rng (random.Random, optional): Source of randomness, for reproducible games.
+
+        Raises:
+            FleetPlacementError: If the fleet cannot fit on the board.
+        """
+        FleetGenerator(player.validator, player.config.ship_types, rng).deploy(player.ship_manager)
 
     def get_user_input(self, place_ship, ship_length=None, player=None):
         """
@@ -66,12 +85,7 @@ class GameSetup:
             while True:
                 try:
                     position = input("Enter the position (e.g., A2): ").upper()
-                    if len(position) < 2 or position[0] not in 'ABCDEFGH' or not position[1:].isdigit():
-                        raise ValueError("Invalid position. Please enter a valid position (e.g., A2).\n")
-                    column = LETTERS_TO_NUMS[position[0]]
-                    row = int(position[1:]) - 1
-                    if row < 0 or row >= BOARD_SIZE or column < 0 or column >= BOARD_SIZE:
-                        raise ValueError("Position out of bounds. Please enter a valid position within the grid.\n")
+                    row, column = CoordinateCodec.parse_position(position, self.config.board_size)
                     if ship_length and not player.validator.validate_placement(ship_length, row, column, orientation):
                         raise ValueError("The ship cannot be placed at this position due to size constraints.\n")
                     if player and player.validator.check_overlap(player.ship_manager.grid, row, column, orientation, ship_length):
@@ -84,12 +98,7 @@ class GameSetup:
             while True:
                 try:
                     position = input("Enter the position (e.g., A2): ").upper()
-                    if len(position) < 2 or position[0] not in 'ABCDEFGH' or not position[1:].isdigit():
-                        raise ValueError("Invalid position. Please enter a valid position (e.g., A2).\n")
-                    column = LETTERS_TO_NUMS[position[0]]
-                    row = int(position[1:]) - 1
-                    if row < 0 or row >= BOARD_SIZE or column < 0 or column >= BOARD_SIZE:
-                        raise ValueError("Position out of bounds. Please enter a valid position within the grid.\n")
+                    row, column = CoordinateCodec.parse_position(position, self.config.board_size)
                     break
                 except ValueError as e:
                     print(e)
@@ -0,0 +1,264 @@
+import math
+import struct
+from array import array
+from battleship_config import DEFAULT_CONFIG
+from computer_player import ComputerPlayer
+from human_player import HumanPlayer
+from ship_manager import SparseShipManager
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot is malformed or was written for another board or fleet"""
+
+class GameSnapshot:
+    """Versioned binary snapshots of a game's players, built from packed bitboards.
+
+    Layout (little-endian): a fixed header, then per player a fixed record, its
+    five boards, its ships and, for the computer, its targeting state; any extra
+    bytes from the caller come last. Boards are stored as length-prefixed
+    bitboards, or as sorted cell numbers on the sparse backend. The probability
+    map is not stored: it is rebuilt from the shots before each computer move."""
+    MAGIC = b"BSNP"
+    VERSION = 1
+    HEADER = struct.Struct("<4sBHHBB")  # magic, version, board size, fleet cells, ship types, players
+    PLAYER = struct.Struct("<BBB")  # kind (0 human, 1 computer), flags, ship count
+    SHIP = struct.Struct("<BHHB")  # ship type, row, column, orientation (0 H, 1 V)
+    AI = struct.Struct("<hhBhhBBIdH")  # last hit, direction, last move, last move hit, last move sunk,
+    # sunk ships (bit per ship type), time budget (NaN for none), hit stack length
+    MASK_LENGTH = struct.Struct("<BI")  # encoding (0 bitboard, 1 cell list), byte or cell count
+    GUI_MODE = 1  # Player flag bits
+    INCREMENTAL = 2
+    NO_SHIP = 255
+
+    @staticmethod
+    def _pack_board(parts, cells, sparse):
+        """Appends one board, given as a bitboard or as a set of cell numbers."""
+        if sparse:
+            packed = array("Q", sorted(cells)).tobytes()
+            parts.append(GameSnapshot.MASK_LENGTH.pack(1, len(cells)))
+        else:
+            packed = cells.to_bytes((cells.bit_length() + 7) // 8, "little")
+            parts.append(GameSnapshot.MASK_LENGTH.pack(0, len(packed)))
+        parts.append(packed)
+
+    @staticmethod
+    def _unpack_board(view, offset, size):
+        """Reads one board of a size x size game; returns (bitboard or None, set of cells or None, new offset)."""
+        encoding, count = GameSnapshot.MASK_LENGTH.unpack_from(view, offset)
+        offset += GameSnapshot.MASK_LENGTH.size
+        end = offset + (count if encoding == 0 else 8 * count)
+        if encoding > 1 or end > len(view):
+            raise SnapshotError("Truncated or corrupt board in the snapshot.")
+        if encoding == 0:
+            mask = int.from_bytes(view[offset:end], "little")
+            if mask.bit_length() > size * size:
+                raise SnapshotError("A board in the snapshot has cells outside the board.")
+            return mask, None, end
+        cells = array("Q")
+        cells.frombytes(view[offset:end])
+        if cells and max(cells) >= size * size:
+            raise SnapshotError("A board in the snapshot has cells outside the board.")
+        return None, set(cells), end
+
+    @staticmethod
+    def _pack_boards(parts, player):
+        """Appends the ship, hit and miss boards of a player's fleet and its attack board."""
+        for board, fields in ((player.ship_manager, ("ship", "hit", "miss")), (player.attack_board, ("hit", "miss"))):
+            sparse = isinstance(board, SparseShipManager)
+            for field in fields:
+                cells = getattr(board, f"{field}_cells") if sparse else getattr(board, f"{field}_mask")
+                GameSnapshot._pack_board(parts, cells, sparse)
+
+    @staticmethod
+    def _restore_board(board, field, mask, cells):
+        """Stores a board read from a snapshot on whichever backend the player uses."""
+        if isinstance(board, SparseShipManager):
+            setattr(board, f"{field}_cells", cells if cells is not None else SparseShipManager.mask_to_cells(mask))
+        else:
+            setattr(board, f"{field}_mask", mask if mask is not None else SparseShipManager.cells_to_mask(cells))
+
+    @staticmethod
+    def _board_field(board, field):
+        """Returns one of a board's fields as its backend stores it: a set of cells or a bitboard."""
+        return getattr(board, f"{field}_cells" if isinstance(board, SparseShipManager) else f"{field}_mask")
+
+    @staticmethod
+    def dumps(players, extra=b""):
+        """
+        Serializes the players of a game.
+
+        Args:
+            players (list): The HumanPlayer and/or ComputerPlayer objects, in turn order,
+                all sharing one game config.
+            extra (bytes): Caller data stored after the players, e.g. session counters.
+
+        Returns:
+            bytes: The snapshot.
+        """
+        config = players[0].config if players else DEFAULT_CONFIG
+        ship_ids = config.ship_ids
+        parts = [GameSnapshot.HEADER.pack(GameSnapshot.MAGIC, GameSnapshot.VERSION, config.board_size,
+                                          config.fleet_cells, len(ship_ids), len(players))]
+        for player in players:
+            computer = isinstance(player, ComputerPlayer)
+            flags = GameSnapshot.GUI_MODE if player.gui_mode else 0
+            if computer and player.tracker is not None:
+                flags |= GameSnapshot.INCREMENTAL
+            ships = player.ship_manager.ship_locations
+            parts.append(GameSnapshot.PLAYER.pack(int(computer), flags, len(ships)))
+            GameSnapshot._pack_boards(parts, player)
+            for ship, cells in ships.items():
+                (row, column), vertical = cells[0], len(cells) > 1 and cells[1][1] == cells[0][1]
+                parts.append(GameSnapshot.SHIP.pack(ship_ids[ship], row, column, int(vertical)))
+            if computer:
+                last_hit = player.last_hit or (-1, -1)
+                last_move = player.last_move or (-1, -1)
+                sunk = 0
+                for ship in player.sunk_ships:
+                    sunk |= 1 << ship_ids[ship]
+                parts.append(GameSnapshot.AI.pack(
+                    last_hit[0], last_hit[1], " HV".index(player.direction or " "),
+                    last_move[0], last_move[1], int(player.last_move_hit),
+                    ship_ids[player.last_move_sunk] if player.last_move_sunk else GameSnapshot.NO_SHIP,
+                    sunk, math.nan if player.time_budget is None else player.time_budget, len(player.hit_stack)))
+                parts.append(array("h", [value for move in player.hit_stack for value in move]).tobytes())
+                if player.targeter is not None:
+                    GameSnapshot._pack_board(parts, player.targeter.resolved_mask, False)
+        parts.append(extra)
+        return b"".join(parts)
+
+    @staticmethod
+    def loads(data, config=None, seats=None):
+        """
+        Restores the players of a game.
+
+        Args:
+            data (bytes): A snapshot made by `dumps`.
+            config (GameConfig, optional): The game variant the snapshot was saved with; defaults to config.json.
+            seats (list, optional): The player class each seat must hold, e.g. [HumanPlayer, ComputerPlayer];
+                snapshots from untrusted sources must be checked, as a HumanPlayer reads the console.
+
+        Returns:
+            tuple: (list of players, extra bytes).
+
+        Raises:
+            SnapshotError: If the snapshot is malformed or does not match the board and fleet of the
+                config or the seats.
+        """
+        config = config if config is not None else DEFAULT_CONFIG
+        view = memoryview(data)
+        try:
+            magic, version, size, fleet_cells, ship_types, count = GameSnapshot.HEADER.unpack_from(view, 0)
+            if magic != GameSnapshot.MAGIC or version != GameSnapshot.VERSION:
+                raise SnapshotError("Not a version 1 game snapshot.")
+            if size != config.board_size or fleet_cells != config.fleet_cells or ship_types != len(config.ship_names):
+                raise SnapshotError("The snapshot was saved with a different board or fleet.")
+            offset = GameSnapshot.HEADER.size
+            players = []
+            for _ in range(count):
+                player, offset = GameSnapshot._load_player(view, offset, config)
+                players.append(player)
+            if seats is not None and [type(player) for player in players] != list(seats):
+                raise SnapshotError("The snapshot's players do not match the game's seats.")
+            # Each player's hits are the hits on the other's fleet, and its misses miss that fleet
+            for player, opponent in zip(players, reversed(players)) if count == 2 else ():
+                field = GameSnapshot._board_field
+                if (field(player.attack_board, "hit") != field(opponent.ship_manager, "hit")
+                        or field(player.attack_board, "miss") & field(opponent.ship_manager, "ship")):
+                    raise SnapshotError("The snapshot's shots do not match the fleets they were fired at.")
+        except SnapshotError:
+            raise
+        except (struct.error, IndexError, ValueError) as e:
+            raise SnapshotError(f"Truncated or corrupt snapshot: {e}")
+        return players, bytes(view[offset:])
+
+    @staticmethod
+    def _load_player(view, offset, config):
+        """Reads one player record of a game played with `config`; returns (player, new offset).
+
+        Every field is checked against the board and fleet, so a snapshot that
+        loads always describes a game that can be played on to the end."""
+        ship_names = config.ship_names
+        size = config.board_size
+        kind, flags, ship_count = GameSnapshot.PLAYER.unpack_from(view, offset)
+        offset += GameSnapshot.PLAYER.size
+        if kind > 1 or ship_count > len(ship_names):
+            raise SnapshotError("Corrupt player record in the snapshot.")
+        boards = []
+        for _ in range(5):
+            mask, cells, offset = GameSnapshot._unpack_board(view, offset, size)
+            boards.append((mask, cells))
+        ships = []
+        for _ in range(ship_count):
+            ship = GameSnapshot.SHIP.unpack_from(view, offset)
+            offset += GameSnapshot.SHIP.size
+            if ship[0] >= len(ship_names) or ship[3] > 1 or any(ship[0] == other[0] for other in ships):
+                raise SnapshotError("Corrupt ship record in the snapshot.")
+            ships.append(ship)
+
+        ai = None
+        if kind:
+            ai = GameSnapshot.AI.unpack_from(view, offset)
+            offset += GameSnapshot.AI.size
+            last_row, last_column, direction, move_row, move_column, _, move_sunk, sunk, time_budget, moves = ai
+            stack = array("h")
+            stack.frombytes(view[offset:offset + 4 * moves])
+            offset += 4 * moves
+            if len(stack) != 2 * moves:
+                raise SnapshotError("Truncated targeting state in the snapshot.")
+            if (direction > 2 or sunk >> len(ship_names)
+                    or (move_sunk >= len(ship_names) and move_sunk != GameSnapshot.NO_SHIP)
+                    or any(not 0 <= value < size for value in stack)
+                    or any(not (0 <= row < size and 0 <= column < size) and (row, column) != (-1, -1)
+                           for row, column in ((last_row, last_column), (move_row, move_column)))
+                    or not (math.isnan(time_budget) or 0 <= time_budget < math.inf)):
+                raise SnapshotError("Corrupt targeting state in the snapshot.")
+            time_budget = None if math.isnan(time_budget) else time_budget
+            player = ComputerPlayer(incremental=bool(flags & GameSnapshot.INCREMENTAL), time_budget=time_budget,
+                                    config=config)
+        else:
+            player = HumanPlayer(config)
+        player.set_gui_mode(bool(flags & GameSnapshot.GUI_MODE))
+
+        fleet = player.ship_manager
+        for ship_type, row, column, vertical in ships:
+            ship = ship_names[ship_type]
+            orientation = "V" if vertical else "H"
+            if fleet.overlaps(row, column, orientation, config.ship_types[ship]):
+                raise SnapshotError("A ship in the snapshot lies outside the board or on another ship.")
+            fleet.deploy_ship(ship, config.ship_types[ship], row, column, orientation)
+        placed = GameSnapshot._board_field(fleet, "ship")
+        for (mask, cells), (board, field) in zip(boards, ((fleet, "ship"), (fleet, "hit"), (fleet, "miss"),
+                                                          (player.attack_board, "hit"),
+                                                          (player.attack_board, "miss"))):
+            GameSnapshot._restore_board(board, field, mask, cells)
+        ship_board, hits, misses = (GameSnapshot._board_field(fleet, field) for field in ("ship", "hit", "miss"))
+        if ship_board != placed:
+            raise SnapshotError("The snapshot's ship board does not match its ships.")
+        if (hits & ship_board != hits or misses & ship_board
+                or GameSnapshot._board_field(player.attack_board, "hit")
+                & GameSnapshot._board_field(player.attack_board, "miss")):
+            raise SnapshotError("The snapshot's hits and misses contradict each other or the ships.")
+        # Health follows from the hits on each ship's cells
+        for ship, cells in fleet.ship_locations.items():
+            fleet.ship_health[ship] = sum(not fleet.is_attacked(row, column) for row, column in cells)
+        fleet.ships_afloat = sum(1 for health in fleet.ship_health.values() if health)
+
+        if ai is not None:
+            last_row, last_column, direction, move_row, move_column, move_hit, move_sunk, sunk, _, _ = ai
+            player.last_hit = (last_row, last_column) if last_row >= 0 else None
+            player.direction = " HV"[direction].strip() or None
+            player.last_move = (move_row, move_column) if move_row >= 0 else None
+            player.last_move_hit = bool(move_hit)
+            player.last_move_sunk = ship_names[move_sunk] if move_sunk != GameSnapshot.NO_SHIP else None
+            player.hit_stack = list(zip(stack[0::2], stack[1::2]))
+            player.sunk_ships = [ship for i, ship in enumerate(ship_names) if sunk >> i & 1]
+            if player.tracker is not None:
+                player.tracker.sync(player.attack_board.attacked_mask)
+                for ship in player.sunk_ships:
+                    player.tracker.ship_sunk(config.ship_types[ship])
+            if player.targeter is not None:
+                resolved, _, offset = GameSnapshot._unpack_board(view, offset, size)
+                if resolved is None:
+                    raise SnapshotError("Corrupt targeting state in the snapshot.")
+                player.targeter.resolved_mask = resolved
+        return player, offset
@@ -1,16 +1,25 @@
 import tkinter as tk
 from tkinter import ttk
-from battleship_config import BOARD_SIZE
+from battleship_config import DEFAULT_CONFIG
 
 class GameDisplay:
     """Handles all game UI elements"""
-    def __init__(self, parent):
+    MAX_BUTTON_SIZE = 16  # Larger boards are drawn on canvases instead of button grids
+    CELL_STYLES = {"empty": "TButton", "ship": "Ship.TButton", "hit": "Hit.TButton", "miss": "Miss.TButton"}
+
+    def __init__(self, parent, config=None):
         """
         Initializes the game display.
 
         Args:
             parent (tk.Tk or tk.Toplevel): The parent window.
+            config (GameConfig, optional): The game variant whose boards are shown; defaults to config.json.
         """
+        self.config = config if config is not None else DEFAULT_CONFIG
+        self.size = self.config.board_size
+        self.boards = {}  # Board name ('placement', 'player', 'computer') -> its cells
+        self.marked = {"placement": set(), "player": set(), "computer": set()}  # Cells not shown as empty
+
         # Setup phase frame
         self.setup_frame = ttk.Frame(parent, padding="10")
         self.setup_frame.grid(row=0, column=0)
@@ -30,26 +39,27 @@ class GameDisplay:
         placement_frame = ttk.LabelFrame(self.setup_frame, text="Place Your Ships")
         placement_frame.grid(row=0, column=0, padx=5, pady=5)
         
-        # Add column headers (A-H)
-        for j in range(BOARD_SIZE):
-            col_label = ttk.Label(placement_frame, text=chr(65 + j), width=3)
+        # Add column headers (A, B, ... AA, AB, ...)
+        for j in range(self.size):
+            col_label = ttk.Label(placement_frame, text=self.config.column_labels[j], width=3)
             col_label.grid(row=0, column=j+1, padx=1, pady=1)
         
-        # Add row headers (1-8)
-        for i in range(BOARD_SIZE):
+        # Add row headers (1, 2, ...)
+        for i in range(self.size):
             row_label = ttk.Label(placement_frame, text=str(i+1))
             row_label.grid(row=i+1, column=0, padx=1, pady=1)
         
         # Create placement buttons
         self.placement_buttons = [[
             ttk.Button(placement_frame, width=3)
-            for _ in range(BOARD_SIZE)
-        ] for _ in range(BOARD_SIZE)]
+            for _ in range(self.size)
+        ] for _ in range(self.size)]
         
         # Position all buttons in the grid
         for i, row in enumerate(self.placement_buttons):
             for j, btn in enumerate(row):
                 btn.grid(row=i+1, column=j+1, padx=1, pady=1)
+        self.boards["placement"] = self.placement_buttons
 
     def create_setup_controls(self):
         """Creates the controls for the setup phase"""
@@ -75,48 +85,54 @@ class GameDisplay:
         player_frame = ttk.LabelFrame(self.game_frame, text="Your Guesses")
         player_frame.grid(row=0, column=0, padx=5)
         
-        # Add column headers (A-H)
-        for j in range(BOARD_SIZE):
-            col_label = ttk.Label(player_frame, text=chr(65 + j), width=3)
+        # Add column headers (A, B, ... AA, AB, ...)
+        for j in range(self.size):
+            col_label = ttk.Label(player_frame, text=self.config.column_labels[j], width=3)
             col_label.grid(row=0, column=j+1, padx=1, pady=1)
         
-        # Add row headers (1-8)
-        for i in range(BOARD_SIZE):
+        # Add row headers (1, 2, ...)
+        for i in range(self.size):
             row_label = ttk.Label(player_frame, text=str(i+1))
             row_label.grid(row=i+1, column=0, padx=1, pady=1)
         
         # Create the player buttons
         self.player_buttons = [[
             ttk.Button(player_frame, width=3)
-            for _ in range(BOARD_SIZE)
-        ] for _ in range(BOARD_SIZE)]
+            for _ in range(self.size)
+        ] for _ in range(self.size)]
         
         # Computer's board
         computer_frame = ttk.LabelFrame(self.game_frame, text="Computer's Guesses")
         computer_frame.grid(row=0, column=1, padx=5)
         
-        # Add column headers (A-H)
-        for j in range(BOARD_SIZE):
-            col_label = ttk.Label(computer_frame, text=chr(65 + j), width=3)
+        # Add column headers (A, B, ... AA, AB, ...)
+        for j in range(self.size):
+            col_label = ttk.Label(computer_frame, text=self.config.column_labels[j], width=3)
             col_label.grid(row=0, column=j+1, padx=1, pady=1)
         
-        # Add row headers (1-8)
-        for i in range(BOARD_SIZE):
+        # Add row headers (1, 2, ...)
+        for i in range(self.size):
             row_label = ttk.Label(computer_frame, text=str(i+1))
             row_label.grid(row=i+1, column=0, padx=1, pady=1)
         
         # Create the computer buttons
         self.computer_buttons = [[
             ttk.Button(computer_frame, width=3)
-            for _ in range(BOARD_SIZE)
-        ] for _ in range(BOARD_SIZE)]
+            for _ in range(self.size)
+        ] for _ in range(self.size)]
         
         # Position all buttons in the grid
-        for i in range(BOARD_SIZE):
-            for j in range(BOARD_SIZE):
+        for i in range(self.size):
+            for j in range(self.size):
                 self.player_buttons[i][j].grid(row=i+1, column=j+1, padx=1, pady=1)
                 self.computer_buttons[i][j].grid(row=i+1, column=j+1, padx=1, pady=1)
-        
+        self.boards["player"] = self.player_buttons
+        self.boards["computer"] = self.computer_buttons
+
+        self.create_message_area()
+
+    def create_message_area(self):
+        """Creates the message area below the game boards."""
         # Create a message frame with border
         message_frame = ttk.Frame(self.game_frame, padding=10, relief="groove", borderwidth=2)
         message_frame.grid(row=1, column=0, columnspan=2, pady=10, sticky="ew")
@@ -133,4 +149,62 @@ class GameDisplay:
             justify="center",
             font=('Arial', 11)
         )
-        self.game_message.pack(fill="both", expand=True) 
\ No newline at end of file
+        self.game_message.pack(fill="both", expand=True) 
+
+    def bind_board(self, board, command):
+        """
+        Calls a function with the row and column of every click on a board.
+
+        Args:
+            board (str): 'placement', 'player' or 'computer'.
+            command (callable): Called as command(row, column).
+        """
+        for i, row in enumerate(self.boards[board]):
+            for j, button in enumerate(row):
+                button.configure(command=lambda x=i, y=j: command(x, y))
+
+    def set_cell(self, board, row, column, state):
+        """
+        Shows the state of one cell.
+
+        Args:
+            board (str): 'placement', 'player' or 'computer'.
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+            state (str): 'empty', 'ship', 'hit' or 'miss'.
+        """
+        self.boards[board][row][column].config(style=self.CELL_STYLES[state])
+        if state == "empty":
+            self.marked[board].discard((row, column))
+        else:
+            self.marked[board].add((row, column))
+
+    def clear_boards(self):
+        """Shows every marked cell as empty again."""
+        for board, cells in self.marked.items():
+            for row, column in cells:
+                self.boards[board][row][column].config(style=self.CELL_STYLES["empty"])
+            cells.clear()
+
+    def reset(self):
+        """
+        Returns to an empty placement phase for a new game, keeping every widget
+        and its bindings instead of building the display again.
+        """
+        self.clear_boards()
+        self.orientation.set("H")
+        self.message_label.config(text="Place your ships")
+        self.start_button.config(state='disabled')
+        self.game_message.config(text="", style='TLabel', font=('Arial', 11), foreground='')
+        self.set_busy(False)
+        self.game_frame.grid_remove()
+        self.setup_frame.grid()
+
+    def set_busy(self, busy):
+        """
+        Shows or clears the busy state of the game boards while the computer thinks.
+
+        Args:
+            busy (bool): True while the computer is choosing its move.
+        """
+        self.game_frame.configure(cursor="watch" if busy else "")
@@ -1,20 +1,37 @@
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk
 from game_setup import GameSetup
-from battleship_config import SHIP_TYPES, BOARD_SIZE
+from battleship_config import DEFAULT_CONFIG
 from window_manager import WindowManager
 from gui_display import GameDisplay
+from canvas_display import CanvasGameDisplay
+from game_events import EventBus, ShotResult
+from metrics import timed
 
 class BattleshipGUI:
     """Main game coordinator for GUI version"""
-    def __init__(self, root):
+    CELL_STATES = {"X": "hit", "-": "miss", " ": "empty"}  # Attack board character -> cell state
+    POLL_MS = 15  # How often the Tk loop checks for the computer's finished move
+
+    def __init__(self, root, recorder=None, renderer=None, config=None):
         """
         Initializes the Battleship GUI.
 
         Args:
             root (tk.Tk): The root window.
+            recorder (ReplayRecorder, optional): Replay log receiving every shot of every game.
+            renderer (str, optional): 'buttons' for a grid of buttons per board or 'canvas'
+                for one canvas per board. Defaults to canvases on boards too large for buttons.
+            config (GameConfig, optional): The game variant to play; defaults to config.json.
         """
         self.root = root
+        self.recorder = recorder
+        self.config = config if config is not None else DEFAULT_CONFIG
+        if renderer is None:
+            renderer = "canvas" if self.config.board_size > GameDisplay.MAX_BUTTON_SIZE else "buttons"
+        self.display_class = CanvasGameDisplay if renderer == "canvas" else GameDisplay
         self.root.title("Battleship")
         
         WindowManager.center_window(self.root)
@@ -24,39 +41,57 @@ class BattleshipGUI:
 
     def setup_new_game(self):
         """Sets up a new game."""
-        self.setup = GameSetup()
+        self.setup = GameSetup(self.config)
         self.players = self.setup.players
         
         # Set GUI mode for both players
         for player in self.players:
             if hasattr(player, 'set_gui_mode'):
                 player.set_gui_mode(True)
+        # Every shot marks its cell for the next redraw, whichever thread fired it
+        EventBus.of(self.players).subscribe(ShotResult, self.on_shot)
             
-        self.display = GameDisplay(self.root)
-        
-        # Set up placement phase
-        self.current_ship_index = 0
-        self.ships_to_place = list(SHIP_TYPES.items())
+        self.display = self.display_class(self.root, self.config)
         
         # Bind events
         self.bind_placement_buttons()
         self.bind_game_buttons()
         self.display.start_button.configure(command=self.start_game)
+        self.start_placement()
+
+    def reset_game(self):
+        """Starts a new game in place, reusing the players and every widget with its bindings."""
+        for player in self.players:
+            player.reset()
+        self.display.reset()
+        self.start_placement()
+
+    def start_placement(self):
+        """Resets the per-game state and starts the ship placement phase."""
+        if self.recorder is not None:
+            self.recorder.attach(self.players)
+
+        # Set up placement phase
+        self.current_ship_index = 0
+        self.ships_to_place = list(self.config.ship_types.items())
+
+        # Cells whose look changed since the last redraw, per board
+        self.dirty_cells = {"placement": set(), "player": set(), "computer": set()}
+        self.turn_updates = 0  # Cell updates issued during the current turn
+        self.last_turn_updates = 0  # Cell updates issued by the last complete turn
+
+        # The computer's moves run on a worker thread and come back through this queue
+        self.ai_results = queue.Queue()
+        self.input_locked = False  # True while the computer moves or its message is shown
+        self.thinking = False  # True while the board shows that the computer is thinking
 
     def bind_placement_buttons(self):
         """Binds the placement buttons to their respective commands."""
-        
-        for i in range(BOARD_SIZE):
-            for j in range(BOARD_SIZE):
-                self.display.placement_buttons[i][j].configure(
-                    command=lambda x=i, y=j: self.try_place_ship(x, y))
+        self.display.bind_board("placement", self.try_place_ship)
 
     def bind_game_buttons(self):
         """Binds the game buttons to their respective commands"""
-        for i in range(BOARD_SIZE):
-            for j in range(BOARD_SIZE):
-                self.display.player_buttons[i][j].configure(
-                    command=lambda x=i, y=j: self.make_move(x, y))
+        self.display.bind_board("player", self.make_move)
 
     def try_place_ship(self, row, col):
         """
@@ -77,6 +112,7 @@ class BattleshipGUI:
         if player.validator.validate_placement(length, row, col, orientation):
             if not player.validator.check_overlap(player.ship_manager.grid, row, col, orientation, length):
                 player.ship_manager.deploy_ship(ship, length, row, col, orientation)
+                self.mark_dirty("placement", player.ship_manager.ship_locations[ship])
                 self.update_placement_board()
                 self.advance_ship_placement()
 
@@ -92,11 +128,71 @@ class BattleshipGUI:
 
     def update_placement_board(self):
         """Updates the placement board to reflect the current state"""
-        for i in range(BOARD_SIZE):
-            for j in range(BOARD_SIZE):
-                if self.players[0].ship_manager.grid[i][j] == "X":
-                    self.display.placement_buttons[i][j].config(style='Ship.TButton')
+        self.redraw_dirty("placement")
+
+    def on_shot(self, event):
+        """
+        Marks the cell of a Hit or Miss event for redrawing on the shooter's board.
+
+        Args:
+            event (ShotResult): The event.
+        """
+        board = "player" if event.shooter is self.players[0] else "computer"
+        self.mark_dirty(board, [(event.row, event.column)])
+
+    def mark_dirty(self, board, cells):
+        """
+        Queues cells whose look changed, to be redrawn by `redraw_dirty`.
+
+        Args:
+            board (str): 'placement', 'player' or 'computer'.
+            cells (iterable): (row, column) pairs.
+        """
+        self.dirty_cells[board].update(cells)
+
+    def cell_state(self, board, row, column):
+        """
+        Reads the state a cell should be shown in from the players' boards.
+
+        Args:
+            board (str): 'placement', 'player' or 'computer'.
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+
+        Returns:
+            str: 'empty', 'ship', 'hit' or 'miss'.
+        """
+        if board == "placement":
+            return "ship" if self.players[0].ship_manager.has_ship(row, column) else "empty"
+        attacker = self.players[0] if board == "player" else self.players[1]
+        return self.CELL_STATES[attacker.attack_board.cell(row, column)]
+
+    @timed
+    def redraw_dirty(self, board):
+        """
+        Redraws only the queued cells of a board, so a move costs a few widget
+        updates however large the board is.
+
+        Args:
+            board (str): 'placement', 'player' or 'computer'.
+
+        Returns:
+            int: The number of cells updated.
+        """
+        cells = self.dirty_cells[board]
+        for row, column in cells:
+            self.display.set_cell(board, row, column, self.cell_state(board, row, column))
+        count = len(cells)
+        cells.clear()
+        self.turn_updates += count
+        return count
+
+    def end_turn(self):
+        """Records how many cell updates the turn issued and starts counting the next one."""
+        self.last_turn_updates = self.turn_updates
+        self.turn_updates = 0
 
+    @timed
     def make_move(self, row, col):
         """
         Makes a move in the game.
@@ -108,20 +204,21 @@ class BattleshipGUI:
         human = self.players[0]
         computer = self.players[1]
 
+        # Ignore clicks until the computer has answered the last move
+        if self.input_locked:
+            return
+
         # Player's turn
-        if human.attack_board.grid[row][col] in ["-", "X"]:
+        if human.attack_board.is_attacked(row, col):
             self.display.game_message.config(text="Already attacked this position!")
             return
 
-        hit = computer.ship_manager.grid[row][col] == "X"
-        human.attack_board.grid[row][col] = "X" if hit else "-"
-        self.display.player_buttons[row][col].config(
-            style='Hit.TButton' if hit else 'Miss.TButton')
+        hit, sunk_ship = human.fire(computer, row, col)
+        self.input_locked = True
+        self.redraw_dirty("player")
 
         # Handle player's move result
         if hit:
-            # Check if ship was sunk
-            sunk_ship = computer.ship_manager.check_sunk_ship_gui(row, col)
             if sunk_ship:
                 # Display sunk ship message with emphasis
                 message = f"Player has sunk the {sunk_ship}!"
@@ -132,6 +229,7 @@ class BattleshipGUI:
                 
                 # Check for win condition
                 if computer.ship_manager.all_ships_sunk():
+                    self.end_turn()
                     self.show_game_over("Player")
                     return
                 
@@ -158,15 +256,77 @@ class BattleshipGUI:
     
     def process_computer_turn(self, human, computer):
         """
-        Process the computer's turn after the player has moved.
+        Starts the computer's turn on a worker thread after the player has moved,
+        so the window stays responsive however long the computer thinks.
         
         Args:
             human (HumanPlayer): The human player.
             computer (ComputerPlayer): The computer player.
         """
-        # Computer makes its move
-        computer.take_turn(human)
+        results = self.ai_results
+        threading.Thread(target=self.compute_computer_turn, args=(human, computer, results),
+                         name="battleship-ai", daemon=True).start()
+        self.root.after(self.POLL_MS, lambda: self.poll_computer_turn(human, computer, results))
+
+    @staticmethod
+    def compute_computer_turn(human, computer, results):
+        """
+        Plays the computer's move on the worker thread. It touches only the players,
+        never Tk, and reports back through the queue.
+
+        Args:
+            human (HumanPlayer): The human player.
+            computer (ComputerPlayer): The computer player.
+            results (queue.Queue): Receives None when the move is done, or the exception it raised.
+        """
+        try:
+            computer.take_turn(human)
+            results.put(None)
+        except Exception as e:
+            results.put(e)
+
+    def poll_computer_turn(self, human, computer, results):
+        """
+        Checks from the Tk loop whether the computer's move is done, and shows it once it is.
+
+        Args:
+            human (HumanPlayer): The human player.
+            computer (ComputerPlayer): The computer player.
+            results (queue.Queue): The queue of the move being waited for.
+        """
+        try:
+            error = results.get_nowait()
+        except queue.Empty:
+            if not self.thinking:
+                # Only slow moves get the thinking state, so quick ones do not flicker
+                self.thinking = True
+                self.display.set_busy(True)
+                self.display.game_message.config(
+                    text="Computer is thinking...",
+                    font=('Arial', 10),
+                    foreground='black'
+                )
+            self.root.after(self.POLL_MS, lambda: self.poll_computer_turn(human, computer, results))
+            return
+        if self.thinking:
+            self.thinking = False
+            self.display.set_busy(False)
+        if error is not None:
+            self.input_locked = False
+            raise error
+        self.finish_computer_turn(human, computer)
+
+    @timed
+    def finish_computer_turn(self, human, computer):
+        """
+        Shows the result of the computer's move and hands the turn back to the player.
+
+        Args:
+            human (HumanPlayer): The human player.
+            computer (ComputerPlayer): The computer player.
+        """
         self.update_computer_board()
+        self.end_turn()
         
         # Get and display appropriate message for computer's move
         computer_message = self.get_computer_message()
@@ -177,11 +337,11 @@ class BattleshipGUI:
                     text=computer_message, 
                     style='ComputerSunk.TLabel'
                 )
-                # Pause for a moment when computer sinks a ship too
+                # Keep the message up for a moment when computer sinks a ship too
                 if not human.ship_manager.all_ships_sunk():
                     # Only pause if game isn't over
-                    self.root.update()  # Force update the UI
-                    self.root.after(3000, lambda: None)  # Wait for 3 seconds
+                    self.root.after(3000, self.unlock_input)
+                    return
             else:
                 # Regular hit/miss message
                 self.display.game_message.config(
@@ -193,6 +353,12 @@ class BattleshipGUI:
         # Check if computer won
         if human.ship_manager.all_ships_sunk():
             self.show_game_over("Computer")
+        else:
+            self.unlock_input()
+
+    def unlock_input(self):
+        """Lets the player make the next move."""
+        self.input_locked = False
 
     def get_computer_message(self):
         """
@@ -216,15 +382,13 @@ class BattleshipGUI:
 
     def update_computer_board(self):
         """Updates the computer's board to reflect the current state"""
-        computer = self.players[1]
-        for i in range(BOARD_SIZE):
-            for j in range(BOARD_SIZE):
-                if computer.attack_board.grid[i][j] in ["-", "X"]:
-                    self.display.computer_buttons[i][j].config(
-                        style='Hit.TButton' if computer.attack_board.grid[i][j] == "X" else 'Miss.TButton')
+        self.redraw_dirty("computer")
 
     def start_game(self):
         """Starts the game"""
+        # Placement is not a turn: count the first move's updates from zero
+        self.turn_updates = 0
+        self.last_turn_updates = 0
         self.setup.deploy_all_ships(self.players[1])
         self.display.setup_frame.grid_remove()
         self.display.game_frame.grid()
@@ -274,13 +438,8 @@ class BattleshipGUI:
         # Destroy the popup
         popup.destroy()
         
-        # Remove old game frames
-        if hasattr(self, 'display'):
-            self.display.setup_frame.destroy()
-            self.display.game_frame.destroy()
-        
-        # Setup new game
-        self.setup_new_game()
+        # Clear the boards and players in place for the new game
+        self.reset_game()
 
 def main():
     root = tk.Tk()
@@ -1,19 +1,25 @@
 from base_player import BasePlayer
-from battleship_config import LETTERS_TO_NUMS, BOARD_SIZE
+from coordinates import CoordinateCodec
 
 class HumanPlayer(BasePlayer):
     """Represents a human player"""
-    def __init__(self):
-        """Initializes the HumanPlayer with the name 'Player'"""
-        super().__init__("Player")
-        self.gui_mode = False  # Flag to determine whether to print to console
+    def __init__(self, config=None):
+        """
+        Initializes the HumanPlayer with the name 'Player'.
+
+        Args:
+            config (GameConfig, optional): The game variant; defaults to config.json.
+        """
+        super().__init__("Player", config)
+        self.gui_mode = False  # Set when a GUI drives the player; saved in snapshots
 
     def set_gui_mode(self, is_gui=True):
         """
-        Sets the GUI mode flag to determine whether to print to console.
+        Sets the GUI mode flag. Console output does not depend on it: it comes
+        from a ConsoleRenderer subscribed to the game's events.
         
         Args:
-            is_gui (bool): If True, player will not print to console.
+            is_gui (bool): If True, the player is driven by a GUI.
         """
         self.gui_mode = is_gui
 
@@ -27,34 +33,12 @@ class HumanPlayer(BasePlayer):
         while True:
             try:
                 position = input("Enter the position (e.g., A2): ").upper()
-                if len(position) < 2 or position[0] not in 'ABCDEFGH' or not position[1:].isdigit():
-                    raise ValueError("Invalid position. Please enter a valid position (e.g., A2).\n")
-                column = LETTERS_TO_NUMS[position[0]]
-                row = int(position[1:]) - 1
-                if row < 0 or row >= BOARD_SIZE or column < 0 or column >= BOARD_SIZE:
-                    raise ValueError("Position out of bounds. Please enter a valid position within the grid.\n")
+                row, column = CoordinateCodec.parse_position(position, self.config.board_size)
                 break
             except ValueError as e:
                 print(e)
             
-        if self.attack_board.grid[row][column] in ["-", "X"]:
+        if self.attack_board.is_attacked(row, column):
             print("\nYou already attacked this position. Try again.\n")
             return self.take_turn(opponent)
-        elif opponent.ship_manager.grid[row][column] == "X":
-            self.attack_board.grid[row][column] = "X"
-            
-            # Only print to console if not in GUI mode
-            if not self.gui_mode:
-                print("\nHit!\n")
-                print('\033[1m       Player`s Guess Board\033[0m')
-                self.display.display_board(self.attack_board.grid)
-                
-            opponent.ship_manager.check_sunk_ship(row, column)
-        else:
-            self.attack_board.grid[row][column] = "-"
-            
-            # Only print to console if not in GUI mode
-            if not self.gui_mode:
-                print("\nMiss!\n")
-                print('\033[1m       Player`s Guess Board\033[0m')
-                self.display.display_board(self.attack_board.grid) 
\ No newline at end of file
+        self.fire(opponent, row, column) 
\ No newline at end of file
@@ -0,0 +1,27 @@
+import importlib.util
+import sys
+
+def lazy_import(name):
+    """
+    Imports a module on first attribute access instead of right away, so heavy
+    dependencies such as NumPy only cost start-up time in processes that use them.
+    Once loaded the module is an ordinary module, with no per-access overhead.
+
+    Args:
+        name (str): The module to import, e.g. 'numpy'.
+
+    Returns:
+        module: The module, or a placeholder that loads it when first used.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,176 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from battleship_config import BOARD_SIZE
+from coordinates import CoordinateCodec
+
+class LatencyReport:
+    """Move latencies collected by the load generator"""
+    def __init__(self):
+        """Initializes an empty report."""
+        self.latencies = []  # Seconds from sending a move to reading its reply
+        self.games = 0
+        self.errors = 0
+        self.elapsed = 0.0  # Wall-clock seconds of the whole run
+
+    def percentile(self, percent):
+        """
+        Returns a latency percentile.
+
+        Args:
+            percent (float): The percentile, e.g. 50 or 99.
+
+        Returns:
+            float: The latency in seconds, or 0.0 if nothing was measured.
+        """
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+    @property
+    def moves_per_second(self):
+        """float: Moves answered per wall-clock second."""
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        """
+        Formats the report for the console.
+
+        Returns:
+            str: A multi-line summary.
+        """
+        return "\n".join([
+            f"Games:          {self.games}",
+            f"Moves:          {len(self.latencies)}",
+            f"Errors:         {self.errors}",
+            f"Moves/sec:      {self.moves_per_second:.1f}",
+            f"p50 latency:    {self.percentile(50) * 1000:.2f} ms",
+            f"p99 latency:    {self.percentile(99) * 1000:.2f} ms",
+        ])
+
+class LoadClient:
+    """Plays many matches at once against a GameServer and times every move"""
+    def __init__(self, host, port, connections=100, games=10, seed=None):
+        """
+        Initializes the load generator.
+
+        Args:
+            host (str): The server address.
+            port (int): The server port.
+            connections (int): Concurrent connections, each playing its games one after another.
+            games (int): Games played per connection.
+            seed (int, optional): Seed for reproducible move orders.
+        """
+        self.host = host
+        self.port = port
+        self.connections = connections
+        self.games = games
+        self.rng = random.Random(seed)
+        self.report = LatencyReport()
+
+    async def request(self, reader, writer, message):
+        """
+        Sends one request and waits for its reply.
+
+        Args:
+            reader (asyncio.StreamReader): The connection's input.
+            writer (asyncio.StreamWriter): The connection's output.
+            message (dict): The request.
+
+        Returns:
+            dict: The reply.
+        """
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    async def play(self, seed):
+        """
+        Plays this connection's games, firing at every cell in random order until each ends.
+
+        Args:
+            seed (int): Seed for the connection's games.
+        """
+        rng = random.Random(seed)
+        cells = [(row, column) for row in range(BOARD_SIZE) for column in range(BOARD_SIZE)]
+        reader, writer = await asyncio.open_connection(self.host, self.port, limit=1 << 16)
+        try:
+            for _ in range(self.games):
+                reply = await self.request(reader, writer, {"cmd": "new_game", "random_fleet": True,
+                                                            "seed": rng.getrandbits(32)})
+                game = reply["game"]
+                rng.shuffle(cells)
+                for row, column in cells:
+                    start = time.perf_counter()
+                    reply = await self.request(reader, writer, {"cmd": "fire", "game": game,
+                                                                "position": CoordinateCodec.format_position(row, column)})
+                    self.report.latencies.append(time.perf_counter() - start)
+                    if not reply["ok"]:
+                        self.report.errors += 1
+                        break
+                    if reply["winner"]:
+                        break
+                await self.request(reader, writer, {"cmd": "close", "game": game})
+                self.report.games += 1
+        finally:
+            writer.close()
+
+    async def run(self):
+        """
+        Runs every connection to completion.
+
+        Returns:
+            LatencyReport: The measured latencies and throughput.
+        """
+        start = time.perf_counter()
+        seeds = [self.rng.getrandbits(32) for _ in range(self.connections)]
+        await asyncio.gather(*(self.play(seed) for seed in seeds))
+        self.report.elapsed = time.perf_counter() - start
+        return self.report
+
+def start_local_server():
+    """
+    Starts a GameServer in a child process on a free localhost port.
+
+    Returns:
+        tuple: The child process and the port it listens on.
+    """
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_server.py")
+    server = subprocess.Popen([sys.executable, script, "--port", str(port)], stdout=subprocess.PIPE, text=True)
+    server.stdout.readline()  # "Listening on ..." once the socket is open
+    return server, port
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate load against a Battleship game server.")
+    parser.add_argument("--host", default="127.0.0.1", help="server address")
+    parser.add_argument("--port", type=int, default=None,
+                        help="server port (default: start a local server on a free port)")
+    parser.add_argument("-c", "--connections", type=int, default=100, help="concurrent connections")
+    parser.add_argument("-g", "--games", type=int, default=10, help="games per connection")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible runs")
+    args = parser.parse_args()
+
+    server = None
+    port = args.port
+    if port is None:
+        server, port = start_local_server()
+    try:
+        report = asyncio.run(LoadClient(args.host, port, args.connections, args.games, args.seed).run())
+        print(report.summary())
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,106 @@
+import os
 import sys
-import tkinter as tk
 
-def run_gui_version():
+MODES = {"--gui": "1", "--cli": "2", "--curses": "3"}  # Command-line flags that skip the menu
+METRICS_FLAG = "--metrics"  # Times the hot paths and prints a summary on exit
+
+def open_recorder():
+    """
+    Opens the replay log named by BATTLESHIP_REPLAY_LOG, if the variable is set.
+
+    Returns:
+        ReplayRecorder: The recorder, or None when no log is wanted.
+    """
+    log_path = os.environ.get("BATTLESHIP_REPLAY_LOG")
+    if not log_path:
+        return None
+    import atexit
+    from replay_log import ReplayRecorder
+    recorder = ReplayRecorder(log_path)
+    atexit.register(recorder.close)
+    return recorder
+
+def enable_metrics():
+    """Times the game's hot paths from now on and prints what they cost when the program exits."""
+    import atexit
+    import metrics
+    metrics.enable()
+    atexit.register(lambda: print("\n" + metrics.REGISTRY.summary()))
+
+def run_gui_version(recorder=None):
     """Run the GUI version of the Battleship game."""
-    from gui_gameplay import main as gui_main
-    gui_main()
+    # Tk is imported here so the command-line version never pays for it
+    import tkinter as tk
+    from gui_gameplay import BattleshipGUI
+    root = tk.Tk()
+    app = BattleshipGUI(root, recorder)
+    root.minsize(600, 400)
+    root.mainloop()
 
-def run_command_line_version():
+def run_command_line_version(recorder=None):
     """Run the command-line version of the Battleship game."""
     from cli_gameplay import CLIGamePlay
-    game = CLIGamePlay()
+    game = CLIGamePlay(recorder)
     game.run_game()
 
-def main():
-    """Main entry point for the Battleship game."""
+def run_full_screen_version(recorder=None):
+    """Run the full-screen terminal version, which redraws only the cells that change."""
+    import curses_display
+    curses_display.run(recorder)
+
+def main(argv=None):
+    """
+    Main entry point for the Battleship game.
+
+    Args:
+        argv (list, optional): Command-line arguments, defaults to sys.argv[1:];
+            '--gui', '--cli' or '--curses' starts that version without the menu;
+            '--metrics' times the hot paths and prints a summary on exit.
+    """
+    # A plain check rather than argparse, which alone would add ~10 ms to every start
+    choice = None
+    for arg in sys.argv[1:] if argv is None else argv:
+        if arg == METRICS_FLAG:
+            enable_metrics()
+            continue
+        if arg not in MODES:
+            print("Usage: python main.py [--gui | --cli | --curses] [--metrics]")
+            sys.exit(0 if arg in ("-h", "--help") else 2)
+        choice = MODES[arg]
+
     print("Welcome to Battleship!")
-    print("Choose your game mode:")
-    print("1. GUI Version")
-    print("2. Command-Line Version")
+    if choice is None:
+        print("Choose your game mode:")
+        print("1. GUI Version")
+        print("2. Command-Line Version")
+        print("3. Full-Screen Terminal Version")
+
+    # Record every shot when a replay log path is set
+    recorder = open_recorder()
     
     while True:
         try:
-            choice = input("Enter your choice (1 or 2): ").strip()
+            if choice is None:
+                choice = input("Enter your choice (1, 2 or 3): ").strip()
             
             if choice == '1':
                 # GUI Version
-                root = tk.Tk()
-                from gui_gameplay import BattleshipGUI
-                app = BattleshipGUI(root)
-                root.minsize(600, 400)
-                root.mainloop()
+                run_gui_version(recorder)
                 break
             
             elif choice == '2':
                 # Command-Line Version
-                run_command_line_version()
+                run_command_line_version(recorder)
+                break
+            
+            elif choice == '3':
+                # Full-Screen Terminal Version
+                run_full_screen_version(recorder)
                 break
             
             else:
-                print("Invalid choice. Please enter 1 or 2.")
+                print("Invalid choice. Please enter 1, 2 or 3.")
+                choice = None
         
         except KeyboardInterrupt:
             print("\nGame terminated.")
@@ -48,4 +110,4 @@ def main():
             sys.exit(1)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,430 @@
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from game_events import EventBus, GameOver, ShotResult, Sunk
+
+ENV_FLAG = "BATTLESHIP_METRICS"  # Set to a non-empty value other than 0 to time hot paths from start-up
+
+class Histogram:
+    """Call count, total time and latency distribution of one timed path"""
+    BOUNDS = (1e-06, 2.5e-06, 5e-06, 1e-05, 2.5e-05, 5e-05, 0.0001, 0.00025, 0.0005,  # Seconds, 1 us to 10 s
+              0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        """Initializes an empty histogram."""
+        self.counts = [0] * (len(self.BOUNDS) + 1)  # Per bucket; the last one is slower than every bound
+        self.count = 0
+        self.sum = 0.0
+        self.lock = threading.Lock()  # Moves run on GUI and server worker threads too
+
+    def observe(self, seconds):
+        """
+        Adds one measured call.
+
+        Args:
+            seconds (float): How long the call took.
+        """
+        bucket = bisect.bisect_left(self.BOUNDS, seconds)
+        with self.lock:
+            self.counts[bucket] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def clear(self):
+        """Forgets every measured call."""
+        with self.lock:
+            self.counts = [0] * (len(self.BOUNDS) + 1)
+            self.count = 0
+            self.sum = 0.0
+
+    def cumulative(self):
+        """
+        Counts the calls at or under each bound, as Prometheus buckets do.
+
+        Returns:
+            list: (bound, count) pairs, ending with (float('inf'), total count).
+        """
+        running = 0
+        buckets = []
+        for bound, count in zip(self.BOUNDS + (float("inf"),), self.counts):
+            running += count
+            buckets.append((bound, running))
+        return buckets
+
+    def quantile(self, q):
+        """
+        Estimates a latency quantile as the upper bound of the bucket holding it.
+
+        Args:
+            q (float): The quantile, from 0 to 1.
+
+        Returns:
+            float: The estimate in seconds, or 0.0 when nothing was measured.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, running in self.cumulative():
+            if running >= rank:
+                return bound
+        return float("inf")
+
+class MetricsRegistry:
+    """Every timer and event counter of the process, exportable as JSON or Prometheus text"""
+    def __init__(self):
+        """Initializes an empty registry."""
+        self.timers = {}  # Path name -> Histogram
+        self.events = {}  # Event name -> count
+        self.lock = threading.Lock()
+
+    def timer(self, name):
+        """
+        Returns the histogram of a path, creating it on first use.
+
+        Args:
+            name (str): The path, e.g. 'ComputerPlayer.take_turn'.
+
+        Returns:
+            Histogram: The path's histogram.
+        """
+        histogram = self.timers.get(name)
+        if histogram is None:
+            with self.lock:
+                histogram = self.timers.setdefault(name, Histogram())
+        return histogram
+
+    def count(self, name, amount=1):
+        """
+        Adds to an event counter.
+
+        Args:
+            name (str): The counter, e.g. 'hits'.
+            amount (int): How much to add.
+        """
+        with self.lock:
+            self.events[name] = self.events.get(name, 0) + amount
+
+    def watch(self, players):
+        """
+        Counts the shots, hits, misses, sunk ships and finished games of a game.
+
+        Args:
+            players (list): The game's players.
+        """
+        events = EventBus.of(players)
+        events.subscribe(ShotResult, self.on_shot)
+        events.subscribe(Sunk, self.on_sunk)
+        events.subscribe(GameOver, self.on_game_over)
+
+    def on_shot(self, event):
+        """
+        Counts a Hit or Miss event.
+
+        Args:
+            event (ShotResult): The event.
+        """
+        self.count("hits" if event.hit else "misses")
+
+    def on_sunk(self, event):
+        """
+        Counts a Sunk event.
+
+        Args:
+            event (Sunk): The event.
+        """
+        self.count("ships_sunk")
+
+    def on_game_over(self, event):
+        """
+        Counts a GameOver event.
+
+        Args:
+            event (GameOver): The event.
+        """
+        self.count("games")
+
+    def reset(self):
+        """Forgets every measurement, keeping the timed paths."""
+        with self.lock:
+            self.events.clear()
+        for histogram in self.timers.values():
+            histogram.clear()  # In place: the timing wrappers hold on to their histograms
+
+    def to_dict(self):
+        """
+        Collects every measurement.
+
+        Returns:
+            dict: {'timers': {path: {'count', 'sum', 'p50', 'p99', 'buckets'}}, 'events': {name: count}},
+                times in seconds and buckets as cumulative {bound: count}.
+        """
+        timers = {}
+        for name, histogram in sorted(self.timers.items()):
+            timers[name] = {
+                "count": histogram.count,
+                "sum": histogram.sum,
+                "p50": histogram.quantile(0.5),
+                "p99": histogram.quantile(0.99),
+                "buckets": {("+Inf" if bound == float("inf") else repr(bound)): count
+                            for bound, count in histogram.cumulative()},
+            }
+        return {"timers": timers, "events": dict(sorted(self.events.items()))}
+
+    def to_json(self):
+        """
+        Exports every measurement as JSON.
+
+        Returns:
+            str: The document described by `to_dict`.
+        """
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self):
+        """
+        Exports every measurement in the Prometheus text exposition format.
+
+        Returns:
+            str: A histogram family battleship_duration_seconds labelled by path, and a
+                counter family battleship_events_total labelled by event.
+        """
+        lines = ["# HELP battleship_duration_seconds Time spent in the game's hot paths.",
+                 "# TYPE battleship_duration_seconds histogram"]
+        for name, histogram in sorted(self.timers.items()):
+            for bound, count in histogram.cumulative():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'battleship_duration_seconds_bucket{{path="{name}",le="{le}"}} {count}')
+            lines.append(f'battleship_duration_seconds_sum{{path="{name}"}} {histogram.sum!r}')
+            lines.append(f'battleship_duration_seconds_count{{path="{name}"}} {histogram.count}')
+        lines += ["# HELP battleship_events_total Game events seen.",
+                  "# TYPE battleship_events_total counter"]
+        for name, count in sorted(self.events.items()):
+            lines.append(f'battleship_events_total{{event="{name}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """
+        Formats the timers as a table, slowest total first.
+
+        Returns:
+            str: One line per path with calls, total, mean, p50 and p99.
+        """
+        lines = [f"{'path':<40}{'calls':>10}{'total ms':>12}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}"]
+        for name, histogram in sorted(self.timers.items(), key=lambda item: -item[1].sum):
+            if histogram.count:
+                lines.append(f"{name:<40}{histogram.count:>10}{histogram.sum * 1e3:>12.1f}"
+                             f"{histogram.sum / histogram.count * 1e6:>10.1f}"
+                             f"{histogram.quantile(0.5) * 1e6:>10.0f}{histogram.quantile(0.99) * 1e6:>10.0f}")
+        if self.events:
+            lines.append("events: " + ", ".join(f"{name} {count}" for name, count in sorted(self.events.items())))
+        return "\n".join(lines)
+
+REGISTRY = MetricsRegistry()
+TIMED_METHODS = []  # (class, attribute, original function, path name) of every @timed method
+_enabled = False
+
+class TimedMethod:
+    """Placeholder left by @timed in a class body until the class exists.
+
+    When Python names it, it puts the plain function back on the class, or a
+    timing wrapper if metrics are on, and registers the method so `enable` and
+    `disable` can swap the two later. Disabled methods are the original
+    functions, so they cost nothing at all."""
+    def __init__(self, function):
+        """
+        Initializes the placeholder.
+
+        Args:
+            function (callable): The method, possibly a staticmethod.
+        """
+        self.function = function
+
+    def __set_name__(self, owner, name):
+        """
+        Replaces the placeholder with the method and registers it.
+
+        Args:
+            owner (type): The class being created.
+            name (str): The method's attribute name.
+        """
+        path = f"{owner.__name__}.{name}"
+        TIMED_METHODS.append((owner, name, self.function, path))
+        setattr(owner, name, timing_wrapper(self.function, path) if _enabled else self.function)
+
+def timed(function):
+    """
+    Marks a method as a hot path, timed while metrics are enabled.
+
+    Args:
+        function (callable): The method.
+
+    Returns:
+        TimedMethod: The placeholder, replaced by the method when the class is created.
+    """
+    return TimedMethod(function)
+
+def timing_wrapper(function, path):
+    """
+    Wraps a function so every call is counted and timed.
+
+    Args:
+        function (callable): The function, or a staticmethod.
+        path (str): The name its measurements are filed under.
+
+    Returns:
+        callable: The wrapper.
+    """
+    if isinstance(function, staticmethod):
+        return staticmethod(timing_wrapper(function.__func__, path))
+    observe = REGISTRY.timer(path).observe
+    perf_counter = time.perf_counter
+
+    @functools.wraps(function)
+    def timed_call(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            observe(perf_counter() - start)
+    return timed_call
+
+def enabled():
+    """
+    Tells whether hot paths are being timed.
+
+    Returns:
+        bool: True between `enable` and `disable`.
+    """
+    return _enabled
+
+def enable():
+    """Starts timing every @timed method, including those of modules imported later."""
+    global _enabled
+    _enabled = True
+    for owner, name, function, path in TIMED_METHODS:
+        setattr(owner, name, timing_wrapper(function, path))
+
+def disable():
+    """Puts the original methods back; measurements taken so far are kept."""
+    global _enabled
+    _enabled = False
+    for owner, name, function, _ in TIMED_METHODS:
+        setattr(owner, name, function)
+
+def watch(players):
+    """
+    Counts a game's events in the registry while metrics are enabled.
+
+    Args:
+        players (list): The game's players.
+    """
+    if _enabled:
+        REGISTRY.watch(players)
+
+def serve(port, host="127.0.0.1"):
+    """
+    Serves the registry over HTTP for scrapers: Prometheus text at /metrics and JSON at /metrics.json.
+
+    Args:
+        port (int): The port to listen on (0 for any free port).
+        host (str): The address to listen on.
+
+    Returns:
+        http.server.ThreadingHTTPServer: The running server; its server_address holds the port.
+    """
+    # http.server is only loaded by processes that serve metrics
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, content_type = REGISTRY.to_prometheus(), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, content_type = REGISTRY.to_json(), "application/json"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass  # Scrapes are too frequent to log
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="battleship-metrics", daemon=True).start()
+    return server
+
+def export(fmt):
+    """
+    Exports the registry in a named format.
+
+    Args:
+        fmt (str): 'json', 'prometheus' or 'summary'.
+
+    Returns:
+        str: The export.
+    """
+    if fmt == "json":
+        return REGISTRY.to_json()
+    if fmt == "prometheus":
+        return REGISTRY.to_prometheus()
+    return REGISTRY.summary()
+
+def overhead_benchmark(calls=200000):
+    """
+    Times BoardValidator.check_overlap, one of the most frequently called hot paths,
+    as the plain function, as the disabled method and as the enabled method.
+
+    Args:
+        calls (int): Calls per measurement.
+
+    Returns:
+        dict: State ('plain', 'disabled', 'enabled') -> nanoseconds per call, best of five.
+    """
+    import timeit
+    from board_validator import BoardValidator
+    from ship_manager import ShipManager
+
+    validator = BoardValidator()
+    grid = ShipManager("Computer").grid
+    original = next(function for owner, name, function, _ in TIMED_METHODS
+                    if owner is BoardValidator and name == "check_overlap")
+    was_enabled = _enabled
+    results = {}
+    try:
+        for state in ("plain", "disabled", "enabled"):
+            if state == "enabled":
+                enable()
+            else:
+                disable()
+            call = (lambda: original(validator, grid, 2, 3, "H", 3)) if state == "plain" else \
+                (lambda: validator.check_overlap(grid, 2, 3, "H", 3))
+            best = min(timeit.repeat(call, number=calls, repeat=5))
+            results[state] = best / calls * 1e9
+    finally:
+        enable() if was_enabled else disable()
+    return results
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Measure what the hot-path timers cost.")
+    parser.add_argument("-n", "--calls", type=int, default=200000, help="calls per measurement")
+    args = parser.parse_args()
+
+    # The @timed methods registered with the imported module, not with this script's __main__
+    import metrics
+    results = metrics.overhead_benchmark(args.calls)
+    for state, ns in results.items():
+        print(f"{state:<10}{ns:>8.1f} ns/call  ({ns - results['plain']:+.1f} ns)")
+
+if os.environ.get(ENV_FLAG, "0") not in ("", "0"):
+    enable()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import time
+from probability_engine import ProbabilityEngine
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")  # Loaded on first use, keeping start-up fast
+
+class LazyMasks:
+    """Placement bitboards built on access, for boards too large to hold them all"""
+    def __init__(self, index, positions):
+        """
+        Initializes the sequence.
+
+        Args:
+            index (PlacementIndex): The placements of one ship length.
+            positions (numpy.ndarray): Positions of the placements in the index.
+        """
+        self.index = index
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, item):
+        return self.index.mask(int(self.positions[item]))
+
+class MonteCarloTargeter:
+    """Anytime targeting that samples fleet layouts consistent with the shots so far"""
+    def __init__(self, validator, rng):
+        """
+        Initializes the targeter.
+
+        Args:
+            validator (BoardValidator): Provides the placement index of the board.
+            rng (random.Random): Source of randomness for the samples.
+        """
+        self.validator = validator
+        self.size = validator.size
+        self.rng = rng
+        self.resolved_mask = 0  # Hit cells known to belong to sunk ships
+
+    def ship_sunk(self, attack_board, row, column, length):
+        """
+        Attributes the cells of a just-sunk ship when the hits allow only one
+        line of `length` unresolved hits through the final shot.
+
+        Args:
+            attack_board (ShipManager): The shooter's record of hits and misses.
+            row (int): The row of the sinking shot.
+            column (int): The column of the sinking shot.
+            length (int): The length of the sunk ship.
+        """
+        hits = attack_board.hit_mask & ~self.resolved_mask
+        lines = []
+        for shift in range(length):
+            for mask in (attack_board.placement_mask(row, column - shift, "H", length),
+                         attack_board.placement_mask(row - shift, column, "V", length)):
+                if mask is not None and mask & hits == mask and mask not in lines:
+                    lines.append(mask)
+        if len(lines) == 1:
+            self.resolved_mask |= lines[0]
+
+    def sample(self, candidates, hits, order):
+        """
+        Draws one fleet layout. While some hit is still uncovered, ships prefer
+        placements through a hit, so layouts that explain the hits turn up often.
+
+        Args:
+            candidates (dict): length -> (placements avoiding misses, those also covering a hit).
+            hits (int): Bitboard of hits that the remaining ships may cover.
+            order (list): Ship lengths in the order they are placed.
+
+        Returns:
+            int: The occupied cells of the layout, or None if a ship did not fit.
+        """
+        occupied = 0
+        for length in order:
+            free, through_hit = candidates[length]
+            pool = through_hit if through_hit and hits & ~occupied else free
+            for _ in range(8):
+                mask = self.rng.choice(pool)
+                if not mask & occupied:
+                    break
+            else:
+                return None
+            occupied |= mask
+        return occupied
+
+    def choose(self, attack_board, remaining, sunk_cells, budget):
+        """
+        Samples layouts until the time budget runs out and returns the unattacked
+        cell most often covered by a ship in the layouts that fit the evidence.
+
+        Args:
+            attack_board (ShipManager): The shooter's record of hits and misses.
+            remaining (list): Lengths of the ships not yet sunk.
+            sunk_cells (int): Total length of the ships already sunk.
+            budget (float): Wall-clock seconds to spend on this move.
+
+        Returns:
+            tuple: The (row, column) to attack, or None if no consistent layout was found.
+        """
+        deadline = time.perf_counter() + budget
+        attacked = attack_board.hit_mask | attack_board.miss_mask
+        blocked = attack_board.miss_mask | self.resolved_mask
+        hits = attack_board.hit_mask & ~self.resolved_mask
+        # The remaining ships must cover exactly the hits not used by sunk ships
+        unresolved_sunk_cells = sunk_cells - bin(self.resolved_mask).count("1")
+        hits_to_cover = bin(hits).count("1") - unresolved_sunk_cells
+        if not remaining or hits_to_cover < 0:
+            return None
+
+        candidates = {}
+        for length in set(remaining):
+            index = self.validator.placement_index(length)
+            free = self.validator.legal_placements(blocked, length)
+            if not len(free):
+                return None
+            through_hit = np.intersect1d(free, self.validator.covering_placements(hits, length), assume_unique=True)
+            if self.size <= ProbabilityEngine.TABLE_MAX_SIZE:
+                masks = index.masks
+                candidates[length] = ([masks[i] for i in free.tolist()], [masks[i] for i in through_hit.tolist()])
+            else:
+                # Large boards: keep positions and build only the sampled masks
+                candidates[length] = (LazyMasks(index, free), LazyMasks(index, through_hit))
+        order = sorted(remaining, reverse=True)
+
+        counts = {}
+        while True:
+            occupied = self.sample(candidates, hits, order)
+            if occupied is not None and bin(occupied & hits).count("1") == hits_to_cover:
+                targets = occupied & ~attacked
+                while targets:
+                    low = targets & -targets
+                    cell = low.bit_length() - 1
+                    counts[cell] = counts.get(cell, 0) + 1
+                    targets ^= low
+            if time.perf_counter() >= deadline:
+                break
+
+        if not counts:
+            return None
+        return divmod(max(counts, key=counts.get), self.size)
@@ -0,0 +1,313 @@
+from collections import Counter
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")  # Loaded on first use, keeping start-up fast
+
+class ProbabilityEngine:
+    """Vectorized ship-placement density calculations for the AI"""
+    TABLE_MAX_SIZE = 12  # Boards up to this width use precomputed per-line lookup tables
+    _line_tables = {}  # (board size, fleet) -> per-line placement counts for every free/blocked pattern
+    _bitboard_tables = {}  # (board size, fleet) -> the tables of `bitboard_density`
+
+    @staticmethod
+    def fleet_weights(ship_lengths):
+        """
+        Groups ships of the same length so each length is counted only once.
+
+        Args:
+            ship_lengths (iterable): The length of every ship in the fleet.
+
+        Returns:
+            tuple: Sorted (length, number of ships) pairs.
+        """
+        return tuple(sorted(Counter(ship_lengths).items()))
+
+    @staticmethod
+    def mask_to_array(mask, size):
+        """
+        Unpacks a bitboard into a boolean array.
+
+        Args:
+            mask (int): Bitboard with bit (row * size + column) per cell.
+            size (int): The width of the board.
+
+        Returns:
+            numpy.ndarray: Boolean array (size, size), True where the bit is set.
+        """
+        cells = size * size
+        packed = np.frombuffer(mask.to_bytes((cells + 7) // 8, "little"), dtype=np.uint8)
+        return np.unpackbits(packed, count=cells, bitorder="little").reshape(size, size).view(bool)
+
+    @staticmethod
+    def prefix_runs(free):
+        """
+        Prefix sums of free cells along the last axis, with a leading zero.
+
+        Args:
+            free (numpy.ndarray): Boolean array (..., N), True where a ship may lie.
+
+        Returns:
+            numpy.ndarray: Integer array (..., N + 1).
+        """
+        runs = np.zeros(free.shape[:-1] + (free.shape[-1] + 1,), dtype=np.int32)
+        np.cumsum(free, axis=-1, out=runs[..., 1:])
+        return runs
+
+    @staticmethod
+    def legal_starts(free, length):
+        """
+        Finds every cell where a ship of `length` can start along the last axis.
+
+        Args:
+            free (numpy.ndarray): Boolean array (..., N), True where a ship may lie.
+            length (int): The length of the ship.
+
+        Returns:
+            numpy.ndarray: Boolean array (..., max(N - length + 1, 0)).
+        """
+        runs = ProbabilityEngine.prefix_runs(free)
+        if length > free.shape[-1]:
+            return np.zeros(free.shape[:-1] + (0,), dtype=bool)
+        return (runs[..., length:] - runs[..., :-length]) == length
+
+    @staticmethod
+    def line_counts(free, weights):
+        """
+        Counts, for every cell, the weighted number of ship placements along the
+        last axis that cover it using only free cells.
+
+        Args:
+            free (numpy.ndarray): Boolean array (..., N), True where a ship may lie.
+            weights (tuple): (length, number of ships) pairs from `fleet_weights`.
+
+        Returns:
+            numpy.ndarray: Integer array (..., N) of weighted placement counts.
+        """
+        size = free.shape[-1]
+        runs = ProbabilityEngine.prefix_runs(free)
+
+        # Mark +weight where each legal placement starts and -weight just past its end
+        edges = np.zeros(free.shape[:-1] + (size + 1,), dtype=np.int32)
+        for length, count in weights:
+            if length > size:
+                continue
+            starts = (runs[..., length:] - runs[..., :-length]) == length
+            starts = starts * np.int32(count)
+            edges[..., :size - length + 1] += starts
+            edges[..., length:] -= starts
+        return np.cumsum(edges[..., :size], axis=-1)
+
+    @staticmethod
+    def line_table(size, weights):
+        """
+        Returns the cached lookup table of `line_counts` for every possible line of
+        `size` cells, indexed by the bit pattern of its free cells.
+
+        Args:
+            size (int): The number of cells in a line.
+            weights (tuple): (length, number of ships) pairs from `fleet_weights`.
+
+        Returns:
+            numpy.ndarray: Float array (2 ** size, size).
+        """
+        key = (size, weights)
+        table = ProbabilityEngine._line_tables.get(key)
+        if table is None:
+            patterns = (np.arange(2 ** size)[:, None] >> np.arange(size)) & 1
+            table = ProbabilityEngine.line_counts(patterns.astype(bool), weights).astype(float)
+            ProbabilityEngine._line_tables[key] = table
+        return table
+
+    @staticmethod
+    def bitboard_tables(size, weights):
+        """
+        Returns the cached tables `bitboard_density` reads a small board with.
+
+        Args:
+            size (int): The width of the board, at most TABLE_MAX_SIZE.
+            weights (tuple): (length, number of ships) pairs from `fleet_weights`.
+
+        Returns:
+            tuple: (`line_table` indexed by the blocked instead of the free cells, the set of patterns
+                no ship fits, and each pattern with bit i moved to bit i * size, for transposing).
+        """
+        key = (size, weights)
+        tables = ProbabilityEngine._bitboard_tables.get(key)
+        if tables is None:
+            table = np.ascontiguousarray(ProbabilityEngine.line_table(size, weights)[::-1])
+            spread = [0] * (1 << size)
+            for pattern in range(1, 1 << size):
+                low = pattern & -pattern
+                spread[pattern] = spread[pattern ^ low] | 1 << (low.bit_length() - 1) * size
+            tables = (table, set(np.flatnonzero(~table.any(axis=1)).tolist()), spread)
+            ProbabilityEngine._bitboard_tables[key] = tables
+        return tables
+
+    @staticmethod
+    def bitboard_density(mask, size, weights):
+        """
+        Builds `density_map` straight from a bitboard of attacked cells. On small
+        boards no boolean board is built: each row is a slice of the bitboard,
+        the columns are gathered from the rows with integer operations, and all
+        lines are looked up in one call, so a turn costs a few NumPy calls
+        however many cells were attacked.
+
+        Args:
+            mask (int): Bitboard of attacked cells, bit (row * size + column).
+            size (int): The width of the board.
+            weights (tuple): (length, number of ships) pairs from `fleet_weights`.
+
+        Returns:
+            numpy.ndarray: Float array (N, N) with the placement density of each cell.
+        """
+        if size > ProbabilityEngine.TABLE_MAX_SIZE:
+            lengths = [length for length, count in weights for _ in range(count)]
+            return ProbabilityEngine.density_map(ProbabilityEngine.mask_to_array(mask, size), lengths)
+        table, no_fit, spread = ProbabilityEngine.bitboard_tables(size, weights)
+        line = (1 << size) - 1
+        lines = [mask >> shift & line for shift in range(0, size * size, size)]
+        columns = 0  # Column c of the board in bits c * size to c * size + size - 1
+        for row, pattern in enumerate(lines):
+            columns |= spread[pattern] << row
+        lines += [columns >> shift & line for shift in range(0, size * size, size)]
+        if no_fit.issuperset(lines):
+            # No ship fits anywhere: spread the odds evenly over untouched cells
+            return (~ProbabilityEngine.mask_to_array(mask, size)).astype(float)
+        counts = table.take(lines, axis=0)
+        density = counts[:size]
+        density += counts[size:].T
+        return density
+
+    @staticmethod
+    def density_map(blocked, ship_lengths):
+        """
+        Builds the targeting heat map: for every cell, the number of ways the
+        fleet's ships could be placed over it without touching a blocked cell.
+        Ships sharing a length are counted once and weighted by their number.
+
+        Args:
+            blocked (numpy.ndarray): Boolean array (..., N, N), True for already attacked cells.
+            ship_lengths (iterable): The length of every ship still to be found.
+
+        Returns:
+            numpy.ndarray: Float array (..., N, N) with the placement density of each cell.
+        """
+        weights = ProbabilityEngine.fleet_weights(ship_lengths)
+        size = blocked.shape[-1]
+        free = ~blocked
+        columns = np.swapaxes(free, -1, -2)
+
+        if size <= ProbabilityEngine.TABLE_MAX_SIZE:
+            # Small boards: look each row and column up by its free-cell bit pattern
+            table = ProbabilityEngine.line_table(size, weights)
+            bits = 1 << np.arange(size)
+            horizontal = table[free @ bits]
+            vertical = table[columns @ bits]
+        else:
+            # Large boards: one pass over rows and columns together
+            horizontal, vertical = ProbabilityEngine.line_counts(np.stack([free, columns]), weights).astype(float)
+        density = horizontal + np.swapaxes(vertical, -1, -2)
+
+        # If no ship fits anywhere, spread the odds evenly over untouched cells
+        if not density.any():
+            density = free.astype(float)
+        return density
+
+class ProbabilityTracker:
+    """Keeps the placement density up to date one attacked cell at a time"""
+    def __init__(self, size, ship_lengths):
+        """
+        Initializes the tracker for an untouched board.
+
+        Args:
+            size (int): The width of the board.
+            ship_lengths (iterable): The length of every ship in the fleet.
+        """
+        self.size = size
+        self.remaining = dict(ProbabilityEngine.fleet_weights(ship_lengths))  # length -> ships afloat
+        self.attacked = np.zeros((size, size), dtype=bool)
+        self.seen_mask = 0  # Attacked cells already folded into the counts
+        self.horizontal = {}  # length -> legal starts, indexed [row, start column]
+        self.vertical = {}  # length -> legal starts, indexed [column, start row]
+        self.counts = {}  # length -> placements of one ship covering each cell
+        self.density = np.zeros((size, size))
+        self.placements = 0  # Weighted number of legal placements left
+        free = ~self.attacked
+        for length, count in self.remaining.items():
+            self.horizontal[length] = ProbabilityEngine.legal_starts(free, length)
+            self.vertical[length] = ProbabilityEngine.legal_starts(free.T, length)
+            self.counts[length] = ProbabilityEngine.line_counts(free, ((length, 1),)) + \
+                ProbabilityEngine.line_counts(free.T, ((length, 1),)).T
+            self.density += count * self.counts[length]
+            self.placements += count * int(self.horizontal[length].sum() + self.vertical[length].sum())
+
+    def mark_attacked(self, row, column):
+        """
+        Removes every placement that covers a newly attacked cell.
+
+        Args:
+            row (int): The row of the attacked cell.
+            column (int): The column of the attacked cell.
+        """
+        if self.attacked[row, column]:
+            return
+        self.attacked[row, column] = True
+        for length, counts in self.counts.items():
+            weight = self.remaining[length]
+            starts = self.horizontal[length]
+            for start in range(max(0, column - length + 1), min(column, self.size - length) + 1):
+                if starts[row, start]:
+                    starts[row, start] = False
+                    counts[row, start:start + length] -= 1
+                    self.density[row, start:start + length] -= weight
+                    self.placements -= weight
+            starts = self.vertical[length]
+            for start in range(max(0, row - length + 1), min(row, self.size - length) + 1):
+                if starts[column, start]:
+                    starts[column, start] = False
+                    counts[start:start + length, column] -= 1
+                    self.density[start:start + length, column] -= weight
+                    self.placements -= weight
+
+    def sync(self, attacked_mask):
+        """
+        Folds in every cell attacked since the last call.
+
+        Args:
+            attacked_mask (int): Bitboard of all attacked cells.
+        """
+        new = attacked_mask & ~self.seen_mask
+        self.seen_mask = attacked_mask
+        while new:
+            low = new & -new
+            self.mark_attacked(*divmod(low.bit_length() - 1, self.size))
+            new ^= low
+
+    def ship_sunk(self, length):
+        """
+        Drops one ship of the given length from the fleet still to be found.
+
+        Args:
+            length (int): The length of the sunk ship.
+        """
+        if not self.remaining.get(length):
+            return
+        self.remaining[length] -= 1
+        self.density -= self.counts[length]
+        self.placements -= int(self.horizontal[length].sum() + self.vertical[length].sum())
+        if not self.remaining[length]:
+            # No ship of this length is left, so stop maintaining its counts
+            del self.remaining[length], self.counts[length]
+            del self.horizontal[length], self.vertical[length]
+
+    def density_map(self):
+        """
+        Returns the current targeting heat map. The array is the tracker's own
+        and changes with the next shot.
+
+        Returns:
+            numpy.ndarray: Float array (N, N), as `ProbabilityEngine.density_map` would build.
+        """
+        if not self.placements:
+            return (~self.attacked).astype(float)
+        return self.density
@@ -0,0 +1,216 @@
+import argparse
+import os
+import struct
+import numpy as np
+from game_events import EventBus, ShotResult
+
+class ReplayRecorder:
+    """Appends every shot of every game to a binary log of fixed-width records.
+
+    Each record is 16 bytes: game id, turn, row, column, shooter seat, result
+    (0 miss, 1 hit, 2 sunk) and the index of the sunk ship in the game's fleet
+    (255 for none). Records are packed into a preallocated buffer and written in
+    blocks, so recording a shot costs one struct.pack_into call."""
+    RECORD = struct.Struct("<IIHHBBBx")
+    MISS, HIT, SUNK = 0, 1, 2
+    NO_SHIP = 255
+
+    def __init__(self, path, buffer_records=4096):
+        """
+        Opens the log for appending, cutting off a torn final record left by an interrupted write.
+
+        Args:
+            path (str): The log file, created if it does not exist.
+            buffer_records (int): Records held in memory between writes.
+        """
+        self.path = path
+        self.file = open(path, "ab")
+        # Records appended after a partial one would all be misaligned
+        self.file.truncate(self.file.seek(0, os.SEEK_END) // self.RECORD.size * self.RECORD.size)
+        self.buffer = bytearray(self.RECORD.size * buffer_records)
+        self.used = 0  # Bytes of the buffer holding records not yet written
+        self.ship_ids = {}  # Ship name -> index in the current game's fleet
+        self.game_id = self.last_game_id(path)
+        self.turn = 0
+        self.events = None  # Bus of the game being recorded
+
+    @staticmethod
+    def last_game_id(path):
+        """
+        Reads the id of the last game already in a log, so appended games get new ids.
+
+        Args:
+            path (str): The log file.
+
+        Returns:
+            int: The last game id, or 0 for an empty log.
+        """
+        size = os.path.getsize(path) // ReplayRecorder.RECORD.size * ReplayRecorder.RECORD.size
+        if not size:
+            return 0
+        with open(path, "rb") as f:
+            f.seek(size - ReplayRecorder.RECORD.size)
+            return ReplayRecorder.RECORD.unpack(f.read(ReplayRecorder.RECORD.size))[0]
+
+    def attach(self, players):
+        """
+        Starts recording a new game: every shot the players publish is logged under a fresh game id.
+
+        Args:
+            players (list): The game's players; their index is the seat stored in each record.
+
+        Returns:
+            int: The id of the new game.
+        """
+        self.game_id += 1
+        self.turn = 0
+        self.ship_ids = players[0].config.ship_ids
+        for seat, player in enumerate(players):
+            player.seat = seat
+        if self.events is not None:
+            self.events.unsubscribe(ShotResult, self.on_shot)
+        self.events = EventBus.of(players)
+        self.events.subscribe(ShotResult, self.on_shot)
+        return self.game_id
+
+    def on_shot(self, event):
+        """
+        Logs a Hit or Miss event of the current game.
+
+        Args:
+            event (ShotResult): The event.
+        """
+        self.record(event.shooter.seat, event.row, event.column, event.hit, event.sunk_ship)
+
+    def record(self, seat, row, column, hit, sunk_ship=None):
+        """
+        Logs one shot of the current game.
+
+        Args:
+            seat (int): The seat of the player who fired.
+            row (int): The row of the shot.
+            column (int): The column of the shot.
+            hit (bool): Whether the shot hit a ship.
+            sunk_ship (str, optional): The name of the ship the shot sank.
+        """
+        if sunk_ship:
+            result, ship = self.SUNK, self.ship_ids[sunk_ship]
+        else:
+            result, ship = (self.HIT if hit else self.MISS), self.NO_SHIP
+        self.RECORD.pack_into(self.buffer, self.used, self.game_id, self.turn, row, column, seat, result, ship)
+        self.turn += 1
+        self.used += self.RECORD.size
+        if self.used == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered records to the log."""
+        if self.used:
+            self.file.write(memoryview(self.buffer)[:self.used])
+            self.used = 0
+        self.file.flush()
+
+    def close(self):
+        """Writes the buffered records and closes the log."""
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ReplayLog:
+    """Read-only, memory-mapped view of a log written by ReplayRecorder.
+
+    The records are a NumPy structured array backed by the file, so slicing,
+    filtering and per-game statistics run over millions of games without
+    creating a Python object per shot."""
+    DTYPE = np.dtype([("game", "<u4"), ("turn", "<u4"), ("row", "<u2"), ("column", "<u2"),
+                      ("shooter", "u1"), ("result", "u1"), ("ship", "u1"), ("pad", "u1")])
+
+    def __init__(self, path):
+        """
+        Maps a log file.
+
+        Args:
+            path (str): The log file.
+        """
+        count = os.path.getsize(path) // self.DTYPE.itemsize  # A torn final record is ignored
+        if count:
+            self.records = np.memmap(path, dtype=self.DTYPE, mode="r", shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=self.DTYPE)  # mmap cannot map an empty file
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def game_bounds(self):
+        """
+        Finds where each game's records start and end.
+
+        Returns:
+            tuple: (game ids, start offsets, end offsets) as NumPy arrays.
+        """
+        games = self.records["game"]
+        if not len(games):
+            empty = np.zeros(0, dtype=np.int64)
+            return empty.astype(games.dtype), empty, empty
+        starts = np.concatenate(([0], np.flatnonzero(games[1:] != games[:-1]) + 1))
+        ends = np.append(starts[1:], len(games))
+        return np.asarray(games[starts]), starts, ends
+
+    def games(self):
+        """
+        Iterates over the games in the log.
+
+        Yields:
+            tuple: (game id, the game's records as a structured array view).
+        """
+        game_ids, starts, ends = self.game_bounds()
+        for game, start, end in zip(game_ids.tolist(), starts.tolist(), ends.tolist()):
+            yield game, self.records[start:end]
+
+    def game(self, game_id):
+        """
+        Returns the records of one game.
+
+        Args:
+            game_id (int): The id of the game.
+
+        Returns:
+            numpy.ndarray: The game's records, in turn order.
+        """
+        return self.records[self.records["game"] == game_id]
+
+    def shots_per_game(self):
+        """
+        Counts the shots of every game.
+
+        Returns:
+            tuple: (game ids, shots per game) as NumPy arrays.
+        """
+        game_ids, starts, ends = self.game_bounds()
+        return game_ids, ends - starts
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a Battleship replay log.")
+    parser.add_argument("path", help="log written by ReplayRecorder")
+    args = parser.parse_args()
+
+    log = ReplayLog(args.path)
+    game_ids, shots = log.shots_per_game()
+    results = log.records["result"]
+    print(f"Games:          {len(game_ids)}")
+    print(f"Shots:          {len(log)}")
+    if len(game_ids):
+        print(f"Shots per game: {shots.mean():.1f} (min {shots.min()}, max {shots.max()})")
+        print(f"Hit rate:       {np.count_nonzero(results != ReplayRecorder.MISS) / len(log):.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,249 @@
-from battleship_config import BOARD_SIZE
+from battleship_config import DEFAULT_CONFIG
+
+class BoardRow:
+    """A single row of a BoardGrid"""
+    def __init__(self, board, row):
+        """
+        Initializes the row view.
+
+        Args:
+            board (ShipManager): The board the row belongs to.
+            row (int): The index of the row.
+        """
+        self.board = board
+        self.row = row
+
+    def __len__(self):
+        return self.board.size
+
+    def __getitem__(self, column):
+        if not 0 <= column < self.board.size:
+            raise IndexError("column out of range")
+        return self.board.cell(self.row, column)
+
+    def __setitem__(self, column, mark):
+        if not 0 <= column < self.board.size:
+            raise IndexError("column out of range")
+        self.board.set_cell(self.row, column, mark)
+
+    def __iter__(self):
+        return (self.board.cell(self.row, column) for column in range(self.board.size))
+
+class BoardGrid:
+    """List-of-rows view of a ShipManager's bitboards, so grid[row][col] keeps working"""
+    def __init__(self, board):
+        """
+        Initializes the grid view.
+
+        Args:
+            board (ShipManager): The board to view.
+        """
+        self.board = board
+
+    def __len__(self):
+        return self.board.size
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.board.size:
+            raise IndexError("row out of range")
+        return BoardRow(self.board, row)
+
+    def __iter__(self):
+        return (BoardRow(self.board, row) for row in range(self.board.size))
 
 class ShipManager:
     """Manages the game board state and ship placements"""
-    def __init__(self, opponent):
+    def __init__(self, opponent, config=None):
         """
-        Initializes the ShipManager with an empty grid and ship tracking.
+        Initializes the ShipManager with an empty board and ship tracking.
+        Cells are stored as bits of Python ints, bit (row * size + column).
         
         Args:
             opponent (str): The name of the opponent.
+            config (GameConfig, optional): The game variant; defaults to config.json.
         """
-        self.grid = [[" "] * BOARD_SIZE for _ in range(BOARD_SIZE)]
-        self.ship_locations = {}  # Dictionary to track ship positions
+        self.config = config if config is not None else DEFAULT_CONFIG
+        self.size = self.config.board_size
+        self.ship_mask = 0  # Cells occupied by ships
+        self.hit_mask = 0  # Cells attacked with a hit
+        self.miss_mask = 0  # Cells attacked with a miss
+        self.grid = BoardGrid(self)  # Character view used by the displays
+        self.ship_locations = {}  # Dictionary to track ship positions, never modified by hits
+        self.cell_ships = {}  # (row, column) -> name of the ship on that cell
+        self.ship_health = {}  # Ship name -> cells not yet hit
+        self.ships_afloat = 0  # Number of ships with cells not yet hit
         self.opponent = opponent
 
+    def cell_bit(self, row, column):
+        """
+        Returns the bit representing a cell.
+
+        Args:
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+
+        Returns:
+            int: The single-bit mask of the cell.
+        """
+        return 1 << (row * self.size + column)
+
+    def placement_mask(self, row, column, orientation, length):
+        """
+        Returns the bits covered by a ship placement.
+
+        Args:
+            row (int): The starting row for the ship.
+            column (int): The starting column for the ship.
+            orientation (str): The orientation of the ship ('H' for horizontal, 'V' for vertical).
+            length (int): The length of the ship.
+
+        Returns:
+            int: The mask of the placement, or None if it leaves the board.
+        """
+        if not (0 <= row < self.size and 0 <= column < self.size):
+            return None
+        if orientation == "H":
+            if column + length > self.size:
+                return None
+            return ((1 << length) - 1) << (row * self.size + column)
+        if row + length > self.size:
+            return None
+        line = 0
+        for i in range(length):
+            line |= 1 << (i * self.size)
+        return line << (row * self.size + column)
+
+    @property
+    def attacked_mask(self):
+        """int: Cells that have already been attacked, hit or miss."""
+        return self.hit_mask | self.miss_mask
+
+    def has_ship(self, row, column):
+        """
+        Checks if a ship occupies a cell.
+
+        Args:
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+
+        Returns:
+            bool: True if a ship occupies the cell.
+        """
+        return bool(self.ship_mask >> (row * self.size + column) & 1)
+
+    def is_attacked(self, row, column):
+        """
+        Checks if a cell has already been attacked.
+
+        Args:
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+
+        Returns:
+            bool: True if the cell was hit or missed before.
+        """
+        return bool((self.hit_mask | self.miss_mask) >> (row * self.size + column) & 1)
+
+    def record_shot(self, row, column, hit):
+        """
+        Marks a cell as hit or missed.
+
+        Args:
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+            hit (bool): True for a hit, False for a miss.
+        """
+        if hit:
+            self.hit_mask |= self.cell_bit(row, column)
+        else:
+            self.miss_mask |= self.cell_bit(row, column)
+
+    def overlaps(self, row, column, orientation, length):
+        """
+        Checks if a ship placement leaves the board or touches another ship.
+
+        Args:
+            row (int): The starting row for the ship.
+            column (int): The starting column for the ship.
+            orientation (str): The orientation of the ship ('H' for horizontal, 'V' for vertical).
+            length (int): The length of the ship.
+
+        Returns:
+            bool: True if the placement is not possible.
+        """
+        mask = self.placement_mask(row, column, orientation, length)
+        return mask is None or bool(mask & self.ship_mask)
+
+    def placement_attacked(self, row, column, orientation, length):
+        """
+        Checks if a ship placement leaves the board or covers an attacked cell.
+
+        Args:
+            row (int): The starting row for the ship.
+            column (int): The starting column for the ship.
+            orientation (str): The orientation of the ship ('H' for horizontal, 'V' for vertical).
+            length (int): The length of the ship.
+
+        Returns:
+            bool: True if the placement is off the board or was already shot at.
+        """
+        mask = self.placement_mask(row, column, orientation, length)
+        return mask is None or bool(mask & self.attacked_mask)
+
+    def cell(self, row, column):
+        """
+        Returns the display character of a cell.
+
+        Args:
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+
+        Returns:
+            str: 'X' for a ship or hit, '-' for a miss, ' ' otherwise.
+        """
+        shift = row * self.size + column
+        if (self.ship_mask | self.hit_mask) >> shift & 1:
+            return "X"
+        if self.miss_mask >> shift & 1:
+            return "-"
+        return " "
+
+    def set_cell(self, row, column, mark):
+        """
+        Sets a cell from its display character: 'X' records a hit, '-' a miss
+        and ' ' clears the shot.
+
+        Args:
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+            mark (str): The display character.
+        """
+        bit = self.cell_bit(row, column)
+        self.hit_mask &= ~bit
+        self.miss_mask &= ~bit
+        if mark == "X":
+            self.hit_mask |= bit
+        elif mark == "-":
+            self.miss_mask |= bit
+
     def deploy_ship(self, ship, length, row, column, orientation):
         """
         Places a ship on the board and records its location.
         
+        Args:
+            ship (str): The name of the ship.
+            length (int): The length of the ship.
+            row (int): The starting row for the ship.
+            column (int): The starting column for the ship.
+            orientation (str): The orientation of the ship ('H' for horizontal, 'V' for vertical).
+        """
+        self.ship_mask |= self.placement_mask(row, column, orientation, length)
+        self.track_ship(ship, length, row, column, orientation)
+
+    def track_ship(self, ship, length, row, column, orientation):
+        """
+        Records a newly placed ship's cells and health.
+
         Args:
             ship (str): The name of the ship.
             length (int): The length of the ship.
@@ -25,54 +252,97 @@ class ShipManager:
             orientation (str): The orientation of the ship ('H' for horizontal, 'V' for vertical).
         """
         if orientation == "H":  # Horizontal placement
-            for i in range(column, column + length):
-                self.grid[row][i] = "X"
-                self.ship_locations.setdefault(ship, []).append((row, i))
+            cells = [(row, i) for i in range(column, column + length)]
         else:  # Vertical placement
-            for i in range(row, row + length):
-                self.grid[i][column] = "X"
-                self.ship_locations.setdefault(ship, []).append((i, column))
+            cells = [(i, column) for i in range(row, row + length)]
+        self.ship_locations.setdefault(ship, []).extend(cells)
+        for cell in cells:
+            self.cell_ships[cell] = ship
+        if not self.ship_health.get(ship):
+            self.ships_afloat += 1
+        self.ship_health[ship] = self.ship_health.get(ship, 0) + length
 
-    def check_sunk_ship(self, row, column):
+    def resolve_hit(self, row, column):
         """
-        Checks if a ship has been sunk and updates the ship locations.
-        
+        Records a hit on this board and updates the hit ship's remaining cells.
+        Hitting the same cell twice has no further effect.
+
         Args:
             row (int): The row of the attack.
             column (int): The column of the attack.
+
+        Returns:
+            str: The name of the ship sunk by this hit, or None.
+        """
+        bit = self.cell_bit(row, column)
+        if self.hit_mask & bit:
+            return None
+        self.hit_mask |= bit
+        return self.damage_ship(row, column)
+
+    def damage_ship(self, row, column):
         """
-        for ship, positions in self.ship_locations.items():
-            if (row, column) in positions:
-                positions.remove((row, column))
-                if not positions:
-                    print("\n*******************************************")
-                    print(f"\033[1m        {self.opponent} has sunk the {ship}!\033[0m")
-                    print("*******************************************\n")
-                    del self.ship_locations[ship]
-                    break
-    
-    def check_sunk_ship_gui(self, row, column):
-        """
-        Checks if a ship has been sunk and updates the ship locations.
-        Returns the name of the ship if it was sunk.
-        In GUI mode, doesn't print to console.
+        Takes one cell off the health of the ship on a newly hit cell.
+
+        Args:
+            row (int): The row of the hit.
+            column (int): The column of the hit.
+
+        Returns:
+            str: The name of the ship if this hit sank it, or None.
+        """
+        ship = self.cell_ships.get((row, column))
+        if ship is None:
+            return None
+        self.ship_health[ship] -= 1
+        if self.ship_health[ship]:
+            return None
+        self.ships_afloat -= 1
+        return ship
+
+    def is_sunk(self, ship):
+        """
+        Checks if a ship has been sunk.
+
+        Args:
+            ship (str): The name of the ship.
+
+        Returns:
+            bool: True if every cell of the ship has been hit.
+        """
+        return self.ship_health.get(ship) == 0
+
+    def reset(self):
+        """Clears every shot while keeping the ships where they are, ready for a new game."""
+        self.hit_mask = 0
+        self.miss_mask = 0
+        self.ship_health = {ship: len(cells) for ship, cells in self.ship_locations.items()}
+        self.ships_afloat = len(self.ship_health)
+
+    def clear(self):
+        """Removes every ship and shot, leaving an empty board for a new game."""
+        self.ship_mask = 0
+        self.hit_mask = 0
+        self.miss_mask = 0
+        self.ship_locations.clear()
+        self.cell_ships.clear()
+        self.ship_health.clear()
+        self.ships_afloat = 0
+
+    def check_sunk_ship(self, row, column):
+        """
+        Checks if a hit sank a ship. Announcing it is left to the Sunk event.
         
         Args:
             row (int): The row of the attack.
             column (int): The column of the attack.
-            
+
         Returns:
             str: The name of the ship that was sunk, or None if no ship was sunk.
         """
-        for ship, positions in self.ship_locations.items():
-            if (row, column) in positions:
-                positions.remove((row, column))
-                if not positions:
-                    sunk_ship = ship
-                    # Don't print to console in GUI mode
-                    del self.ship_locations[ship]
-                    return sunk_ship
-        return None
+        return self.resolve_hit(row, column)
+
+    check_sunk_ship_gui = check_sunk_ship  # Former silent variant, kept for existing callers
 
     def all_ships_sunk(self):
         """
@@ -81,4 +351,180 @@ class ShipManager:
         Returns:
             bool: True if all ships are sunk, False otherwise.
         """
-        return all(not positions for positions in self.ship_locations.values()) 
\ No newline at end of file
+        return self.ships_afloat == 0
+
+class SparseShipManager(ShipManager):
+    """ShipManager for huge, mostly empty boards: only ship cells and shots are
+    stored, as sets of cell numbers (row * size + column), so memory grows with
+    the fleet and the number of shots instead of with the board area"""
+    MIN_SIZE = 2048  # Narrower boards keep the bitboards, which are faster
+    MAX_DENSITY = 0.01  # Largest share of cells the fleet may cover
+
+    def __init__(self, opponent, config=None):
+        """
+        Initializes the SparseShipManager with an empty board and ship tracking.
+
+        Args:
+            opponent (str): The name of the opponent.
+            config (GameConfig, optional): The game variant; defaults to config.json.
+        """
+        self.ship_cells = set()  # Cells occupied by ships
+        self.hit_cells = set()  # Cells attacked with a hit
+        self.miss_cells = set()  # Cells attacked with a miss
+        super().__init__(opponent, config)
+
+    @staticmethod
+    def suits(size, fleet_cells):
+        """
+        Checks if a board is large and sparse enough for this backend.
+
+        Args:
+            size (int): The width of the board.
+            fleet_cells (int): The number of cells covered by the fleet.
+
+        Returns:
+            bool: True if the sparse backend should be used.
+        """
+        return size >= SparseShipManager.MIN_SIZE and fleet_cells <= SparseShipManager.MAX_DENSITY * size * size
+
+    @staticmethod
+    def cells_to_mask(cells):
+        """Builds a bitboard from cell numbers."""
+        mask = 0
+        for cell in cells:
+            mask |= 1 << cell
+        return mask
+
+    @staticmethod
+    def mask_to_cells(mask):
+        """Lists the set bits of a bitboard as cell numbers."""
+        cells = set()
+        while mask:
+            low = mask & -mask
+            cells.add(low.bit_length() - 1)
+            mask ^= low
+        return cells
+
+    # The bitboard attributes are still available for callers that need them,
+    # but building them costs time and memory proportional to the board area.
+    @property
+    def ship_mask(self):
+        """int: Cells occupied by ships, as a bitboard."""
+        return self.cells_to_mask(self.ship_cells)
+
+    @ship_mask.setter
+    def ship_mask(self, mask):
+        self.ship_cells = self.mask_to_cells(mask)
+
+    @property
+    def hit_mask(self):
+        """int: Cells attacked with a hit, as a bitboard."""
+        return self.cells_to_mask(self.hit_cells)
+
+    @hit_mask.setter
+    def hit_mask(self, mask):
+        self.hit_cells = self.mask_to_cells(mask)
+
+    @property
+    def miss_mask(self):
+        """int: Cells attacked with a miss, as a bitboard."""
+        return self.cells_to_mask(self.miss_cells)
+
+    @miss_mask.setter
+    def miss_mask(self, mask):
+        self.miss_cells = self.mask_to_cells(mask)
+
+    def placement_cells(self, row, column, orientation, length):
+        """
+        Returns the cells covered by a ship placement.
+
+        Args:
+            row (int): The starting row for the ship.
+            column (int): The starting column for the ship.
+            orientation (str): The orientation of the ship ('H' for horizontal, 'V' for vertical).
+            length (int): The length of the ship.
+
+        Returns:
+            range: The cell numbers of the placement, or None if it leaves the board.
+        """
+        if not (0 <= row < self.size and 0 <= column < self.size):
+            return None
+        start = row * self.size + column
+        if orientation == "H":
+            if column + length > self.size:
+                return None
+            return range(start, start + length)
+        if row + length > self.size:
+            return None
+        return range(start, start + length * self.size, self.size)
+
+    def has_ship(self, row, column):
+        """Checks if a ship occupies a cell, with one set lookup."""
+        return row * self.size + column in self.ship_cells
+
+    def is_attacked(self, row, column):
+        """Checks if a cell was hit or missed before."""
+        cell = row * self.size + column
+        return cell in self.hit_cells or cell in self.miss_cells
+
+    def record_shot(self, row, column, hit):
+        """Adds a shot to the hit or miss set."""
+        (self.hit_cells if hit else self.miss_cells).add(row * self.size + column)
+
+    def overlaps(self, row, column, orientation, length):
+        """Checks if a placement leaves the board or shares a cell with a ship."""
+        cells = self.placement_cells(row, column, orientation, length)
+        return cells is None or not self.ship_cells.isdisjoint(cells)
+
+    def placement_attacked(self, row, column, orientation, length):
+        """Checks if a placement leaves the board or covers a shot."""
+        cells = self.placement_cells(row, column, orientation, length)
+        return cells is None or not (self.hit_cells.isdisjoint(cells) and self.miss_cells.isdisjoint(cells))
+
+    def cell(self, row, column):
+        """Returns 'X' for a ship or hit, '-' for a miss, ' ' otherwise."""
+        cell = row * self.size + column
+        if cell in self.ship_cells or cell in self.hit_cells:
+            return "X"
+        if cell in self.miss_cells:
+            return "-"
+        return " "
+
+    def set_cell(self, row, column, mark):
+        """Records 'X' as a hit and '-' as a miss; ' ' clears the shot."""
+        cell = row * self.size + column
+        self.hit_cells.discard(cell)
+        self.miss_cells.discard(cell)
+        if mark == "X":
+            self.hit_cells.add(cell)
+        elif mark == "-":
+            self.miss_cells.add(cell)
+
+    def deploy_ship(self, ship, length, row, column, orientation):
+        """Places a ship by adding its cells to the ship set."""
+        self.ship_cells.update(self.placement_cells(row, column, orientation, length))
+        self.track_ship(ship, length, row, column, orientation)
+
+    def resolve_hit(self, row, column):
+        """Records a hit; returns the name of the ship it sank, or None."""
+        cell = row * self.size + column
+        if cell in self.hit_cells:
+            return None
+        self.hit_cells.add(cell)
+        return self.damage_ship(row, column)
+
+def create_board(opponent, config=None):
+    """
+    Creates the board backend that suits the board and fleet of a game variant.
+
+    Args:
+        opponent (str): The name of the opponent.
+        config (GameConfig, optional): The game variant; defaults to config.json.
+
+    Returns:
+        ShipManager: A SparseShipManager for huge, sparse boards, otherwise a ShipManager.
+    """
+    config = config if config is not None else DEFAULT_CONFIG
+    if SparseShipManager.suits(config.board_size, config.fleet_cells):
+        return SparseShipManager(opponent, config)
+    return ShipManager(opponent, config)
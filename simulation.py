@@ -0,0 +1,178 @@
+import argparse
+import random
+import time
+from collections import Counter
+from battleship_config import ConfigError, GameConfig
+from computer_player import ComputerPlayer
+from game_setup import GameSetup
+from replay_log import ReplayRecorder
+import metrics
+
+class SimulationReport:
+    """Aggregated results of a batch of AI-vs-AI games"""
+    def __init__(self):
+        """Initializes an empty report."""
+        self.games = 0
+        self.moves = 0
+        self.elapsed = 0.0  # Wall-clock seconds spent playing
+        self.wins = [0, 0]  # Games won by the first and second player
+        self.shots_to_win = Counter()  # Winner's shot count -> number of games
+
+    def add_game(self, winner, winner_shots, moves):
+        """
+        Records the result of one game.
+
+        Args:
+            winner (int): Index of the winning player (0 moves first).
+            winner_shots (int): Number of shots the winner fired.
+            moves (int): Total shots fired by both players.
+        """
+        self.games += 1
+        self.moves += moves
+        self.wins[winner] += 1
+        self.shots_to_win[winner_shots] += 1
+
+    def merge(self, other):
+        """
+        Adds another report's results into this one.
+
+        Args:
+            other (SimulationReport): The report to merge in.
+        """
+        self.games += other.games
+        self.moves += other.moves
+        self.elapsed += other.elapsed
+        self.wins[0] += other.wins[0]
+        self.wins[1] += other.wins[1]
+        self.shots_to_win.update(other.shots_to_win)
+
+    @property
+    def games_per_second(self):
+        """float: Games completed per wall-clock second."""
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def moves_per_second(self):
+        """float: Shots fired per wall-clock second."""
+        return self.moves / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        """
+        Formats the report for the console.
+
+        Returns:
+            str: A multi-line summary.
+        """
+        lines = [
+            f"Games:          {self.games}",
+            f"Moves:          {self.moves}",
+            f"Games/sec:      {self.games_per_second:.1f}",
+            f"Moves/sec:      {self.moves_per_second:.1f}",
+            f"Wins:           first {self.wins[0]}, second {self.wins[1]}",
+            "Shots to win:",
+        ]
+        for shots in sorted(self.shots_to_win):
+            lines.append(f"  {shots:>4}: {self.shots_to_win[shots]}")
+        return "\n".join(lines)
+
+class BatchSimulator:
+    """Plays complete ComputerPlayer-vs-ComputerPlayer games with no console or display"""
+    def __init__(self, seed=None, incremental=None, time_budget=None, recorder=None, config=None):
+        """
+        Initializes the simulator.
+
+        Args:
+            seed (int, optional): Seed for reproducible fleets and moves.
+            incremental (bool, optional): Use incremental probability maps for both players;
+                by default only on large boards.
+            time_budget (float, optional): Per-move Monte-Carlo budget in seconds for both players.
+            recorder (ReplayRecorder, optional): Replay log receiving every shot of every game.
+            config (GameConfig, optional): The game variant to play; defaults to config.json.
+        """
+        self.rng = random.Random(seed)
+        self.incremental = incremental
+        self.time_budget = time_budget
+        self.recorder = recorder
+        self.setup = GameSetup(config)
+        self.config = self.setup.config
+
+    def play_game(self, rng=None):
+        """
+        Plays one game between two fresh computer players.
+
+        Args:
+            rng (random.Random, optional): Random source for this game; defaults to the simulator's.
+
+        Returns:
+            tuple: (winner index, winner's shot count, total shots fired).
+        """
+        rng = rng if rng is not None else self.rng
+        players = [ComputerPlayer(rng, self.incremental, self.time_budget, self.config) for _ in range(2)]
+        for player in players:
+            player.set_gui_mode(True)  # Keep the move path silent
+            self.setup.deploy_random_fleet(player, rng)
+        metrics.watch(players)
+        if self.recorder is not None:
+            self.recorder.attach(players)
+
+        shots = [0, 0]
+        current = 0
+        while True:
+            players[current].take_turn(players[1 - current])
+            shots[current] += 1
+            if players[1 - current].ship_manager.all_ships_sunk():
+                return current, shots[current], shots[0] + shots[1]
+            current = 1 - current
+
+    def run(self, games):
+        """
+        Plays a batch of games.
+
+        Args:
+            games (int): The number of games to play.
+
+        Returns:
+            SimulationReport: The results of the batch.
+        """
+        report = SimulationReport()
+        start = time.perf_counter()
+        for _ in range(games):
+            report.add_game(*self.play_game())
+        report.elapsed = time.perf_counter() - start
+        return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless AI-vs-AI Battleship games.")
+    parser.add_argument("-n", "--games", type=int, default=100, help="number of games to play")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible runs")
+    parser.add_argument("--incremental", action="store_true", default=None,
+                        help="use incremental probability maps (always on for large boards)")
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="per-move Monte-Carlo targeting budget in seconds")
+    parser.add_argument("--record", default=None, help="append every shot to this replay log")
+    parser.add_argument("--config", default=None, help="JSON file with the board size and fleet to play, "
+                        "laid out like config.json")
+    parser.add_argument("--metrics", choices=("summary", "json", "prometheus"), default=None,
+                        help="time the hot paths and print the measurements in this format")
+    args = parser.parse_args()
+
+    config = None
+    if args.config:
+        try:
+            config = GameConfig.load(args.config)
+        except (OSError, ConfigError) as e:
+            parser.error(str(e))
+    recorder = ReplayRecorder(args.record) if args.record else None
+    if args.metrics:
+        metrics.enable()
+    try:
+        report = BatchSimulator(args.seed, args.incremental, args.time_budget, recorder, config).run(args.games)
+    finally:
+        if recorder is not None:
+            recorder.close()
+    print(report.summary())
+    if args.metrics:
+        print(metrics.export(args.metrics))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# What each kind of process runs before it can take its first input
+ENTRY_POINTS = {
+    "cli": "import main, cli_gameplay; cli_gameplay.CLIGamePlay()",
+    "server": "import game_server",
+    "gui": "import main, gui_gameplay",
+}
+HEAVY_MODULES = ("numpy", "tkinter")  # Must stay off the CLI start-up path
+BASELINE = "pass"  # The bare interpreter, subtracted to show what the game itself costs
+
+class StartupSample:
+    """One start-up measured with -X importtime"""
+    def __init__(self, seconds, imports):
+        """
+        Initializes the sample.
+
+        Args:
+            seconds (float): Wall-clock time of the whole process.
+            imports (dict): Module name -> (self, cumulative) import time in microseconds.
+        """
+        self.seconds = seconds
+        self.imports = imports
+
+    @staticmethod
+    def parse_importtime(output):
+        """
+        Parses the report printed by `python -X importtime`.
+
+        Args:
+            output (str): The interpreter's stderr.
+
+        Returns:
+            dict: Module name -> (self, cumulative) import time in microseconds.
+        """
+        imports = {}
+        for line in output.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            imports[name.strip()] = (int(self_us), int(cumulative_us))
+        return imports
+
+    def heavy_modules(self):
+        """
+        Lists the heavy modules this start-up imported.
+
+        Returns:
+            list: Names from HEAVY_MODULES that were loaded.
+        """
+        return [heavy for heavy in HEAVY_MODULES
+                if any(name == heavy or name.startswith(heavy + ".") for name in self.imports)]
+
+    def slowest(self, count=5):
+        """
+        Finds the modules whose own code took longest to import.
+
+        Args:
+            count (int): The number of modules to return.
+
+        Returns:
+            list: (name, self microseconds) pairs, slowest first.
+        """
+        ranked = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)
+        return [(name, times[0]) for name, times in ranked[:count]]
+
+def measure(statement, cache_dir=None):
+    """
+    Starts a fresh interpreter that runs a statement, timing it and its imports.
+
+    Args:
+        statement (str): The Python code to run.
+        cache_dir (str, optional): Bytecode cache directory (PYTHONPYCACHEPREFIX); an
+            empty one gives a cold start that compiles every module, standard library included.
+
+    Returns:
+        StartupSample: The measurement.
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    if cache_dir is not None:
+        env["PYTHONPYCACHEPREFIX"] = cache_dir
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), env=env, check=True)
+    return StartupSample(time.perf_counter() - start, StartupSample.parse_importtime(result.stderr))
+
+def benchmark(statement, runs=5):
+    """
+    Measures cold and warm start-ups of a statement.
+
+    Args:
+        statement (str): The Python code to run.
+        runs (int): Start-ups of each kind; the median is reported.
+
+    Returns:
+        tuple: (median cold seconds, median warm seconds, last warm StartupSample).
+    """
+    cold = []
+    warm = []
+    sample = None
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold.append(measure(statement, cache_dir).seconds)
+            sample = measure(statement, cache_dir)  # Same cache, now filled
+            warm.append(sample.seconds)
+    return statistics.median(cold), statistics.median(warm), sample
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold and warm start-up time of the game's entry points.")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="start-ups per entry point and kind")
+    parser.add_argument("--check", action="store_true",
+                        help="exit with an error if the CLI start-up imports NumPy or Tk")
+    args = parser.parse_args()
+
+    base_cold, base_warm, _ = benchmark(BASELINE, args.runs)
+    print(f"{'entry':<8}{'cold ms':>10}{'warm ms':>10}{'over bare':>11}  heavy imports / slowest imports")
+    print(f"{'python':<8}{base_cold * 1000:>10.1f}{base_warm * 1000:>10.1f}{0:>11.1f}")
+    failed = False
+    for entry, statement in ENTRY_POINTS.items():
+        cold, warm, sample = benchmark(statement, args.runs)
+        heavy = sample.heavy_modules()
+        slowest = ", ".join(f"{name} {us / 1000:.1f}" for name, us in sample.slowest(3))
+        print(f"{entry:<8}{cold * 1000:>10.1f}{warm * 1000:>10.1f}{(warm - base_warm) * 1000:>11.1f}  "
+              f"{'+'.join(heavy) or '-'} / {slowest}")
+        failed = failed or (entry == "cli" and bool(heavy))
+    if args.check and failed:
+        print("The CLI start-up path imports a heavy module.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
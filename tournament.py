@@ -0,0 +1,124 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from battleship_config import ConfigError, GameConfig
+from simulation import BatchSimulator, SimulationReport
+
+_simulator = None  # One simulator per worker process, created on first use
+
+def game_rng(seed, index):
+    """
+    Creates the random source for one game of a tournament.
+    Every game gets its own stream derived from the master seed and its index,
+    so results do not depend on which worker plays it.
+
+    Args:
+        seed (int): The tournament's master seed.
+        index (int): The index of the game in the tournament.
+
+    Returns:
+        random.Random: The game's random source.
+    """
+    return random.Random(f"{seed}:{index}")
+
+def play_chunk(seed, start, count, config=None):
+    """
+    Plays a contiguous block of tournament games inside a worker process.
+
+    Args:
+        seed (int): The tournament's master seed.
+        start (int): Index of the first game in the block.
+        count (int): Number of games in the block.
+        config (GameConfig, optional): The game variant to play; defaults to config.json.
+
+    Returns:
+        SimulationReport: The merged results of the block.
+    """
+    global _simulator
+    if config is not None:
+        config = GameConfig.intern(config)  # Each block arrives unpickled: share one config per worker
+    if _simulator is None or (config is not None and _simulator.config is not config):
+        _simulator = BatchSimulator(config=config)
+    report = SimulationReport()
+    for index in range(start, start + count):
+        report.add_game(*_simulator.play_game(game_rng(seed, index)))
+    return report
+
+class Tournament:
+    """Shards AI-vs-AI games across a pool of worker processes"""
+    def __init__(self, games, seed=0, workers=None, chunk_size=500, config=None):
+        """
+        Initializes the tournament.
+
+        Args:
+            games (int): Total number of games to play.
+            seed (int): Master seed; the same seed always gives the same results.
+            workers (int, optional): Number of worker processes, defaults to the CPU count.
+            chunk_size (int): Games per task sent to a worker, to keep IPC overhead low.
+            config (GameConfig, optional): The game variant to play; defaults to config.json.
+        """
+        self.games = games
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.config = config
+
+    def chunks(self):
+        """
+        Splits the tournament into blocks of games.
+
+        Yields:
+            tuple: (start index, number of games) for each block.
+        """
+        for start in range(0, self.games, self.chunk_size):
+            yield start, min(self.chunk_size, self.games - start)
+
+    def run(self):
+        """
+        Plays every game, merging block results as they stream back.
+        Only a few blocks per worker are in flight at once, so memory stays
+        bounded however many games are played.
+
+        Returns:
+            SimulationReport: The results of the whole tournament.
+        """
+        report = SimulationReport()
+        start_time = time.perf_counter()
+        chunks = self.chunks()
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = set()
+            for start, count in chunks:
+                pending.add(executor.submit(play_chunk, self.seed, start, count, self.config))
+                if len(pending) >= self.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        report.merge(future.result())
+            for future in pending:
+                report.merge(future.result())
+        # Worker time overlaps, so report the tournament's own wall-clock time
+        report.elapsed = time.perf_counter() - start_time
+        return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a multi-process AI-vs-AI Battleship tournament.")
+    parser.add_argument("-n", "--games", type=int, default=10000, help="number of games to play")
+    parser.add_argument("--seed", type=int, default=0, help="master seed")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="games per worker task")
+    parser.add_argument("--config", default=None, help="JSON file with the board size and fleet to play, "
+                        "laid out like config.json")
+    args = parser.parse_args()
+
+    config = None
+    if args.config:
+        try:
+            config = GameConfig.load(args.config)
+        except (OSError, ConfigError) as e:
+            parser.error(str(e))
+    report = Tournament(args.games, args.seed, args.workers, args.chunk_size, config).run()
+    print(report.summary())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import argparse
+import glob
+import os
+import random
+import time
+import numpy as np
+from battleship_config import DEFAULT_CONFIG, ConfigError, GameConfig
+from computer_player import ComputerPlayer
+from fleet_generator import FleetGenerator
+from replay_log import ReplayRecorder
+
+def play_states(players):
+    """
+    Plays one AI-vs-AI game and yields every move with the state it was chosen from.
+
+    Args:
+        players (list): Two ComputerPlayer objects with their fleets deployed.
+
+    Yields:
+        tuple: (shooter's hit bitboard, miss bitboard and afloat ship bits before the move,
+            cell index of the move, outcome as ReplayRecorder.MISS, HIT or SUNK).
+    """
+    config = players[0].config
+    ship_bits = {ship: 1 << i for ship, i in config.ship_ids.items()}
+    all_ships = (1 << len(ship_bits)) - 1
+    current = 0
+    while True:
+        shooter, opponent = players[current], players[1 - current]
+        board = shooter.attack_board
+        afloat = all_ships
+        for ship in shooter.sunk_ships:
+            afloat &= ~ship_bits[ship]
+        hit_mask, miss_mask = board.hit_mask, board.miss_mask
+        shooter.take_turn(opponent)
+        row, column = shooter.last_move
+        if shooter.last_move_sunk:
+            outcome = ReplayRecorder.SUNK
+        else:
+            outcome = ReplayRecorder.HIT if shooter.last_move_hit else ReplayRecorder.MISS
+        yield hit_mask, miss_mask, afloat, row * config.board_size + column, outcome
+        if opponent.ship_manager.all_ships_sunk():
+            return
+        current = 1 - current
+
+def simulated_states(games, seed=None, incremental=None, config=None):
+    """
+    Streams the states of many simulated games, one game in memory at a time.
+
+    Args:
+        games (int): The number of games to play.
+        seed (int, optional): Seed for reproducible fleets and moves.
+        incremental (bool, optional): Use incremental probability maps; by default only on large boards.
+        config (GameConfig, optional): The game variant to play; defaults to config.json.
+
+    Yields:
+        tuple: The states of `play_states`, game after game.
+    """
+    rng = random.Random(seed)
+    config = config if config is not None else DEFAULT_CONFIG
+    for _ in range(games):
+        players = [ComputerPlayer(rng, incremental, config=config) for _ in range(2)]
+        for player in players:
+            player.set_gui_mode(True)
+            FleetGenerator(player.validator, config.ship_types, rng).deploy(player.ship_manager)
+        yield from play_states(players)
+
+class ShardWriter:
+    """Encodes states into int8 planes and writes them as fixed-size .npy shards.
+
+    Each shard is one structured array with fields "board" (int8, shape
+    (2, size, size): hit and miss planes), "fleet" (int8 per ship type, 1 while
+    afloat), "move" (cell index) and "outcome". States are packed as raw bytes
+    into preallocated buffers and unpacked into planes a whole shard at a time,
+    so memory stays at one shard however many states pass through and no object
+    outlives its state. Shards open with numpy.load(path, mmap_mode="r")."""
+    def __init__(self, directory, shard_size=65536, prefix="shard", config=None):
+        """
+        Initializes the writer.
+
+        Args:
+            directory (str): Output directory, created if missing.
+            shard_size (int): States per shard; only the last shard may be shorter.
+            prefix (str): File name prefix of the shards.
+            config (GameConfig, optional): The game variant the states come from; defaults to config.json.
+
+        Raises:
+            FileExistsError: If the directory already holds shards with this prefix, which this writer
+                would partly overwrite and `load_shards` would mix into its output.
+        """
+        os.makedirs(directory, exist_ok=True)
+        if glob.glob(os.path.join(directory, f"{prefix}-*.npy")):
+            raise FileExistsError(f"{directory} already holds {prefix}-*.npy shards; "
+                                  f"export into an empty directory.")
+        self.directory = directory
+        self.shard_size = shard_size
+        self.prefix = prefix
+        self.config = config if config is not None else DEFAULT_CONFIG
+        size = self.config.board_size
+        self.ship_count = len(self.config.ship_names)
+        self.cells = size * size
+        self.mask_bytes = (self.cells + 7) // 8
+        self.fleet_bytes = (self.ship_count + 7) // 8
+        self.row_bytes = 2 * self.mask_bytes + self.fleet_bytes
+        self.dtype = np.dtype([("board", "i1", (2, size, size)), ("fleet", "i1", (self.ship_count,)),
+                               ("move", "<i4"), ("outcome", "i1")])
+        self.packed = bytearray(shard_size * self.row_bytes)  # Hit, miss and afloat bits of each state
+        self.moves = np.zeros(shard_size, dtype="<i4")
+        self.outcomes = bytearray(shard_size)
+        self.used = 0  # States in the buffers not yet written
+        self.paths = []  # Shards written so far
+        self.states = 0  # States written so far
+
+    def append(self, hit_mask, miss_mask, afloat, move, outcome):
+        """
+        Stores one state in the current shard, writing the shard out when it is full.
+
+        Args:
+            hit_mask (int): Bitboard of the shooter's hits.
+            miss_mask (int): Bitboard of the shooter's misses.
+            afloat (int): Bit per ship type still afloat, in fleet order.
+            move (int): Cell index (row * size + column) of the chosen move.
+            outcome (int): ReplayRecorder.MISS, HIT or SUNK.
+        """
+        i = self.used
+        offset = i * self.row_bytes
+        mask_bytes = self.mask_bytes
+        self.packed[offset:offset + mask_bytes] = hit_mask.to_bytes(mask_bytes, "little")
+        offset += mask_bytes
+        self.packed[offset:offset + mask_bytes] = miss_mask.to_bytes(mask_bytes, "little")
+        offset += mask_bytes
+        self.packed[offset:offset + self.fleet_bytes] = afloat.to_bytes(self.fleet_bytes, "little")
+        self.moves[i] = move
+        self.outcomes[i] = outcome
+        self.used = i + 1
+        if self.used == self.shard_size:
+            self.flush()
+
+    def extend(self, states):
+        """
+        Consumes a stream of states.
+
+        Args:
+            states (iterable): Tuples accepted by `append`.
+
+        Returns:
+            ShardWriter: This writer.
+        """
+        append = self.append
+        for state in states:
+            append(*state)
+        return self
+
+    def encode(self):
+        """
+        Unpacks the buffered states into int8 planes.
+
+        Returns:
+            numpy.ndarray: The buffered states as a structured array of `dtype`.
+        """
+        used = self.used
+        rows = np.frombuffer(self.packed, np.uint8, count=used * self.row_bytes).reshape(used, self.row_bytes)
+        states = np.empty(used, dtype=self.dtype)
+        boards = rows[:, :2 * self.mask_bytes].reshape(used, 2, self.mask_bytes)
+        states["board"] = np.unpackbits(boards, axis=2, count=self.cells,
+                                        bitorder="little").reshape(used, 2, self.config.board_size,
+                                                                   self.config.board_size)
+        states["fleet"] = np.unpackbits(rows[:, 2 * self.mask_bytes:], axis=1, count=self.ship_count,
+                                        bitorder="little")
+        states["move"] = self.moves[:used]
+        states["outcome"] = np.frombuffer(self.outcomes, np.uint8, count=used)
+        return states
+
+    def flush(self):
+        """Writes the buffered states as a new shard."""
+        if not self.used:
+            return
+        path = os.path.join(self.directory, f"{self.prefix}-{len(self.paths):05d}.npy")
+        np.save(path, self.encode())
+        self.paths.append(path)
+        self.states += self.used
+        self.used = 0
+
+    def close(self):
+        """Writes the last, possibly partial, shard."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def load_shards(directory, prefix="shard"):
+    """
+    Memory-maps the shards in a directory, in order, without reading them into memory.
+
+    Args:
+        directory (str): The directory the shards were written to.
+        prefix (str): File name prefix of the shards.
+
+    Yields:
+        numpy.ndarray: One read-only structured array per shard.
+    """
+    for path in sorted(glob.glob(os.path.join(directory, f"{prefix}-*.npy"))):
+        yield np.load(path, mmap_mode="r")
+
+def main():
+    parser = argparse.ArgumentParser(description="Export AI-vs-AI game states as sharded .npy training data.")
+    parser.add_argument("directory", help="output directory for the shards")
+    parser.add_argument("-n", "--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("--shard-size", type=int, default=65536, help="states per shard")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible runs")
+    parser.add_argument("--config", default=None, help="JSON file with the board size and fleet to play, "
+                        "laid out like config.json")
+    args = parser.parse_args()
+    if args.shard_size < 1:
+        parser.error("--shard-size must be at least 1")
+
+    config = DEFAULT_CONFIG
+    if args.config:
+        try:
+            config = GameConfig.load(args.config)
+        except (OSError, ConfigError) as e:
+            parser.error(str(e))
+    start = time.perf_counter()
+    try:
+        writer = ShardWriter(args.directory, args.shard_size, config=config)
+    except OSError as e:
+        parser.error(str(e))
+    with writer:
+        writer.extend(simulated_states(args.games, args.seed, config=config))
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {writer.states} states from {args.games} games to {len(writer.paths)} shards "
+          f"in {elapsed:.1f} s ({writer.states / elapsed:.0f} states/sec)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import argparse
+import random
+import time
+import numpy as np
+from battleship_config import DEFAULT_CONFIG
+from board_validator import BoardValidator
+from fleet_generator import FleetGenerator
+from probability_engine import ProbabilityEngine
+
+class VectorEnv:
+    """Many single-shooter games stepped together with NumPy array operations.
+
+    Each of the B games is one shooter against a hidden random fleet of the
+    config's ships (config.json's SHIP_TYPES by default). The boards are stacked
+    arrays: `ships` (int8, B x N x N) holds the fleet index of the ship on each
+    cell or -1 for water, `shots` and `hits` (bool, B x N x N) the cells fired
+    at and the hits among them. `step` fires one shot in every game at once
+    and returns per-game hit, sunk and done vectors; finished games are dealt a
+    fresh fleet before the call returns, so a batch never has idle slots. No
+    Python object exists per game, so policies can score whole batches in one
+    array expression."""
+    MAX_PLACEMENT_ROUNDS = 1000  # Batched redraws before a crowded fleet falls back to backtracking
+    REDRAWS = 4  # Blind redraws of random actions before choosing among the free cells
+
+    def __init__(self, batch_size, config=None, seed=None):
+        """
+        Initializes the batch and deals every game a random fleet.
+
+        Args:
+            batch_size (int): The number of games played side by side.
+            config (GameConfig, optional): The board size and fleet; defaults to config.json.
+            seed (int, optional): Seed for reproducible fleets and random actions.
+        """
+        self.config = config if config is not None else DEFAULT_CONFIG
+        self.batch_size = batch_size
+        self.size = size = self.config.board_size
+        self.rng = np.random.default_rng(seed)
+        self.validator = BoardValidator(self.config)
+        # Cells of every placement per ship, shared with every validator of this board size
+        self.cell_tables = [self.validator.placement_index(length).cell_table
+                            for length in self.config.fleet_lengths]
+        self.lengths = np.array(self.config.fleet_lengths, dtype=np.int16)
+        self.ships = np.full((batch_size, size, size), -1, dtype=np.int8)
+        self.shots = np.zeros((batch_size, size, size), dtype=bool)
+        self.hits = np.zeros((batch_size, size, size), dtype=bool)
+        # Flat (B, N * N) views of the boards, indexed by cell number
+        self.ship_cells = self.ships.reshape(batch_size, -1)
+        self.shot_cells = self.shots.reshape(batch_size, -1)
+        self.hit_cells = self.hits.reshape(batch_size, -1)
+        self.health = np.zeros((batch_size, len(self.lengths)), dtype=np.int16)  # Unhit cells of each ship
+        self.afloat = np.zeros(batch_size, dtype=np.int16)  # Ships not yet sunk
+        self.moves = np.zeros(batch_size, dtype=np.int32)  # Shots fired in the current game
+        self.final_moves = np.zeros(batch_size, dtype=np.int32)  # Shots of each slot's last finished game
+        self.games = np.arange(batch_size)
+        self.acceptance = 0.5  # Running share of random layouts without overlaps
+        self.total_moves = 0
+        self.total_games = 0  # Games finished so far
+        self.reset()
+
+    def reset(self, games=None):
+        """
+        Starts new games: clears their boards and deals fresh fleets.
+
+        Args:
+            games (numpy.ndarray, optional): Indexes or boolean mask of the games to reset; by default all.
+        """
+        games = self.games if games is None else self.games[games]
+        self.shot_cells[games] = False
+        self.hit_cells[games] = False
+        self.health[games] = self.lengths
+        self.afloat[games] = len(self.lengths)
+        self.moves[games] = 0
+        self.place_fleets(games)
+
+    def place_fleets(self, games):
+        """
+        Deals uniformly random fleets to some games. Every ship is drawn from
+        all its placements and a layout with an overlap is thrown away whole, as
+        FleetGenerator.generate_masks does, only for many layouts at once: each
+        pending game draws as many candidate layouts as the measured acceptance
+        rate says it needs and keeps its first clean one.
+
+        Args:
+            games (numpy.ndarray): Indexes of the games.
+        """
+        pending = games
+        for _ in range(self.MAX_PLACEMENT_ROUNDS):
+            if not len(pending):
+                return
+            copies = min(int(1.5 / self.acceptance) + 1, 64)
+            layouts = copies * len(pending)
+            boards = np.full((layouts, self.size * self.size), -1, dtype=np.int8)
+            placed = np.ones(layouts, dtype=bool)
+            for ship, table in enumerate(self.cell_tables):
+                cells = table[self.rng.integers(len(table), size=layouts)]
+                placed &= (np.take_along_axis(boards, cells, axis=1) < 0).all(axis=1)
+                rows = np.flatnonzero(placed)
+                boards[rows[:, None], cells[rows]] = ship
+            self.acceptance = 0.9 * self.acceptance + 0.1 * max(placed.mean(), 0.001)
+            # Candidate layouts are grouped copy by copy: keep each game's first clean one
+            placed = placed.reshape(copies, len(pending))
+            done = placed.any(axis=0)
+            first = placed.argmax(axis=0)[done] * len(pending) + np.flatnonzero(done)
+            self.ship_cells[pending[done]] = boards[first]
+            pending = pending[~done]
+        # Crowded fleets rarely come out of independent draws: search for the rest
+        generator = FleetGenerator(self.validator, self.config.ship_types,
+                                   random.Random(int(self.rng.integers(2 ** 63))))
+        for game in pending:
+            self.ship_cells[game] = -1
+            for ship, (_, length, row, column, orientation) in enumerate(generator.generate()):
+                index = self.validator.placement_index(length)
+                self.ship_cells[game, index.cell_table[index.position(row, column, orientation)]] = ship
+
+    def step(self, actions):
+        """
+        Fires one shot in every game. A shot at a cell already fired at is
+        wasted: it counts as a move and as a miss.
+
+        Args:
+            actions (numpy.ndarray): Cell number (row * size + column) to fire at in each game.
+
+        Returns:
+            tuple: (hit, sunk, done) arrays of length B: whether each shot hit, the fleet
+                index of the ship it sank or -1, and whether it ended its game. Games that
+                ended have already been reset; their shot count is in `final_moves`.
+        """
+        games = self.games
+        cells = np.asarray(actions, dtype=np.intp)
+        ship = self.ship_cells[games, cells]
+        hit = (ship >= 0) & ~self.shot_cells[games, cells]
+        self.shot_cells[games, cells] = True
+        self.hit_cells[games, cells] |= hit
+        self.moves += 1
+        self.total_moves += self.batch_size
+
+        struck = games[hit]
+        self.health[struck, ship[hit]] -= 1
+        sunk = np.full(self.batch_size, -1, dtype=np.int8)
+        sinking = struck[self.health[struck, ship[hit]] == 0]
+        sunk[sinking] = ship[sinking]
+        self.afloat[sinking] -= 1
+        done = self.afloat == 0
+        if sinking.size and done.any():
+            self.final_moves[done] = self.moves[done]
+            self.total_games += int(np.count_nonzero(done))
+            self.reset(done)
+        return hit, sunk, done
+
+    def random_actions(self):
+        """
+        Picks a uniformly random cell not yet fired at in every game. Cells are
+        drawn blindly and only the games that hit a used cell draw again; the
+        few still unlucky after a handful of rounds pick among their free cells.
+
+        Returns:
+            numpy.ndarray: One cell number per game.
+        """
+        cells = self.rng.integers(self.size * self.size, size=self.batch_size)
+        taken = self.shot_cells[self.games, cells]
+        for _ in range(self.REDRAWS):
+            redo = np.flatnonzero(taken)
+            if not redo.size:
+                return cells
+            cells[redo] = self.rng.integers(self.size * self.size, size=redo.size)
+            taken[redo] = self.shot_cells[redo, cells[redo]]
+        redo = np.flatnonzero(taken)
+        if redo.size:
+            scores = self.rng.random((redo.size, self.size * self.size), dtype=np.float32)
+            scores[self.shot_cells[redo]] = -1.0
+            cells[redo] = scores.argmax(axis=1)
+        return cells
+
+    def density_actions(self):
+        """
+        Picks the most promising cell of every game, like ComputerPlayer's hunt
+        and target modes: cells next to a hit on a ship still afloat come first,
+        then the cells most ship placements could cover, counting placements
+        clear of misses and of sunk ships with ProbabilityEngine over the whole batch.
+
+        Returns:
+            numpy.ndarray: One cell number per game.
+        """
+        # Cells of sunk ships block placements like misses do; the -1 of water picks the False column
+        sunk = np.concatenate([self.health == 0, np.zeros((self.batch_size, 1), dtype=bool)], axis=1)
+        sunk_cells = np.take_along_axis(sunk, self.ship_cells.astype(np.intp), axis=1).reshape(self.shots.shape)
+        open_hits = self.hits & ~sunk_cells
+        density = ProbabilityEngine.density_map((self.shots & ~self.hits) | sunk_cells, self.config.fleet_lengths)
+        near_hit = np.zeros_like(open_hits)
+        near_hit[:, 1:] |= open_hits[:, :-1]
+        near_hit[:, :-1] |= open_hits[:, 1:]
+        near_hit[:, :, 1:] |= open_hits[:, :, :-1]
+        near_hit[:, :, :-1] |= open_hits[:, :, 1:]
+        scores = (density + near_hit * (density.max() + 1.0)).reshape(self.shot_cells.shape)
+        scores[self.shot_cells] = -1.0
+        return scores.argmax(axis=1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the throughput of the batched Battleship environment.")
+    parser.add_argument("-b", "--batch", type=int, default=4096, help="games stepped together")
+    parser.add_argument("-s", "--steps", type=int, default=500, help="batched steps to run")
+    parser.add_argument("--policy", choices=("random", "density"), default="random", help="how shots are chosen")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible runs")
+    args = parser.parse_args()
+
+    env = VectorEnv(args.batch, seed=args.seed)
+    policy = env.random_actions if args.policy == "random" else env.density_actions
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        env.step(policy())
+    elapsed = time.perf_counter() - start
+    print(f"Moves:     {env.total_moves}")
+    print(f"Games:     {env.total_games}")
+    print(f"Moves/sec: {env.total_moves / elapsed:.0f}")
+    print(f"Games/sec: {env.total_games / elapsed:.0f}")
+
+if __name__ == "__main__":
+    main()